@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+CLI Aplikasi Absensi - import, laporan, export dan statistik tanpa GUI.
+
+Contoh:
+    python -m absensi import "DATA TEST/Attendance log 26.xls" --date 2025-11-26
+    python -m absensi import ./logs            # tanggal diambil dari nama file (YYYY-MM-DD)
+    python -m absensi report --employee RAKA --from 2025-11-01 --to 2025-11-30
+    python -m absensi export --report kehadiran --format xlsx --from 2025-11-01 --to 2025-11-30
+    python -m absensi stats
+    python -m absensi backup --incremental     # backup online (lihat juga --list, --verify, --restore)
+    python -m absensi maintenance              # checkpoint WAL, ANALYZE, optimize, vacuum
+    python -m absensi archive --year 2024      # pindahkan data 2024 ke absensi_2024.db
+    python -m absensi serve --host 0.0.0.0 --token RAHASIA   # server database untuk banyak PC
+    python -m absensi --server http://192.168.1.10:8765 stats
+    python -m absensi --read-only report --employee RAKA --from 2025-11-01 --to 2025-11-30
+
+Modul ini sengaja tidak mengimpor Qt. pandas (lewat ExcelProcessor) dan
+openpyxl hanya dimuat saat perintah yang membutuhkannya dijalankan.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+import name_index
+import profiling
+import sql_trace
+from database import ENV_READ_ONLY, DatabaseManager, EmployeeResolver
+
+IMPORT_EXTENSIONS = ('.xls', '.xlsx', '.csv')
+ISO_DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+
+class CLIError(Exception):
+    """Kesalahan input CLI yang ditampilkan ke user tanpa traceback"""
+
+
+def parse_date(value):
+    """Validasi tanggal format YYYY-MM-DD untuk argparse"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Format tanggal harus YYYY-MM-DD: '{value}'")
+
+
+def collect_import_files(path):
+    """Daftar file log yang akan diimport dari sebuah file atau folder"""
+    if os.path.isdir(path):
+        files = [
+            os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.lower().endswith(IMPORT_EXTENSIONS)
+        ]
+        if not files:
+            raise CLIError(f"Tidak ada file log ({', '.join(IMPORT_EXTENSIONS)}) di folder '{path}'")
+        return files
+
+    if not os.path.exists(path):
+        raise CLIError(f"File tidak ditemukan: '{path}'")
+    return [path]
+
+
+def resolve_import_date(file_path, default_date):
+    """Tanggal absensi untuk satu file: tanggal di nama file, atau --date"""
+    match = ISO_DATE_PATTERN.search(os.path.basename(file_path))
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    if default_date:
+        return default_date
+    raise CLIError(
+        f"Tanggal untuk '{os.path.basename(file_path)}' tidak diketahui. "
+        "Gunakan --date YYYY-MM-DD atau beri nama file berisi tanggal."
+    )
+
+
+def resolve_employee(db_manager, value):
+    """Cari karyawan berdasarkan ID atau nama (persis, sebagian nama, lalu nama yang sama setelah dinormalisasi)"""
+    employees = db_manager.get_all_employees()
+
+    if value.isdigit():
+        for emp in employees:
+            if emp['id'] == int(value):
+                return emp
+
+    exact = db_manager.get_employee_by_name(value)
+    if exact:
+        return {'id': exact['id'], 'name': exact['name']}
+
+    needle = value.strip().lower()
+    matches = [emp for emp in employees if needle in emp['name'].lower()]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        match = name_index.for_manager(db_manager).match(value)
+        if match is not None and match[3]:
+            return {'id': match[0], 'name': match[1]}
+        if match is not None:
+            raise CLIError(f"Karyawan tidak ditemukan: '{value}' (mungkin maksudnya '{match[1]}'?)")
+        raise CLIError(f"Karyawan tidak ditemukan: '{value}'")
+    names = ", ".join(emp['name'] for emp in matches[:10])
+    raise CLIError(f"Nama '{value}' cocok dengan {len(matches)} karyawan: {names}")
+
+
+def check_period(args):
+    if args.start > args.end:
+        raise CLIError("Tanggal mulai tidak boleh lebih besar dari tanggal akhir!")
+
+
+# ==================== COMMANDS ====================
+
+def cmd_import(db_manager, args):
+    """Import file log absensi (Grid++Report) ke database"""
+    from main import ExcelProcessor, suppress_output
+
+    files = collect_import_files(args.path)
+    jobs = [(file_path, resolve_import_date(file_path, args.date)) for file_path in files]
+
+    total_records = 0
+    for file_path, import_date in jobs:
+        if args.verbose:
+            records = ExcelProcessor.process_excel_log(file_path)
+        else:
+            with suppress_output():
+                records = ExcelProcessor.process_excel_log(file_path)
+
+        if not records:
+            print(f"⚠️  {os.path.basename(file_path)}: tidak ada data absensi yang ditemukan")
+            continue
+
+        resolver = EmployeeResolver(db_manager.get_employee_identities())
+        matched, suggested = resolver.match_names(records, name_index.for_manager(db_manager))
+        for raw, name, score in matched:
+            print(f"   ↪ '{raw}' dicatat sebagai karyawan '{name}'")
+        for raw, name, score in suggested:
+            print(f"   ⚠️  '{raw}' mirip '{name}' (kemiripan {score:.2f}), dicatat sebagai karyawan baru")
+
+        db_manager.save_attendance_data(import_date.strftime('%Y-%m-%d'), records, mode=args.mode)
+        total_records += len(records)
+        print(f"✅ {os.path.basename(file_path)} → {import_date}: {len(records)} karyawan ({args.mode})")
+
+    print(f"📋 Total: {total_records} data absensi dari {len(jobs)} file")
+    return 0
+
+
+def cmd_report(db_manager, args):
+    """Tampilkan laporan karyawan satuan"""
+    from report_calc import build_employee_report, format_time_duration
+
+    check_period(args)
+    employee = resolve_employee(db_manager, args.employee)
+    attendance_data = db_manager.get_attendance_by_employee_period(
+        employee['id'], args.start.strftime('%Y-%m-%d'), args.end.strftime('%Y-%m-%d')
+    )
+    rows, totals = build_employee_report(db_manager, employee['id'], attendance_data)
+
+    if args.format == 'json':
+        output = {
+            'employee': employee,
+            'from': args.start.strftime('%Y-%m-%d'),
+            'to': args.end.strftime('%Y-%m-%d'),
+            'rows': [{
+                'date': row['date'],
+                'shift': row['shift_name'],
+                'jam_masuk': row['data']['jam_masuk'],
+                'jam_keluar': row['data']['jam_keluar'],
+                'jam_masuk_lembur': row['data']['jam_masuk_lembur'],
+                'jam_keluar_lembur': row['data']['jam_keluar_lembur'],
+                'status': row['status'],
+                'keterangan': row['keterangan'],
+                'violations': row['violations'],
+                **row['metrics']
+            } for row in rows],
+            'totals': totals
+        }
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+        return 0
+
+    if not rows:
+        print(f"Tidak ada data absensi untuk {employee['name']} pada periode yang dipilih")
+        return 0
+
+    headers = ["Tanggal", "Shift", "Masuk", "Keluar", "Kerja", "Lembur", "Loyalitas", "Overtime", "Terlambat", "Status"]
+    table = []
+    for row in rows:
+        metrics = row['metrics']
+        sunday = row['day_of_week'] == 6
+        table.append([
+            row['date'],
+            row['shift_name'],
+            row['data']['jam_masuk'] or "-",
+            row['data']['jam_keluar'] or "-",
+            format_time_duration(metrics['jam_kerja_total']),
+            "-" if sunday else format_time_duration(metrics['jam_lembur']),
+            format_time_duration(metrics['loyalitas'] / 60, "menit_only") if metrics['loyalitas'] > 0 else "-",
+            format_time_duration(metrics['overtime']) if metrics['overtime'] > 0 else "-",
+            "-" if sunday else format_time_duration(metrics['terlambat'] / 60, "menit_only"),
+            row['status']
+        ])
+
+    widths = [max(len(str(line[i])) for line in [headers] + table) for i in range(len(headers))]
+    print(f"LAPORAN ABSENSI - {employee['name'].upper()} ({args.start} s/d {args.end})")
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for line in table:
+        print("  ".join(str(v).ljust(w) for v, w in zip(line, widths)))
+
+    print()
+    print(f"Total Kerja: {format_time_duration(totals['jam_kerja'])} | "
+          f"Total Lembur: {format_time_duration(totals['jam_lembur'])} | "
+          f"Total Loyalitas: {format_time_duration(totals['loyalitas'] / 60, 'menit_only')} | "
+          f"Total Overtime: {format_time_duration(totals['overtime']) if totals['overtime'] > 0 else '0 jam'} | "
+          f"Total Terlambat: {format_time_duration(totals['terlambat'] / 60, 'menit_only')}")
+    return 0
+
+
+def cmd_export(db_manager, args):
+    """Export laporan ke file xlsx/csv"""
+    import report_calc
+    import report_export
+
+    check_period(args)
+    start_str = args.start.strftime('%Y-%m-%d')
+    end_str = args.end.strftime('%Y-%m-%d')
+
+    if args.report == 'karyawan':
+        if not args.employee:
+            raise CLIError("Laporan karyawan membutuhkan --employee")
+        employee = resolve_employee(db_manager, args.employee)
+        output = args.output or f"Laporan_Absensi_{employee['name']}_{start_str}_to_{end_str}.{args.format}"
+        exporter = (report_export.export_employee_report_xlsx if args.format == 'xlsx'
+                    else report_export.export_employee_report_csv)
+        exporter(db_manager, output, employee['id'], employee['name'], start_str, end_str)
+
+    elif args.report == 'kehadiran':
+        employees, dates, attendance_data = report_calc.build_attendance_matrix(db_manager, args.start, args.end)
+        output = args.output or f"Laporan_Kehadiran_{args.start.strftime('%Y%m%d')}_{args.end.strftime('%Y%m%d')}.{args.format}"
+        exporter = (report_export.export_attendance_matrix_xlsx if args.format == 'xlsx'
+                    else report_export.export_attendance_matrix_csv)
+        exporter(db_manager, output, employees, dates, attendance_data)
+
+    else:
+        employees, violation_data = report_calc.build_violation_report(db_manager, args.start, args.end)
+        output = args.output or f"Laporan_Pelanggaran_{args.start.strftime('%Y%m%d')}_{args.end.strftime('%Y%m%d')}.{args.format}"
+        exporter = (report_export.export_violation_report_xlsx if args.format == 'xlsx'
+                    else report_export.export_violation_report_csv)
+        exporter(output, employees, violation_data, args.start, args.end)
+
+    print(f"✅ Laporan berhasil di-export ke: {output}")
+    return 0
+
+
+def cmd_scans(db_manager, args):
+    """Tampilkan riwayat scan mesin: semua, hanya anomali, atau tap berulang"""
+    check_period(args)
+    employee_id = resolve_employee(db_manager, args.employee)['id'] if args.employee else None
+    start_str = args.start.strftime('%Y-%m-%d')
+    end_str = args.end.strftime('%Y-%m-%d')
+
+    if args.repeated is not None:
+        rows = db_manager.get_repeated_scans(start_str, end_str, args.repeated, employee_id)
+        headers = ["Tanggal", "Nama", "Scan", "Jam 1", "Jam 2", "Selisih"]
+        table = [[row['date'], row['employee_name'], f"{row['seq']}-{row['seq'] + 1}",
+                  row['first_time'], row['second_time'], f"{row['gap_minutes']} menit"] for row in rows]
+    else:
+        rows = db_manager.get_attendance_scans(start_str, end_str, employee_id, args.anomalies)
+        headers = ["Tanggal", "Nama", "Scan", "Jam", "Anomali"]
+        table = [[row['date'], row['employee_name'], row['seq'], row['time'],
+                  "ya" if row['is_anomaly'] else ""] for row in rows]
+
+    if args.format == 'json':
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return 0
+
+    if not rows:
+        print("Tidak ada scan pada periode yang dipilih")
+        return 0
+
+    widths = [max(len(str(line[i])) for line in [headers] + table) for i in range(len(headers))]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for line in table:
+        print("  ".join(str(v).ljust(w) for v, w in zip(line, widths)))
+    print(f"\nTotal: {len(rows)}")
+    return 0
+
+
+def cmd_stats(db_manager, args):
+    """Tampilkan statistik database"""
+    stats = db_manager.get_database_stats()
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return 0
+
+    location = db_manager.db_path if '://' in db_manager.db_path else os.path.abspath(db_manager.db_path)
+    print(f"📊 Database: {location} ({stats['file_size'] / 1024:.1f} KB)")
+    print(f"   Karyawan   : {stats['employees']}")
+    print(f"   Absensi    : {stats['attendance']} data, {stats['attendance_days']} hari "
+          f"({stats['first_date'] or '-'} s/d {stats['last_date'] or '-'})")
+    print(f"   Scan mesin : {stats['scans']} ({stats['anomaly_scans']} anomali)")
+    print(f"   Pelanggaran: {stats['violations']}")
+    print(f"   Izin       : {stats['leaves']}")
+    print(f"   Shift      : {stats['shifts']}")
+    return 0
+
+
+def cmd_serve(db_manager, args):
+    """Jalankan server database untuk mode multi-user"""
+    from db_server import DatabaseServer
+
+    try:
+        server = DatabaseServer(db_manager.db_path, args.host, args.port, args.max_batch, args.verbose, args.token)
+    except ValueError as e:
+        raise CLIError(str(e))
+    print(f"🗄️  Server database {os.path.abspath(db_manager.db_path)} di {server.url} (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.stop()
+    return 0
+
+
+def cmd_backup(db_manager, args):
+    """Backup online, daftar snapshot, verifikasi dan restore"""
+    import backup
+
+    if '://' in db_manager.db_path:
+        raise CLIError("Backup hanya bisa dijalankan di PC server (tanpa --server)")
+    backup_dir = args.dir or backup.default_backup_dir(db_manager.db_path)
+
+    def timings_text(timings):
+        return ", ".join(f"{key[:-3]} {value:.0f} ms" for key, value in timings.items())
+
+    try:
+        if args.list:
+            snapshots = backup.list_backups(backup_dir)
+            if not snapshots:
+                print(f"Belum ada backup di {backup_dir}")
+                return 0
+            for snapshot in snapshots:
+                kind = "penuh" if snapshot['kind'] == 'full' else f"inkremental dari {snapshot['parent']}"
+                note = f" - {snapshot['note']}" if snapshot.get('note') else ""
+                print(f"{snapshot['id']}  {snapshot['created_at']}  {snapshot['size'] / 1024:>9.1f} KB  {kind}{note}")
+            return 0
+
+        if args.verify:
+            result = backup.verify_backup(backup_dir, args.verify)
+            if not result['ok']:
+                raise CLIError(f"Snapshot {args.verify} tidak valid (checksum "
+                               f"{'cocok' if result['checksum_ok'] else 'TIDAK cocok'}, "
+                               f"integrity_check: {result['integrity']})")
+            print(f"✅ {args.verify} valid ({timings_text(result['timings'])})")
+            return 0
+
+        if args.restore:
+            if db_manager.read_only:
+                raise CLIError("Restore tidak bisa dijalankan dengan --read-only")
+            result = backup.restore_backup(db_manager.db_path, args.restore, backup_dir)
+            db_manager.init_database()  # Snapshot dari versi lama mungkin belum punya kolom/tabel terbaru
+            print(f"♻️  Database dikembalikan ke {args.restore} (backup sebelum restore: "
+                  f"{result['safety_backup'] or '-'})")
+            print(f"   {timings_text(result['timings'])}")
+            return 0
+
+        result = backup.create_backup(db_manager.db_path, backup_dir, incremental=args.incremental,
+                                      compress=not args.no_compress, keep=args.keep)
+    except backup.BackupError as e:
+        raise CLIError(str(e))
+
+    if result['skipped']:
+        print(f"ℹ️  Tidak ada perubahan sejak snapshot terakhir ({timings_text(result['timings'])})")
+        return 0
+    snapshot = result['snapshot']
+    kind = "Backup penuh" if snapshot['kind'] == 'full' else "Snapshot inkremental"
+    print(f"💾 {kind} {snapshot['id']}: {os.path.join(backup_dir, snapshot['file'])} "
+          f"({snapshot['size'] / 1024:.1f} KB, {snapshot['changed_pages']}/{snapshot['page_count']} halaman)")
+    print(f"   {timings_text(result['timings'])}")
+    if result['removed']:
+        print(f"   Rotasi: {', '.join(result['removed'])} dihapus")
+    return 0
+
+
+def cmd_maintenance(db_manager, args):
+    """Pemeliharaan database: checkpoint WAL, ANALYZE, optimize, incremental vacuum"""
+    import maintenance
+
+    if '://' in db_manager.db_path:
+        raise CLIError("Pemeliharaan hanya bisa dijalankan di PC server (tanpa --server)")
+    if db_manager.read_only and not args.history:
+        raise CLIError("Pemeliharaan tidak bisa dijalankan dengan --read-only")
+
+    if args.history:
+        runs = db_manager.get_maintenance_runs(limit=args.history)
+        if args.json:
+            print(json.dumps(runs, indent=2))
+            return 0
+        for run in runs:
+            print(f"{run['started_at']}  {run['reason']:<9}  {','.join(run['tasks']):<33}  "
+                  f"{run['total_ms']:>8.1f} ms  DB {run['db_size_before'] / 1024:.0f} -> "
+                  f"{run['db_size_after'] / 1024:.0f} KB  WAL {run['wal_size_before'] / 1024:.0f} -> "
+                  f"{run['wal_size_after'] / 1024:.0f} KB")
+        return 0
+
+    tasks = args.tasks.split(',') if args.tasks else maintenance.TASKS
+    if args.due:
+        result = maintenance.run_due(db_manager)
+        if result is None:
+            print("ℹ️  Belum ada pemeliharaan yang perlu dijalankan")
+            return 0
+    else:
+        try:
+            result = maintenance.run_maintenance(db_manager, tasks)
+        except ValueError as e:
+            raise CLIError(str(e))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    before, after = result['before'], result['after']
+    print(f"🧹 Pemeliharaan selesai dalam {result['total_ms']:.0f} ms")
+    print(f"   Database: {before['db_size'] / 1024:.1f} KB -> {after['db_size'] / 1024:.1f} KB "
+          f"({before['freelist_count']} -> {after['freelist_count']} halaman kosong)")
+    print(f"   WAL     : {before['wal_size'] / 1024:.1f} KB -> {after['wal_size'] / 1024:.1f} KB")
+    for task in result['results']:
+        detail = ", ".join(f"{key}={value}" for key, value in task.items() if key not in ('task', 'ms'))
+        print(f"   {task['task']:<10} {task['ms']:>8.1f} ms  {detail}")
+    print("   Query plan (waktu sebelum -> sesudah):")
+    for plan_before, plan_after in zip(result['plans_before'], result['plans_after']):
+        scans = f", {plan_after['full_scans']} full scan" if plan_after['full_scans'] else ""
+        print(f"   {plan_after['name']:<30} {plan_before['ms']:>6.1f} -> {plan_after['ms']:>6.1f} ms{scans}")
+    return 0
+
+
+def cmd_archive(db_manager, args):
+    """Arsip tahunan: pindahkan tahun yang sudah lewat ke absensi_<tahun>.db atau kembalikan"""
+    import archive
+
+    if '://' in db_manager.db_path:
+        raise CLIError("Arsip hanya bisa dijalankan di PC server (tanpa --server)")
+    if db_manager.read_only and (args.year is not None or args.restore is not None):
+        raise CLIError("Arsip tidak bisa dibuat/dikembalikan dengan --read-only")
+
+    try:
+        if args.year is not None:
+            result = archive.archive_year(db_manager, args.year)
+            counts = result['counts']
+            print(f"📦 Tahun {result['year']} diarsipkan ke {result['path']}: {counts['attendance']} absensi, "
+                  f"{counts['violations']} pelanggaran, {counts['leaves']} izin, {counts['attendance_scans']} scan")
+            print(f"   Database: {result['db_size_before'] / 1024:.1f} KB -> {result['db_size_after'] / 1024:.1f} KB")
+            print("   " + ", ".join(f"{key[:-3]} {value:.0f} ms" for key, value in result['timings'].items()))
+            return 0
+
+        if args.restore is not None:
+            result = archive.restore_year(db_manager, args.restore)
+            print(f"♻️  Tahun {result['year']} dikembalikan ke database utama ({result['total_ms']:.0f} ms)")
+            return 0
+    except archive.ArchiveError as e:
+        raise CLIError(str(e))
+
+    archives = db_manager.get_archives()
+    for item in archives:
+        size = os.path.getsize(item['path']) / 1024 if os.path.exists(item['path']) else 0
+        print(f"{item['year']}  {item['file']}  {size:>9.1f} KB  {item['attendance']} absensi, "
+              f"{item['violations']} pelanggaran, {item['leaves']} izin  (diarsipkan {item['archived_at']})")
+    if not archives:
+        print("Belum ada tahun yang diarsipkan")
+    years = archive.archivable_years(db_manager)
+    if years:
+        print(f"Bisa diarsipkan: {', '.join(str(year) for year in years)}")
+    return 0
+
+
+def add_period_arguments(parser):
+    parser.add_argument('--from', dest='start', type=parse_date, required=True, help="Tanggal mulai (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='end', type=parse_date, required=True, help="Tanggal akhir (YYYY-MM-DD)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='absensi',
+        description="Aplikasi Absensi - mode command line (tanpa GUI)"
+    )
+    parser.add_argument('--db', default='absensi.db', help="Path database (default: absensi.db)")
+    parser.add_argument('--server', metavar='URL', default=os.environ.get('ABSENSI_SERVER') or None,
+                        help="Pakai server database (mode multi-user), mis. http://192.168.1.10:8765 "
+                             "(atau env ABSENSI_SERVER)")
+    parser.add_argument('--read-only', action='store_true',
+                        default=os.environ.get(ENV_READ_ONLY, '').strip() not in ('', '0'),
+                        help="Buka database read-only (tanpa migrasi/lock tulis, memakai mmap; atau env "
+                             "ABSENSI_READ_ONLY=1)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Catat profiling dan simpan ke JSON saat selesai (lihat ABSENSI_PROFILE_FILE)")
+    parser.add_argument('--sql-trace', action='store_true',
+                        help="Catat query SQL (query lambat, pola N+1) dan simpan ke JSON (lihat ABSENSI_SQL_TRACE_FILE)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Import file log absensi (file atau folder)")
+    import_parser.add_argument('path', help="File log .xls/.xlsx/.csv atau folder berisi file log")
+    import_parser.add_argument('--date', type=parse_date,
+                               help="Tanggal absensi (YYYY-MM-DD); default diambil dari nama file")
+    import_parser.add_argument('--mode', choices=['replace', 'merge', 'insert_only'], default='replace',
+                               help="replace (timpa), merge (tambah/update), insert_only (hanya tambah baru)")
+    import_parser.add_argument('--verbose', action='store_true', help="Tampilkan log proses pembacaan file")
+    import_parser.set_defaults(func=cmd_import)
+
+    report_parser = subparsers.add_parser('report', help="Laporan absensi satu karyawan")
+    report_parser.add_argument('--employee', required=True, help="Nama atau ID karyawan")
+    add_period_arguments(report_parser)
+    report_parser.add_argument('--format', choices=['table', 'json'], default='table')
+    report_parser.set_defaults(func=cmd_report)
+
+    export_parser = subparsers.add_parser('export', help="Export laporan ke Excel/CSV")
+    export_parser.add_argument('--report', choices=['karyawan', 'kehadiran', 'pelanggaran'], default='kehadiran',
+                               help="Jenis laporan (default: kehadiran semua karyawan)")
+    export_parser.add_argument('--format', choices=['xlsx', 'csv'], default='xlsx')
+    export_parser.add_argument('--employee', help="Nama atau ID karyawan (untuk laporan karyawan)")
+    add_period_arguments(export_parser)
+    export_parser.add_argument('--output', '-o', help="Path file hasil export")
+    export_parser.set_defaults(func=cmd_export)
+
+    scans_parser = subparsers.add_parser('scans', help="Riwayat scan mesin (anomali, tap berulang)")
+    add_period_arguments(scans_parser)
+    scans_parser.add_argument('--employee', help="Nama atau ID karyawan")
+    scans_parser.add_argument('--anomalies', action='store_true', help="Hanya scan ke-5 dst (jam anomali)")
+    scans_parser.add_argument('--repeated', type=int, metavar='MENIT',
+                              help="Tampilkan scan berurutan yang jaraknya <= MENIT (tap berulang)")
+    scans_parser.add_argument('--format', choices=['table', 'json'], default='table')
+    scans_parser.set_defaults(func=cmd_scans)
+
+    stats_parser = subparsers.add_parser('stats', help="Statistik isi database")
+    stats_parser.add_argument('--json', action='store_true', help="Output dalam format JSON")
+    stats_parser.set_defaults(func=cmd_stats)
+
+    serve_parser = subparsers.add_parser('serve', help="Jalankan server database untuk banyak workstation")
+    serve_parser.add_argument('--host', default='127.0.0.1',
+                              help="Alamat listen (default: 127.0.0.1; 0.0.0.0 agar bisa diakses PC lain, wajib --token)")
+    serve_parser.add_argument('--token', default=os.environ.get('ABSENSI_SERVER_TOKEN') or None,
+                              help="Token bersama yang wajib dikirim klien (default: env ABSENSI_SERVER_TOKEN)")
+    serve_parser.add_argument('--port', type=int, default=8765, help="Port (default: 8765)")
+    serve_parser.add_argument('--max-batch', type=int, default=64, help="Maksimal permintaan tulis per transaksi")
+    serve_parser.add_argument('--verbose', action='store_true', help="Tampilkan log setiap request")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    backup_parser = subparsers.add_parser('backup', help="Backup online database (penuh/inkremental), verifikasi, restore")
+    backup_parser.add_argument('--dir', help="Folder backup (default: folder 'backup' di samping database)")
+    backup_parser.add_argument('--incremental', action='store_true',
+                               help="Simpan hanya halaman yang berubah sejak snapshot terakhir")
+    backup_parser.add_argument('--no-compress', action='store_true', help="Backup penuh tanpa kompresi gzip")
+    backup_parser.add_argument('--keep', type=int, default=7, help="Jumlah backup penuh yang disimpan (default: 7)")
+    backup_action = backup_parser.add_mutually_exclusive_group()
+    backup_action.add_argument('--list', action='store_true', help="Tampilkan daftar snapshot")
+    backup_action.add_argument('--verify', metavar='ID', help="Cek checksum dan integrity_check snapshot")
+    backup_action.add_argument('--restore', metavar='ID', help="Kembalikan database ke snapshot (diverifikasi dulu)")
+    backup_parser.set_defaults(func=cmd_backup)
+
+    maintenance_parser = subparsers.add_parser('maintenance',
+                                               help="Checkpoint WAL, ANALYZE, optimize dan vacuum database")
+    maintenance_parser.add_argument('--tasks', help="Tugas dipisah koma: analyze,optimize,vacuum,checkpoint (default: semua)")
+    maintenance_parser.add_argument('--due', action='store_true',
+                                    help="Hanya jalankan tugas yang sudah waktunya (untuk cron/Task Scheduler)")
+    maintenance_parser.add_argument('--history', type=int, nargs='?', const=20, metavar='N',
+                                    help="Tampilkan N riwayat pemeliharaan terakhir (default: 20)")
+    maintenance_parser.add_argument('--json', action='store_true', help="Output dalam format JSON")
+    maintenance_parser.set_defaults(func=cmd_maintenance)
+
+    archive_parser = subparsers.add_parser('archive', help="Arsip tahunan: pindahkan data tahun lalu ke file terpisah")
+    archive_action = archive_parser.add_mutually_exclusive_group()
+    archive_action.add_argument('--year', type=int, help="Arsipkan tahun ini ke absensi_<tahun>.db")
+    archive_action.add_argument('--restore', type=int, metavar='YEAR',
+                                help="Kembalikan data arsip tahun ini ke database utama")
+    archive_action.add_argument('--list', action='store_true', help="Tampilkan daftar arsip (default)")
+    archive_parser.set_defaults(func=cmd_archive)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        profiling.enable()
+    if args.sql_trace:
+        sql_trace.enable()
+
+    try:
+        if args.server and args.command != 'serve':
+            from db_server import RemoteDatabaseManager
+            db_manager = RemoteDatabaseManager(args.server)
+        else:
+            db_manager = DatabaseManager(args.db, read_only=args.read_only)
+        with sql_trace.action(f"cli.{args.command}"):
+            return args.func(db_manager, args)
+    except CLIError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,433 @@
+"""
+Arsip tahunan: data tahun yang sudah lewat dipindah ke file `absensi_<tahun>.db`.
+
+Tabel attendance, violations (lewat attendance_id), leaves dan
+attendance_scans untuk satu tahun disalin ke file arsip di folder yang sama
+dengan database, lalu dihapus dari database utama (didaftarkan di tabel
+archives) sehingga file utama tetap kecil dan query sehari-hari tidak ikut
+membaca riwayat bertahun-tahun.
+
+Pembacaan tetap transparan: method baca DatabaseManager dibungkus `routes`
+dengan parameter tanggal / attendance_id-nya. Jika periode yang diminta
+menyentuh tahun yang diarsipkan, get_connection meng-ATTACH file arsip
+tahun itu saja (read-only, mode=ro) dan membuat TEMP VIEW dengan nama
+tabel yang sama (UNION ALL database utama + arsip). Nama tanpa skema
+dicari di temp lebih dulu, jadi query yang ada tidak perlu diubah.
+Periode yang tidak menyentuh arsip tidak dikenai biaya apa pun.
+
+Tahun yang sudah diarsipkan bersifat read-only: tulis ke tanggal / absensi
+di tahun itu ditolak dengan ArchivedYearError. Kembalikan dulu lewat
+restore_year jika perlu diubah.
+
+    python -m absensi archive --list
+    python -m absensi archive --year 2024
+    python -m absensi archive --restore 2024
+"""
+
+import functools
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from urllib.request import pathname2url
+
+import db_retry
+import query_cache
+
+ARCHIVED_TABLES = ('attendance', 'violations', 'leaves', 'attendance_scans')
+# Indeks yang hanya ada di file arsip; indeks tabel di database utama (idx_attendance_scans_date,
+# idx_violations_attendance, ...) disalin dari sqlite_master, indeks UNIQUE ikut dari CREATE TABLE
+ARCHIVE_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_arsip_leaves_date ON leaves (date, employee_id)',
+)
+ALL_YEARS = 'all'
+
+_local = threading.local()
+_lock = threading.Lock()
+_memo = {}  # db_path -> (data_version, schema_version, daftar arsip, kolom tabel utama)
+
+
+class ArchiveError(Exception):
+    """Arsip gagal dibuat/dikembalikan atau file arsip tidak ditemukan"""
+
+
+class ArchivedYearError(ArchiveError, ValueError):
+    """Tulis ke data tahun yang sudah diarsipkan (read-only)"""
+
+
+def archive_path(db_path, year):
+    return _resolve(db_path, f"absensi_{year}.db")
+
+
+def _resolve(db_path, file):
+    """File arsip selalu di folder yang sama dengan database utama"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), file)
+
+
+def _readonly_uri(path):
+    return 'file:' + pathname2url(os.path.abspath(path)) + '?mode=ro'
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _year_range(start, end):
+    """Tahun yang disentuh periode start..end (str 'YYYY-MM-DD' / date); None = semua tahun"""
+    if start is None or end is None:
+        return ALL_YEARS
+    return set(range(int(str(start)[:4]), int(str(end)[:4]) + 1))
+
+
+# ==================== Routing Baca ====================
+
+def routes(start=None, end=None, attendance_id=None):
+    """Decorator method baca DatabaseManager: arsip yang disentuh argumen ini ikut dibaca.
+
+    start/end: nama parameter tanggal (end boleh kosong untuk satu tanggal);
+    attendance_id: nama parameter id absensi (arsip dipilih dari rentang id).
+    """
+    end = end or start
+
+    def decorator(func):
+        names = list(inspect.signature(func).parameters)
+
+        def argument(name, args, kwargs):
+            index = names.index(name)
+            return args[index] if index < len(args) else kwargs.get(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            years = set()
+            ids = set()
+            if start is not None:
+                years = _year_range(argument(start, args, kwargs), argument(end, args, kwargs))
+            if attendance_id is not None:
+                ids.add(argument(attendance_id, args, kwargs))
+
+            previous = getattr(_local, 'scope', None)
+            if previous is not None:
+                # Panggilan bertingkat: gabungkan dengan cakupan luar
+                previous_years, previous_ids = previous
+                years = ALL_YEARS if ALL_YEARS in (years, previous_years) else years | previous_years
+                ids = ids | previous_ids
+            _local.scope = (years, ids)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _local.scope = previous
+
+        return wrapper
+
+    return decorator
+
+
+def in_scope():
+    return getattr(_local, 'scope', None) is not None
+
+
+def _table_columns(conn, schema, table):
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()]
+
+
+def _archives_for(conn, db_manager):
+    """Daftar arsip terdaftar dan kolom tabel utama; dibaca ulang hanya jika data/skema berubah"""
+    data_version = db_manager.peek_data_version()
+    with _lock:
+        memo = _memo.get(db_manager.db_path)
+    if memo is not None and memo[0] == data_version:
+        if not memo[2]:
+            return memo[2], memo[3]  # Belum ada arsip: tidak perlu cek skema
+        if memo[1] == conn.execute('PRAGMA main.schema_version').fetchone()[0]:
+            return memo[2], memo[3]
+
+    schema_version = conn.execute('PRAGMA main.schema_version').fetchone()[0]
+    archives = [{'year': row[0], 'path': _resolve(db_manager.db_path, row[1]),
+                 'min_attendance_id': row[2], 'max_attendance_id': row[3]}
+                for row in conn.execute('''
+                    SELECT year, file, min_attendance_id, max_attendance_id FROM main.archives ORDER BY year
+                ''').fetchall()]
+    main_columns = {table: _table_columns(conn, 'main', table) for table in ARCHIVED_TABLES} if archives else {}
+    with _lock:
+        _memo[db_manager.db_path] = (data_version, schema_version, archives, main_columns)
+    return archives, main_columns
+
+
+def attach_archives(conn, db_manager):
+    """ATTACH arsip yang disentuh cakupan baca saat ini dan buat TEMP VIEW penggabung (dipanggil get_connection)"""
+    years, ids = _local.scope
+    archives, main_columns = _archives_for(conn, db_manager)
+    selected = [archive for archive in archives
+                if years == ALL_YEARS or archive['year'] in years
+                or any(archive['min_attendance_id'] is not None
+                       and archive['min_attendance_id'] <= attendance_id <= archive['max_attendance_id']
+                       for attendance_id in ids if attendance_id is not None)]
+    if not selected:
+        return
+
+    for archive in selected:
+        if not os.path.exists(archive['path']):
+            raise ArchiveError(f"File arsip tahun {archive['year']} tidak ditemukan: {archive['path']}")
+        conn.execute(f"ATTACH DATABASE ? AS arsip_{archive['year']}", (_readonly_uri(archive['path']),))
+
+    for table in ARCHIVED_TABLES:
+        columns = main_columns[table]
+        parts = [f"SELECT {', '.join(columns)} FROM main.{table}"]
+        for archive in selected:
+            schema = f"arsip_{archive['year']}"
+            present = set(_table_columns(conn, schema, table))
+            # Kolom yang ditambahkan setelah arsip dibuat bernilai NULL di arsip
+            values = [column if column in present else f"NULL AS {column}" for column in columns]
+            parts.append(f"SELECT {', '.join(values)} FROM {schema}.{table}")
+        conn.execute(f"CREATE TEMP VIEW {table} AS " + " UNION ALL ".join(parts))
+
+
+def check_writable(cursor, date_value=None, attendance_id=None):
+    """Tolak tulis ke tanggal / absensi yang ada di tahun yang sudah diarsipkan"""
+    if date_value is not None:
+        year = int(str(date_value)[:4])
+        cursor.execute('SELECT 1 FROM main.archives WHERE year = ?', (year,))
+        if cursor.fetchone():
+            raise ArchivedYearError(f"Data tahun {year} sudah diarsipkan (read-only). "
+                                    f"Kembalikan arsip terlebih dahulu untuk mengubahnya.")
+    if attendance_id is not None:
+        cursor.execute('''
+            SELECT year FROM main.archives
+            WHERE ? BETWEEN min_attendance_id AND max_attendance_id
+              AND NOT EXISTS (SELECT 1 FROM main.attendance WHERE id = ?)
+        ''', (attendance_id, attendance_id))
+        row = cursor.fetchone()
+        if row:
+            raise ArchivedYearError(f"Data absensi ini ada di arsip tahun {row[0]} (read-only). "
+                                    f"Kembalikan arsip terlebih dahulu untuk mengubahnya.")
+
+
+def check_row_writable(cursor, db_path, table, row_id):
+    """Dipanggil jika UPDATE/DELETE berdasarkan id tidak mengenai baris: tolak jika baris itu ada di arsip"""
+    cursor.execute('SELECT year, file FROM main.archives ORDER BY year DESC')
+    for year, file in cursor.fetchall():
+        path = _resolve(db_path, file)
+        if not os.path.exists(path):
+            continue
+        conn = sqlite3.connect(_readonly_uri(path), uri=True)
+        try:
+            found = conn.execute(f'SELECT 1 FROM {table} WHERE id = ?', (row_id,)).fetchone()
+        finally:
+            conn.close()
+        if found:
+            raise ArchivedYearError(f"Data ini ada di arsip tahun {year} (read-only). "
+                                    f"Kembalikan arsip terlebih dahulu untuk mengubahnya.")
+
+
+# ==================== Arsip & Kembalikan ====================
+
+def archivable_years(db_manager):
+    """Tahun yang sudah lewat, punya data absensi/izin di database utama dan belum diarsipkan"""
+    conn = db_manager.get_connection()
+    try:
+        rows = conn.execute('''
+            SELECT DISTINCT CAST(substr(date, 1, 4) AS INTEGER) FROM main.attendance
+            UNION
+            SELECT DISTINCT CAST(substr(date, 1, 4) AS INTEGER) FROM main.leaves
+        ''').fetchall()
+    finally:
+        conn.close()
+    archived = {archive['year'] for archive in db_manager.get_archives()}
+    return sorted(year for year, in rows if year is not None and year < date.today().year and year not in archived)
+
+
+def _year_counts(cursor, schema, start, end):
+    counts = {}
+    for table in ('attendance', 'leaves', 'attendance_scans'):
+        cursor.execute(f'SELECT COUNT(*) FROM {schema}.{table} WHERE date BETWEEN ? AND ?', (start, end))
+        counts[table] = cursor.fetchone()[0]
+    cursor.execute(f'''
+        SELECT COUNT(*) FROM {schema}.violations
+        WHERE attendance_id IN (SELECT id FROM {schema}.attendance WHERE date BETWEEN ? AND ?)
+    ''', (start, end))
+    counts['violations'] = cursor.fetchone()[0]
+    return counts
+
+
+def _copy_year(db_path, path, year, start, end):
+    """Tahap 1: buat file arsip berisi data tahun ini (database utama hanya dibaca)"""
+    conn = sqlite3.connect(path, uri=True)
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (_readonly_uri(db_path),))
+        cursor = conn.cursor()
+        for table in ARCHIVED_TABLES:
+            cursor.execute("SELECT sql FROM src.sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            cursor.execute(cursor.fetchone()[0])  # Definisi sama persis (termasuk kolom hasil ALTER TABLE)
+        placeholders = ', '.join('?' * len(ARCHIVED_TABLES))
+        cursor.execute(f"SELECT sql FROM src.sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+                       f"AND tbl_name IN ({placeholders})", ARCHIVED_TABLES)
+        for (statement,) in cursor.fetchall():
+            cursor.execute(statement)
+        for statement in ARCHIVE_INDEXES:
+            cursor.execute(statement)
+        cursor.execute('CREATE TABLE archive_info (key TEXT PRIMARY KEY, value TEXT)')
+
+        cursor.execute('BEGIN')
+        for table in ('attendance', 'leaves', 'attendance_scans'):
+            cursor.execute(f'INSERT INTO main.{table} SELECT * FROM src.{table} WHERE date BETWEEN ? AND ?',
+                           (start, end))
+        cursor.execute('''
+            INSERT INTO main.violations SELECT * FROM src.violations
+            WHERE attendance_id IN (SELECT id FROM main.attendance)
+        ''')
+        counts = _year_counts(cursor, 'main', start, end)
+        cursor.executemany('INSERT INTO archive_info (key, value) VALUES (?, ?)', [
+            ('year', str(year)), ('source', os.path.basename(db_path)),
+            ('archived_at', datetime.now().isoformat(timespec='seconds')),
+            *((f'rows_{table}', str(count)) for table, count in counts.items())
+        ])
+        conn.commit()
+        cursor.execute('DETACH DATABASE src')
+
+        integrity = cursor.execute('PRAGMA integrity_check').fetchone()[0]
+        if integrity != 'ok':
+            raise ArchiveError(f"File arsip {path} rusak: {integrity}")
+        return counts
+    finally:
+        conn.close()
+
+
+@db_retry.write_transaction
+def _move_out(db_manager, year, path, start, end, counts):
+    """Tahap 2: hapus data tahun ini dari database utama dan daftarkan arsipnya (satu transaksi)"""
+    conn = None
+    try:
+        conn = db_manager.get_connection()
+        cursor = conn.cursor()
+
+        if _year_counts(cursor, 'main', start, end) != counts:
+            raise ArchiveError(f"Data tahun {year} berubah saat arsip dibuat; ulangi proses arsip")
+        cursor.execute('SELECT MIN(id), MAX(id) FROM main.attendance WHERE date BETWEEN ? AND ?', (start, end))
+        min_id, max_id = cursor.fetchone()
+
+        # Pindah ke arsip tidak mengubah data yang terlihat; log dari trigger delete dibuang lagi
+        cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM main.change_log')
+        last_seq = cursor.fetchone()[0]
+
+        cursor.execute('''
+            DELETE FROM main.violations
+            WHERE attendance_id IN (SELECT id FROM main.attendance WHERE date BETWEEN ? AND ?)
+        ''', (start, end))
+        for table in ('attendance', 'leaves', 'attendance_scans'):
+            cursor.execute(f'DELETE FROM main.{table} WHERE date BETWEEN ? AND ?', (start, end))
+        cursor.execute('DELETE FROM main.change_log WHERE seq > ?', (last_seq,))
+        cursor.execute('''
+            INSERT INTO archives (year, file, attendance, violations, leaves, scans,
+                                  min_attendance_id, max_attendance_id, archived_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (year, os.path.basename(path), counts['attendance'], counts['violations'], counts['leaves'],
+              counts['attendance_scans'], min_id, max_id, datetime.now().isoformat(timespec='seconds')))
+
+        conn.commit()
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        raise e
+    finally:
+        if conn:
+            conn.close()
+
+
+def archive_year(db_manager, year, vacuum=True):
+    """Pindahkan data satu tahun yang sudah lewat ke absensi_<year>.db.
+
+    Mengembalikan dict: year, path, counts (baris per tabel), db_size_before,
+    db_size_after dan timings (ms). Bisa dikirim ke DatabaseWorker.
+    """
+    year = int(year)
+    if year >= date.today().year:
+        raise ArchiveError(f"Tahun {year} belum selesai; hanya tahun yang sudah lewat yang bisa diarsipkan")
+    if year in {archive['year'] for archive in db_manager.get_archives()}:
+        raise ArchiveError(f"Tahun {year} sudah diarsipkan")
+    path = archive_path(db_manager.db_path, year)
+    if os.path.exists(path):
+        raise ArchiveError(f"File {path} sudah ada; pindahkan atau hapus dulu")
+
+    started = time.perf_counter()
+    timings = {}
+    start, end = f"{year}-01-01", f"{year}-12-31"
+    db_size_before = os.path.getsize(db_manager.db_path)
+
+    t0 = time.perf_counter()
+    try:
+        counts = _copy_year(db_manager.db_path, path, year, start, end)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    timings['copy_ms'] = _ms(t0)
+    if not any(counts.values()):
+        os.remove(path)
+        raise ArchiveError(f"Tidak ada data tahun {year} di database utama")
+
+    t0 = time.perf_counter()
+    try:
+        _move_out(db_manager, year, path, start, end, counts)
+    except Exception:
+        os.remove(path)
+        raise
+    timings['move_ms'] = _ms(t0)
+    query_cache.clear()
+
+    if vacuum:
+        # Kembalikan halaman bekas data tahun ini agar file utama benar-benar mengecil
+        import maintenance
+        t0 = time.perf_counter()
+        maintenance.run_maintenance(db_manager, ('vacuum', 'checkpoint'), reason='archive')
+        timings['vacuum_ms'] = _ms(t0)
+
+    timings['total_ms'] = _ms(started)
+    return {
+        'year': year,
+        'path': path,
+        'counts': counts,
+        'db_size_before': db_size_before,
+        'db_size_after': os.path.getsize(db_manager.db_path),
+        'timings': timings,
+    }
+
+
+def restore_year(db_manager, year):
+    """Kembalikan data arsip satu tahun ke database utama lalu hapus file arsipnya"""
+    year = int(year)
+    archive = next((item for item in db_manager.get_archives() if item['year'] == year), None)
+    if archive is None:
+        raise ArchiveError(f"Tahun {year} tidak ada di daftar arsip")
+    path = archive['path']
+    if not os.path.exists(path):
+        raise ArchiveError(f"File arsip tahun {year} tidak ditemukan: {path}")
+
+    started = time.perf_counter()
+    busy_timeout_ms = db_retry.busy_timeout_ms()
+    # ATTACH tidak bisa di dalam transaksi, jadi koneksi dibuka sendiri (bukan lewat write_transaction)
+    conn = sqlite3.connect(db_manager.db_path, timeout=busy_timeout_ms / 1000, uri=True, isolation_level=None)
+    try:
+        conn.execute(f"PRAGMA busy_timeout = {busy_timeout_ms}")
+        conn.execute("ATTACH DATABASE ? AS arsip", (_readonly_uri(path),))
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM main.change_log").fetchone()[0]
+            for table in ARCHIVED_TABLES:
+                present = set(_table_columns(conn, 'arsip', table))
+                columns = ', '.join(column for column in _table_columns(conn, 'main', table) if column in present)
+                conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM arsip.{table}")
+            conn.execute("DELETE FROM main.change_log WHERE seq > ?", (last_seq,))
+            conn.execute("DELETE FROM main.archives WHERE year = ?", (year,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("DETACH DATABASE arsip")
+    finally:
+        conn.close()
+
+    os.remove(path)
+    query_cache.clear()
+    return {'year': year, 'path': path, 'total_ms': _ms(started)}
@@ -0,0 +1,151 @@
+"""Dialog Arsip Tahunan (Management → 📦 Arsip Tahunan): pindahkan tahun yang sudah lewat ke file arsip"""
+
+import os
+
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox, QDialog,
+                               QComboBox, QPlainTextEdit, QTableWidget)
+
+import archive
+from db_worker import DatabaseWorker
+from diagnostics import create_table, fill_table
+
+ARCHIVE_COLUMNS = [
+    ('year', "Tahun"), ('file', "File"), ('size_kb', "Ukuran (KB)"), ('attendance', "Absensi"),
+    ('violations', "Pelanggaran"), ('leaves', "Izin"), ('scans', "Scan"), ('archived_at', "Diarsipkan")
+]
+
+
+class ArchiveDialog(QDialog):
+    """Daftar tahun yang sudah diarsipkan beserta tombol arsipkan / kembalikan"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.running = False
+        self.setWindowTitle("📦 Arsip Tahunan")
+        self.resize(900, 500)
+
+        layout = QVBoxLayout()
+
+        info = QLabel("Data tahun yang sudah lewat dipindah ke file absensi_<tahun>.db di folder database. "
+                      "Laporan tetap bisa membuka tahun tersebut, tetapi datanya tidak bisa diubah "
+                      "sebelum arsipnya dikembalikan.")
+        info.setWordWrap(True)
+        layout.addWidget(info)
+
+        self.table = create_table(ARCHIVE_COLUMNS, 1)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.log = QPlainTextEdit()
+        self.log.setReadOnly(True)
+        self.log.setMaximumHeight(100)
+        layout.addWidget(self.log)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(QLabel("Tahun:"))
+        self.year_combo = QComboBox()
+        buttons_layout.addWidget(self.year_combo)
+
+        self.archive_btn = QPushButton("📦 Arsipkan")
+        self.archive_btn.clicked.connect(self.archive_selected_year)
+        buttons_layout.addWidget(self.archive_btn)
+
+        self.restore_btn = QPushButton("♻️ Kembalikan")
+        self.restore_btn.clicked.connect(self.restore_selected)
+        buttons_layout.addWidget(self.restore_btn)
+
+        buttons_layout.addStretch()
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        """Isi ulang daftar arsip dan pilihan tahun yang bisa diarsipkan"""
+        rows = []
+        for item in self.db_manager.get_archives():
+            size = os.path.getsize(item['path']) if os.path.exists(item['path']) else 0
+            rows.append({**item, 'size_kb': round(size / 1024, 1), 'archived_at': item['archived_at'].replace('T', ' ')})
+        fill_table(self.table, ARCHIVE_COLUMNS, rows)
+        self.table.resizeColumnsToContents()
+
+        self.year_combo.clear()
+        for year in archive.archivable_years(self.db_manager):
+            self.year_combo.addItem(str(year), year)
+        self.archive_btn.setEnabled(not self.running and self.year_combo.count() > 0)
+
+    def append_log(self, text):
+        self.log.appendPlainText(text)
+
+    def set_running(self, text):
+        self.running = bool(text)
+        self.status_label.setText(f"⏳ {text}..." if text else "")
+        self.archive_btn.setEnabled(not self.running and self.year_combo.count() > 0)
+        self.restore_btn.setEnabled(not self.running)
+
+    def closeEvent(self, event):
+        if self.running:
+            QMessageBox.information(self, "Info", "Tunggu sampai proses arsip selesai.")
+            event.ignore()
+            return
+        super().closeEvent(event)
+
+    # ==================== Aksi ====================
+
+    def archive_selected_year(self):
+        year = self.year_combo.currentData()
+        if year is None:
+            return
+        reply = QMessageBox.question(
+            self, "Konfirmasi Arsip",
+            f"Pindahkan data absensi, pelanggaran dan izin tahun {year} ke file arsip?\n\n"
+            "Data tetap tampil di laporan, tetapi tidak bisa diubah sebelum arsipnya dikembalikan.",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        self.set_running(f"Mengarsipkan tahun {year}")
+        DatabaseWorker.for_manager(self.db_manager).call(
+            archive.archive_year, year, on_result=self.on_archived, on_error=self.on_failed, owner=self)
+
+    def on_archived(self, result):
+        self.set_running(None)
+        counts = result['counts']
+        timings = ", ".join(f"{key[:-3]} {value:.0f} ms" for key, value in result['timings'].items())
+        self.append_log(f"✅ Tahun {result['year']}: {counts['attendance']} absensi, {counts['violations']} "
+                        f"pelanggaran, {counts['leaves']} izin dipindah ke {result['path']}. "
+                        f"Database {result['db_size_before'] / 1024:.0f} KB → "
+                        f"{result['db_size_after'] / 1024:.0f} KB ({timings})")
+        self.refresh()
+
+    def restore_selected(self):
+        row = self.table.currentRow()
+        if row < 0 or not self.table.selectionModel().hasSelection():
+            QMessageBox.warning(self, "Peringatan", "Pilih arsip di tabel terlebih dahulu!")
+            return
+        year = int(self.table.item(row, 0).data(0))
+        reply = QMessageBox.question(
+            self, "Konfirmasi Kembalikan",
+            f"Kembalikan data tahun {year} ke database utama?\n\nFile arsipnya akan dihapus setelah selesai.",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        self.set_running(f"Mengembalikan tahun {year}")
+        DatabaseWorker.for_manager(self.db_manager).call(
+            archive.restore_year, year, on_result=self.on_restored, on_error=self.on_failed, owner=self)
+
+    def on_restored(self, result):
+        self.set_running(None)
+        self.append_log(f"♻️ Tahun {result['year']} dikembalikan ke database utama ({result['total_ms']:.0f} ms)")
+        self.refresh()
+
+    def on_failed(self, error):
+        self.set_running(None)
+        self.append_log(f"❌ {error}")
+        QMessageBox.critical(self, "Error", f"Proses arsip gagal:\n{error}")
@@ -0,0 +1,499 @@
+"""
+Backup & restore database absensi saat aplikasi berjalan.
+
+Menyalin absensi.db dengan cp/Explorer saat aplikasi terbuka tidak aman di mode
+WAL (isi terbaru masih di absensi.db-wal). Modul ini memakai online backup API
+SQLite (sqlite3.Connection.backup) sehingga hasilnya selalu konsisten:
+
+- salinan dibuat bertahap PAGES_PER_STEP halaman per langkah dengan jeda
+  STEP_SLEEP di antaranya, jadi aplikasi (dan penulis lain) tetap responsif,
+- backup penuh disimpan terkompresi gzip (`<id>.db.gz`),
+- snapshot inkremental hanya menyimpan halaman yang berubah sejak snapshot
+  sebelumnya (hash SHA-1 per halaman di `<id>.pages`); setelah MAX_CHAIN
+  snapshot inkremental, backup berikutnya otomatis penuh,
+- rotasi: hanya `keep` backup penuh terakhir (beserta inkrementalnya) disimpan,
+- restore selalu diverifikasi dulu (checksum SHA-256 + PRAGMA integrity_check)
+  pada salinan sementara, database saat ini di-backup dulu, lalu isi snapshot
+  ditulis ke database aktif lewat backup API juga.
+
+Daftar snapshot ada di `manifest.json` di folder backup (default folder
+`backup` di samping database, atau ABSENSI_BACKUP_DIR). Setiap operasi
+mengembalikan waktu per tahap (ms) untuk ditampilkan di UI / CLI.
+
+    python -m absensi backup                 # backup penuh terkompresi
+    python -m absensi backup --incremental   # snapshot inkremental
+    python -m absensi backup --list
+    python -m absensi backup --restore ID
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime
+
+import db_retry
+import query_cache
+
+ENV_BACKUP_DIR = 'ABSENSI_BACKUP_DIR'
+MANIFEST = 'manifest.json'
+PAGES_PER_STEP = 256  # halaman per langkah backup API (1 MB untuk page_size 4096)
+STEP_SLEEP = 0.005  # detik jeda antar langkah agar koneksi lain sempat memakai database
+DEFAULT_KEEP = 7  # jumlah backup penuh yang disimpan
+MAX_CHAIN = 10  # snapshot inkremental maksimal di atas satu backup penuh
+CHUNK_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 6  # gzip; level 1 ~2x lebih cepat tetapi file ~15% lebih besar
+
+_INCREMENTAL_MAGIC = b'ABSINC1\n'
+_INCREMENTAL_HEADER = struct.Struct('>III')  # page_size, page_count, jumlah halaman berubah
+_PAGE_NUMBER = struct.Struct('>I')
+_DIGEST_SIZE = 20  # SHA-1
+
+_lock = threading.RLock()  # Satu operasi backup/restore sekaligus per proses
+
+
+class BackupError(Exception):
+    """Backup/restore gagal (snapshot tidak ada, rusak, atau checksum tidak cocok)"""
+
+
+# ==================== Manifest ====================
+
+def default_backup_dir(db_path):
+    return os.environ.get(ENV_BACKUP_DIR) or os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backup')
+
+
+def list_backups(backup_dir):
+    """Daftar snapshot di backup_dir, dari yang paling lama"""
+    path = os.path.join(backup_dir, MANIFEST)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['snapshots']
+
+
+def _save_manifest(backup_dir, snapshots):
+    path = os.path.join(backup_dir, MANIFEST)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'snapshots': snapshots}, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _find(snapshots, snapshot_id):
+    for snapshot in snapshots:
+        if snapshot['id'] == snapshot_id:
+            return snapshot
+    raise BackupError(f"Snapshot {snapshot_id} tidak ditemukan")
+
+
+def _chain(snapshots, snapshot_id):
+    """Snapshot dari backup penuh sampai snapshot_id (urutan penerapan restore)"""
+    chain = [_find(snapshots, snapshot_id)]
+    while chain[-1]['parent']:
+        chain.append(_find(snapshots, chain[-1]['parent']))
+    chain.reverse()
+    return chain
+
+
+def _new_id(snapshots):
+    snapshot_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+    existing = {snapshot['id'] for snapshot in snapshots}
+    suffix = 1
+    candidate = snapshot_id
+    while candidate in existing:
+        suffix += 1
+        candidate = f"{snapshot_id}_{suffix}"
+    return candidate
+
+
+def _remove_files(backup_dir, snapshot):
+    for name in (snapshot['file'], snapshot['id'] + '.pages'):
+        path = os.path.join(backup_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+# ==================== Salin Online ====================
+
+def _online_copy(source_path, dest_path, pages, sleep, progress, phase):
+    """Salin database dengan backup API, bertahap `pages` halaman dengan jeda `sleep` detik"""
+    busy_timeout = db_retry.busy_timeout_ms() / 1000
+    source = sqlite3.connect(source_path, timeout=busy_timeout)
+    dest = sqlite3.connect(dest_path, timeout=busy_timeout)
+
+    def step(status, remaining, total):
+        if progress:
+            progress(phase, total - remaining, total)
+        if sleep and remaining:
+            time.sleep(sleep)
+
+    try:
+        # Transaksi baca yang tetap terbuka selama backup: semua langkah membaca snapshot yang sama.
+        # Tanpa ini backup API mengulang dari awal setiap kali koneksi lain menulis, sehingga
+        # backup bertahap tidak pernah selesai selama ada penulis aktif. Di mode WAL transaksi
+        # baca tidak menahan penulis lain.
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchall()
+        source.backup(dest, pages=pages, progress=step)
+        return dest
+    except Exception:
+        dest.close()
+        raise
+    finally:
+        source.close()
+
+
+def _hash_pages(path, page_size, progress=None):
+    """SHA-1 per halaman (bytes berurutan) dan SHA-256 seluruh file"""
+    digests = bytearray()
+    whole = hashlib.sha256()
+    total = os.path.getsize(path) // page_size
+    with open(path, 'rb') as f:
+        for index in range(total):
+            page = f.read(page_size)
+            digests += hashlib.sha1(page).digest()
+            whole.update(page)
+            if progress and index % 256 == 0:
+                progress('hash', index, total)
+    return bytes(digests), whole.hexdigest()
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ==================== Backup ====================
+
+def create_backup(db_path, backup_dir=None, incremental=False, compress=True, keep=DEFAULT_KEEP,
+                  pages=PAGES_PER_STEP, sleep=STEP_SLEEP, progress=None, note=None):
+    """Backup online db_path ke backup_dir.
+
+    Mengembalikan dict: snapshot (entri manifest, None jika inkremental tanpa
+    perubahan), skipped, removed (id snapshot yang dirotasi) dan timings (ms).
+    progress(phase, done, total) dipanggil dari thread pemanggil.
+    """
+    backup_dir = backup_dir or default_backup_dir(db_path)
+    os.makedirs(backup_dir, exist_ok=True)
+    if not os.path.exists(db_path):
+        raise BackupError(f"Database {db_path} tidak ditemukan")
+
+    with _lock:
+        started = time.perf_counter()
+        timings = {}
+        snapshots = list_backups(backup_dir)
+        snapshot_id = _new_id(snapshots)
+        temp_path = os.path.join(backup_dir, f".{snapshot_id}.tmp")
+
+        try:
+            # 1. Salinan konsisten (file tunggal, tanpa WAL) dari database aktif
+            t0 = time.perf_counter()
+            conn = _online_copy(db_path, temp_path, pages, sleep, progress, 'copy')
+            try:
+                conn.execute("PRAGMA journal_mode=DELETE")
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+                try:
+                    data_version = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+                except sqlite3.OperationalError:
+                    data_version = None  # Database lama tanpa tabel data_version
+            finally:
+                conn.close()
+            timings['copy_ms'] = _ms(t0)
+
+            # 2. Hash per halaman untuk snapshot inkremental berikutnya
+            t0 = time.perf_counter()
+            digests, sha256 = _hash_pages(temp_path, page_size, progress)
+            page_count = len(digests) // _DIGEST_SIZE
+            timings['hash_ms'] = _ms(t0)
+
+            parent = _incremental_parent(backup_dir, snapshots, page_size) if incremental else None
+
+            # 3. Tulis snapshot
+            t0 = time.perf_counter()
+            if parent is not None:
+                with open(os.path.join(backup_dir, parent['id'] + '.pages'), 'rb') as f:
+                    parent_digests = f.read()
+                changed = [index for index in range(page_count)
+                           if digests[index * _DIGEST_SIZE:(index + 1) * _DIGEST_SIZE]
+                           != parent_digests[index * _DIGEST_SIZE:(index + 1) * _DIGEST_SIZE]]
+                if not changed and page_count == parent['page_count']:
+                    timings['total_ms'] = _ms(started)
+                    return {'snapshot': None, 'skipped': True, 'removed': [], 'timings': timings}
+                file_name = f"{snapshot_id}.inc.gz"
+                _write_incremental(temp_path, os.path.join(backup_dir, file_name),
+                                   page_size, page_count, changed, progress)
+            else:
+                changed = None
+                file_name = f"{snapshot_id}.db.gz" if compress else f"{snapshot_id}.db"
+                if compress:
+                    _compress(temp_path, os.path.join(backup_dir, file_name), progress)
+                else:
+                    shutil.copyfile(temp_path, os.path.join(backup_dir, file_name))
+            with open(os.path.join(backup_dir, snapshot_id + '.pages'), 'wb') as f:
+                f.write(digests)
+            timings['write_ms'] = _ms(t0)
+            db_size = os.path.getsize(temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        snapshot = {
+            'id': snapshot_id,
+            'kind': 'incremental' if parent is not None else 'full',
+            'parent': parent['id'] if parent is not None else None,
+            'file': file_name,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'data_version': data_version,
+            'page_size': page_size,
+            'page_count': page_count,
+            'changed_pages': len(changed) if changed is not None else page_count,
+            'db_size': db_size,
+            'size': os.path.getsize(os.path.join(backup_dir, file_name)),
+            'sha256': sha256,
+            'note': note,
+        }
+        snapshots.append(snapshot)
+
+        t0 = time.perf_counter()
+        removed = rotate_backups(backup_dir, keep, snapshots)
+        timings['rotate_ms'] = _ms(t0)
+        timings['total_ms'] = _ms(started)
+        snapshot['timings'] = timings
+        _save_manifest(backup_dir, snapshots)
+        return {'snapshot': snapshot, 'skipped': False, 'removed': removed, 'timings': timings}
+
+
+def _incremental_parent(backup_dir, snapshots, page_size):
+    """Snapshot terakhir sebagai dasar inkremental, atau None jika harus backup penuh"""
+    if not snapshots:
+        return None
+    parent = snapshots[-1]
+    if parent['page_size'] != page_size or not os.path.exists(os.path.join(backup_dir, parent['id'] + '.pages')):
+        return None
+    if len(_chain(snapshots, parent['id'])) > MAX_CHAIN:
+        return None
+    return parent
+
+
+def _compress(source_path, dest_path, progress=None):
+    total = os.path.getsize(source_path)
+    done = 0
+    with open(source_path, 'rb') as source, gzip.open(dest_path, 'wb', compresslevel=COMPRESS_LEVEL) as dest:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            dest.write(chunk)
+            done += len(chunk)
+            if progress:
+                progress('write', done, total)
+
+
+def _write_incremental(source_path, dest_path, page_size, page_count, changed, progress=None):
+    with open(source_path, 'rb') as source, gzip.open(dest_path, 'wb', compresslevel=COMPRESS_LEVEL) as dest:
+        dest.write(_INCREMENTAL_MAGIC)
+        dest.write(_INCREMENTAL_HEADER.pack(page_size, page_count, len(changed)))
+        for done, index in enumerate(changed):
+            source.seek(index * page_size)
+            dest.write(_PAGE_NUMBER.pack(index))
+            dest.write(source.read(page_size))
+            if progress and done % 256 == 0:
+                progress('write', done, len(changed))
+
+
+def rotate_backups(backup_dir, keep=DEFAULT_KEEP, snapshots=None):
+    """Hapus backup penuh lama (beserta inkrementalnya) sehingga tersisa `keep` backup penuh.
+
+    Jika snapshots diberikan, list itu diubah di tempat dan manifest tidak
+    disimpan (dipakai create_backup); jika tidak, manifest dibaca dan disimpan.
+    """
+    save = snapshots is None
+    if save:
+        snapshots = list_backups(backup_dir)
+    full_ids = [snapshot['id'] for snapshot in snapshots if snapshot['kind'] == 'full']
+    dropped = set(full_ids[:max(0, len(full_ids) - max(1, keep))])
+    if not dropped:
+        return []
+
+    removed = []
+    for snapshot in list(snapshots):
+        if _chain(snapshots, snapshot['id'])[0]['id'] in dropped:
+            removed.append(snapshot)
+    for snapshot in removed:
+        _remove_files(backup_dir, snapshot)
+        snapshots.remove(snapshot)
+    if save:
+        _save_manifest(backup_dir, snapshots)
+    return [snapshot['id'] for snapshot in removed]
+
+
+def delete_backup(backup_dir, snapshot_id):
+    """Hapus satu snapshot beserta snapshot inkremental yang bergantung padanya"""
+    with _lock:
+        snapshots = list_backups(backup_dir)
+        _find(snapshots, snapshot_id)
+        removed = [snapshot for snapshot in snapshots
+                   if snapshot_id in [item['id'] for item in _chain(snapshots, snapshot['id'])]]
+        for snapshot in removed:
+            _remove_files(backup_dir, snapshot)
+            snapshots.remove(snapshot)
+        _save_manifest(backup_dir, snapshots)
+        return [snapshot['id'] for snapshot in removed]
+
+
+# ==================== Verifikasi & Restore ====================
+
+def _reconstruct(backup_dir, chain, dest_path, progress=None):
+    """Bangun ulang file database dari backup penuh + snapshot inkremental di atasnya"""
+    full = chain[0]
+    source_path = os.path.join(backup_dir, full['file'])
+    if not os.path.exists(source_path):
+        raise BackupError(f"File backup {full['file']} tidak ditemukan")
+    opener = gzip.open if full['file'].endswith('.gz') else open
+    with opener(source_path, 'rb') as source, open(dest_path, 'wb') as dest:
+        shutil.copyfileobj(source, dest, CHUNK_SIZE)
+
+    with open(dest_path, 'r+b') as dest:
+        for step, snapshot in enumerate(chain[1:], 1):
+            path = os.path.join(backup_dir, snapshot['file'])
+            if not os.path.exists(path):
+                raise BackupError(f"File backup {snapshot['file']} tidak ditemukan")
+            with gzip.open(path, 'rb') as source:
+                if source.read(len(_INCREMENTAL_MAGIC)) != _INCREMENTAL_MAGIC:
+                    raise BackupError(f"File {snapshot['file']} bukan snapshot inkremental")
+                page_size, page_count, changed = _INCREMENTAL_HEADER.unpack(
+                    source.read(_INCREMENTAL_HEADER.size))
+                for _ in range(changed):
+                    index, = _PAGE_NUMBER.unpack(source.read(_PAGE_NUMBER.size))
+                    dest.seek(index * page_size)
+                    dest.write(source.read(page_size))
+                dest.truncate(page_count * page_size)
+            if progress:
+                progress('reconstruct', step, len(chain) - 1)
+
+
+def _verify_file(path, snapshot):
+    """Checksum dan integrity_check file hasil rekonstruksi; kembalikan (checksum_ok, integrity, timings)"""
+    timings = {}
+    t0 = time.perf_counter()
+    checksum_ok = _file_sha256(path) == snapshot['sha256']
+    timings['checksum_ms'] = _ms(t0)
+
+    t0 = time.perf_counter()
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+    except sqlite3.DatabaseError as e:
+        rows = [(str(e),)]
+    finally:
+        conn.close()
+    timings['integrity_ms'] = _ms(t0)
+    return checksum_ok, '; '.join(str(row[0]) for row in rows[:5]), timings
+
+
+def verify_backup(backup_dir, snapshot_id, progress=None):
+    """Rekonstruksi snapshot ke file sementara lalu cek checksum dan integrity_check"""
+    with _lock:
+        started = time.perf_counter()
+        chain = _chain(list_backups(backup_dir), snapshot_id)
+        temp_path = os.path.join(backup_dir, f".verify-{snapshot_id}.tmp")
+        try:
+            t0 = time.perf_counter()
+            _reconstruct(backup_dir, chain, temp_path, progress)
+            timings = {'reconstruct_ms': _ms(t0)}
+            checksum_ok, integrity, verify_timings = _verify_file(temp_path, chain[-1])
+            timings.update(verify_timings)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        timings['total_ms'] = _ms(started)
+        return {
+            'ok': checksum_ok and integrity == 'ok',
+            'checksum_ok': checksum_ok,
+            'integrity': integrity,
+            'timings': timings,
+        }
+
+
+def restore_backup(db_path, snapshot_id, backup_dir=None, safety_backup=True,
+                   pages=PAGES_PER_STEP, sleep=STEP_SLEEP, progress=None):
+    """Kembalikan isi db_path ke snapshot_id.
+
+    Snapshot diverifikasi dulu di file sementara; database aktif tidak disentuh
+    jika verifikasi gagal (BackupError). Sebelum ditimpa, database saat ini
+    di-backup penuh (kecuali safety_backup=False). data_version dinaikkan
+    melewati nilai sebelum restore agar cache dan tampilan memuat ulang data.
+    """
+    backup_dir = backup_dir or default_backup_dir(db_path)
+    with _lock:
+        started = time.perf_counter()
+        timings = {}
+        chain = _chain(list_backups(backup_dir), snapshot_id)
+        temp_path = os.path.join(backup_dir, f".restore-{snapshot_id}.tmp")
+        safety = None
+        try:
+            t0 = time.perf_counter()
+            _reconstruct(backup_dir, chain, temp_path, progress)
+            timings['reconstruct_ms'] = _ms(t0)
+
+            checksum_ok, integrity, verify_timings = _verify_file(temp_path, chain[-1])
+            timings['verify_ms'] = round(verify_timings['checksum_ms'] + verify_timings['integrity_ms'], 1)
+            if not checksum_ok:
+                raise BackupError(f"Checksum snapshot {snapshot_id} tidak cocok, restore dibatalkan")
+            if integrity != 'ok':
+                raise BackupError(f"Snapshot {snapshot_id} rusak ({integrity}), restore dibatalkan")
+
+            if safety_backup and os.path.exists(db_path):
+                t0 = time.perf_counter()
+                safety = create_backup(db_path, backup_dir, keep=len(list_backups(backup_dir)) + 1,
+                                       pages=pages, sleep=sleep, progress=progress,
+                                       note=f"Sebelum restore {snapshot_id}")['snapshot']
+                timings['safety_backup_ms'] = _ms(t0)
+
+            t0 = time.perf_counter()
+            previous_version = _read_data_version(db_path)
+            conn = _online_copy(temp_path, db_path, pages, sleep, progress, 'restore')
+            try:
+                if previous_version is not None:
+                    try:
+                        conn.execute("UPDATE data_version SET version = MAX(version, ?) + 1 WHERE id = 1",
+                                     (previous_version,))
+                        conn.commit()
+                    except sqlite3.OperationalError:
+                        pass  # Snapshot dari versi aplikasi lama; tabel dibuat ulang oleh init_database
+                quick_check = conn.execute("PRAGMA quick_check").fetchone()[0]
+            finally:
+                conn.close()
+            timings['restore_ms'] = _ms(t0)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        query_cache.clear()
+        timings['total_ms'] = _ms(started)
+        return {
+            'snapshot': chain[-1],
+            'safety_backup': safety['id'] if safety else None,
+            'quick_check': quick_check,
+            'timings': timings,
+        }
+
+
+def _read_data_version(db_path):
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path, timeout=db_retry.busy_timeout_ms() / 1000)
+    try:
+        return conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+    except (sqlite3.OperationalError, TypeError):
+        return None
+    finally:
+        conn.close()
@@ -0,0 +1,285 @@
+"""Dialog Backup Database (Management → 🗄️ Backup Database): backup online, snapshot inkremental, verifikasi dan restore"""
+
+import os
+import threading
+
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox, QDialog,
+                               QCheckBox, QSpinBox, QProgressBar, QPlainTextEdit, QTableWidget)
+from PySide6.QtCore import QObject, Signal
+
+import backup
+from diagnostics import create_table, fill_table
+
+BACKUP_COLUMNS = [
+    ('id', "ID"), ('created_at', "Waktu"), ('kind_label', "Jenis"), ('size_kb', "Ukuran (KB)"),
+    ('ratio', "Rasio (%)"), ('changed_pages', "Halaman"), ('total_ms', "Durasi (ms)"), ('note', "Catatan")
+]
+
+PHASE_LABELS = {
+    'copy': "Menyalin database",
+    'hash': "Menghitung checksum halaman",
+    'write': "Menulis file backup",
+    'reconstruct': "Menyusun snapshot",
+    'restore': "Menulis ke database aktif",
+}
+
+
+def format_timings(timings):
+    return ", ".join(f"{key[:-3]} {value:.0f} ms" for key, value in timings.items())
+
+
+class _TaskSignals(QObject):
+    """Progress dan hasil dari thread backup ke thread GUI"""
+    progress = Signal(str, int, int)
+    finished = Signal(object)
+    failed = Signal(object)
+
+
+class BackupDialog(QDialog):
+    """Daftar snapshot backup beserta tombol backup penuh/inkremental, verifikasi, restore dan hapus"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.backup_dir = backup.default_backup_dir(db_manager.db_path)
+        self.running = False
+        self.setWindowTitle("🗄️ Backup Database")
+        self.resize(1000, 600)
+
+        self.task_signals = None
+
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel(f"Folder backup: {os.path.abspath(self.backup_dir)}")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        options_layout = QHBoxLayout()
+        self.compress_check = QCheckBox("Kompresi gzip")
+        self.compress_check.setChecked(True)
+        options_layout.addWidget(self.compress_check)
+        options_layout.addWidget(QLabel("Simpan backup penuh terakhir:"))
+        self.keep_spin = QSpinBox()
+        self.keep_spin.setRange(1, 100)
+        self.keep_spin.setValue(backup.DEFAULT_KEEP)
+        options_layout.addWidget(self.keep_spin)
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+
+        self.table = create_table(BACKUP_COLUMNS, 7)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        layout.addWidget(self.table)
+
+        self.progress_label = QLabel()
+        layout.addWidget(self.progress_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        self.log = QPlainTextEdit()
+        self.log.setReadOnly(True)
+        self.log.setMaximumHeight(120)
+        layout.addWidget(self.log)
+
+        buttons_layout = QHBoxLayout()
+        self.full_btn = QPushButton("💾 Backup Penuh")
+        self.full_btn.clicked.connect(lambda: self.run_backup(incremental=False))
+        buttons_layout.addWidget(self.full_btn)
+
+        self.incremental_btn = QPushButton("➕ Snapshot Inkremental")
+        self.incremental_btn.clicked.connect(lambda: self.run_backup(incremental=True))
+        buttons_layout.addWidget(self.incremental_btn)
+
+        self.verify_btn = QPushButton("🔍 Verifikasi")
+        self.verify_btn.clicked.connect(self.verify_selected)
+        buttons_layout.addWidget(self.verify_btn)
+
+        self.restore_btn = QPushButton("♻️ Restore")
+        self.restore_btn.clicked.connect(self.restore_selected)
+        buttons_layout.addWidget(self.restore_btn)
+
+        self.delete_btn = QPushButton("🗑️ Hapus")
+        self.delete_btn.clicked.connect(self.delete_selected)
+        buttons_layout.addWidget(self.delete_btn)
+
+        buttons_layout.addStretch()
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+        self.refresh_backups()
+
+    # ==================== Daftar Snapshot ====================
+
+    def refresh_backups(self):
+        """Isi ulang tabel snapshot dari manifest (terbaru di atas)"""
+        rows = []
+        for snapshot in reversed(backup.list_backups(self.backup_dir)):
+            rows.append({
+                'id': snapshot['id'],
+                'created_at': snapshot['created_at'].replace('T', ' '),
+                'kind_label': "Penuh" if snapshot['kind'] == 'full' else f"Inkremental (dari {snapshot['parent']})",
+                'size_kb': round(snapshot['size'] / 1024, 1),
+                'ratio': round(snapshot['size'] * 100 / snapshot['db_size'], 1) if snapshot['db_size'] else 0.0,
+                'changed_pages': snapshot['changed_pages'],
+                'total_ms': snapshot.get('timings', {}).get('total_ms', 0.0),
+                'note': snapshot.get('note') or '',
+            })
+        fill_table(self.table, BACKUP_COLUMNS, rows)
+        self.table.resizeColumnsToContents()
+
+    def selected_id(self):
+        row = self.table.currentRow()
+        if row < 0 or not self.table.selectionModel().hasSelection():
+            QMessageBox.warning(self, "Peringatan", "Pilih snapshot di tabel terlebih dahulu!")
+            return None
+        return self.table.item(row, 0).text()
+
+    # ==================== Tugas di Thread Terpisah ====================
+
+    def start_task(self, title, func, on_finished):
+        """Jalankan func(progress) di thread sendiri; backup bisa lama dan tidak boleh menahan antrean DatabaseWorker"""
+        if self.running:
+            return
+        self.running = True
+        self.set_buttons_enabled(False)
+        self.progress_label.setText(f"⏳ {title}...")
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+
+        signals = _TaskSignals()
+        signals.progress.connect(self.on_progress)
+        signals.finished.connect(lambda result: self.finish_task(on_finished, result))
+        signals.failed.connect(lambda error: self.finish_task(self.on_task_failed, error))
+        self.task_signals = signals  # Tetap hidup sampai tugas selesai
+
+        def run():
+            try:
+                result = func(lambda phase, done, total: signals.progress.emit(phase, done, total))
+            except Exception as e:
+                signals.failed.emit(e)
+            else:
+                signals.finished.emit(result)
+
+        threading.Thread(target=run, name="backup", daemon=True).start()
+
+    def on_progress(self, phase, done, total):
+        self.progress_label.setText(f"⏳ {PHASE_LABELS.get(phase, phase)}...")
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+
+    def finish_task(self, callback, value):
+        self.running = False
+        self.set_buttons_enabled(True)
+        self.progress_bar.setVisible(False)
+        self.progress_label.clear()
+        callback(value)
+
+    def on_task_failed(self, error):
+        self.append_log(f"❌ {error}")
+        QMessageBox.critical(self, "Error", f"Operasi backup gagal:\n{error}")
+
+    def set_buttons_enabled(self, enabled):
+        for button in (self.full_btn, self.incremental_btn, self.verify_btn, self.restore_btn, self.delete_btn):
+            button.setEnabled(enabled)
+
+    def append_log(self, text):
+        self.log.appendPlainText(text)
+
+    def closeEvent(self, event):
+        if self.running:
+            QMessageBox.information(self, "Info", "Tunggu sampai proses backup/restore selesai.")
+            event.ignore()
+            return
+        super().closeEvent(event)
+
+    # ==================== Aksi ====================
+
+    def run_backup(self, incremental):
+        db_path = self.db_manager.db_path
+        compress = self.compress_check.isChecked()
+        keep = self.keep_spin.value()
+        self.start_task(
+            "Membuat snapshot inkremental" if incremental else "Membuat backup penuh",
+            lambda progress: backup.create_backup(db_path, self.backup_dir, incremental=incremental,
+                                                  compress=compress, keep=keep, progress=progress),
+            self.on_backup_finished)
+
+    def on_backup_finished(self, result):
+        if result['skipped']:
+            self.append_log(f"ℹ️ Tidak ada perubahan sejak snapshot terakhir ({format_timings(result['timings'])})")
+            return
+        snapshot = result['snapshot']
+        kind = "Backup penuh" if snapshot['kind'] == 'full' else "Snapshot inkremental"
+        self.append_log(f"✅ {kind} {snapshot['id']}: {snapshot['size'] / 1024:.1f} KB "
+                        f"({snapshot['changed_pages']}/{snapshot['page_count']} halaman) - "
+                        f"{format_timings(result['timings'])}")
+        if result['removed']:
+            self.append_log(f"🗑️ Rotasi: {', '.join(result['removed'])} dihapus")
+        self.refresh_backups()
+
+    def verify_selected(self):
+        snapshot_id = self.selected_id()
+        if snapshot_id is None:
+            return
+        self.start_task(f"Memverifikasi {snapshot_id}",
+                        lambda progress: backup.verify_backup(self.backup_dir, snapshot_id, progress),
+                        lambda result: self.on_verify_finished(snapshot_id, result))
+
+    def on_verify_finished(self, snapshot_id, result):
+        timings = format_timings(result['timings'])
+        if result['ok']:
+            self.append_log(f"✅ {snapshot_id} valid (checksum & integrity_check OK) - {timings}")
+        else:
+            checksum = "cocok" if result['checksum_ok'] else "TIDAK cocok"
+            self.append_log(f"❌ {snapshot_id} rusak: checksum {checksum}, integrity_check: {result['integrity']}")
+            QMessageBox.warning(self, "Verifikasi Gagal", f"Snapshot {snapshot_id} tidak valid.")
+
+    def restore_selected(self):
+        snapshot_id = self.selected_id()
+        if snapshot_id is None:
+            return
+        reply = QMessageBox.question(
+            self, "Konfirmasi Restore",
+            f"Kembalikan database ke snapshot {snapshot_id}?\n\n"
+            "Snapshot diverifikasi dulu, dan database saat ini otomatis di-backup penuh "
+            "sebelum ditimpa.",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        db_path = self.db_manager.db_path
+        self.start_task(f"Restore {snapshot_id}",
+                        lambda progress: backup.restore_backup(db_path, snapshot_id, self.backup_dir,
+                                                               progress=progress),
+                        self.on_restore_finished)
+
+    def on_restore_finished(self, result):
+        # Snapshot dari versi lama mungkin belum punya kolom/tabel terbaru
+        self.db_manager.close_version_connection()
+        self.db_manager.init_database()
+        self.append_log(f"♻️ Restore {result['snapshot']['id']} selesai (quick_check: {result['quick_check']}, "
+                        f"backup sebelum restore: {result['safety_backup'] or '-'}) - "
+                        f"{format_timings(result['timings'])}")
+        self.refresh_backups()
+        QMessageBox.information(self, "Sukses",
+                                f"Database dikembalikan ke snapshot {result['snapshot']['id']}.\n"
+                                "Klik Refresh di tab Input Absensi untuk memuat ulang data.")
+
+    def delete_selected(self):
+        snapshot_id = self.selected_id()
+        if snapshot_id is None:
+            return
+        dependents = [snapshot['id'] for snapshot in backup.list_backups(self.backup_dir)
+                      if snapshot['parent'] == snapshot_id]
+        message = f"Hapus snapshot {snapshot_id}?"
+        if dependents:
+            message += "\n\nSnapshot inkremental yang bergantung padanya juga akan dihapus."
+        if QMessageBox.question(self, "Konfirmasi Hapus", message,
+                                QMessageBox.Yes | QMessageBox.No, QMessageBox.No) != QMessageBox.Yes:
+            return
+        removed = backup.delete_backup(self.backup_dir, snapshot_id)
+        self.append_log(f"🗑️ {', '.join(removed)} dihapus")
+        self.refresh_backups()
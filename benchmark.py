@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Benchmark pipeline absensi: parse log, simpan, laporan dan export.
+
+Data dibuat oleh synthetic_data.py (N karyawan × D hari, seed tetap) di folder
+sementara, lalu setiap skenario dijalankan --repeat kali. Hasil ditulis
+sebagai JSON agar bisa dibandingkan antar versi:
+
+    python benchmark.py --employees 50 --days 30 -o bench_before.json
+    python benchmark.py --employees 50 --days 30 -o bench_after.json --compare bench_before.json
+
+Dengan --compare, exit code 1 jika ada skenario yang median-nya lebih lambat
+dari --tolerance (default 10%).
+
+Cache query (query_cache) dikosongkan sebelum setiap jalan agar angka tetap
+mengukur kerja sebenarnya; skenario `reports_cached` sengaja mengukur laporan
+yang dibuka ulang tanpa perubahan data (cache sudah terisi).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import query_cache
+import synthetic_data
+from database import DatabaseManager
+
+SCENARIOS = [
+    'parse', 'save', 'open_database', 'employee_list', 'read_attendance', 'employee_report', 'attendance_matrix', 'violation_report',
+    'export_employee_xlsx', 'export_employee_csv',
+    'export_matrix_xlsx', 'export_matrix_csv',
+    'export_violation_xlsx', 'export_violation_csv', 'reports_cached',
+]
+
+# Skenario yang diukur dengan cache terisi (satu jalan pemanasan sebelum diukur)
+CACHED_SCENARIOS = {'reports_cached'}
+
+
+class BenchmarkContext:
+    """Data dan path bersama untuk semua skenario"""
+    def __init__(self, workdir, employees, start_date, days, seed, sample):
+        self.workdir = workdir
+        self.employees = employees
+        self.start_date = start_date
+        self.end_date = start_date + timedelta(days=days - 1)
+        self.start_str = start_date.isoformat()
+        self.end_str = self.end_date.isoformat()
+        self.days = days
+        self.seed = seed
+        self.sample = sample
+        self.log_files = []
+        self.parsed = []
+        self.db_path = os.path.join(workdir, 'bench.db')
+        self.db_manager = None
+        self.counts = {}
+
+    def output(self, name):
+        return os.path.join(self.workdir, name)
+
+
+def git_revision():
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        )
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ==================== SKENARIO ====================
+
+def run_parse(ctx):
+    from main import ExcelProcessor, suppress_output
+
+    parsed = []
+    with suppress_output():
+        for file_path, day, _ in ctx.log_files:
+            parsed.append((day, ExcelProcessor.process_excel_log(file_path)))
+
+    expected = sum(count for _, _, count in ctx.log_files)
+    records = sum(len(records) for _, records in parsed)
+    if records != expected:
+        raise RuntimeError(f"Parse menghasilkan {records} record, seharusnya {expected}")
+    ctx.parsed = parsed
+    return records
+
+
+def run_save(ctx):
+    db_path = ctx.output('save.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    db_manager = DatabaseManager(db_path)
+    records = 0
+    for day, day_records in ctx.parsed:
+        db_manager.save_attendance_data(day.isoformat(), day_records, mode='replace')
+        records += len(day_records)
+    return records
+
+
+def run_open_database(ctx):
+    # Startup: DatabaseManager untuk database yang skemanya sudah terbaru (dibuka 10 kali per jalan)
+    for _ in range(10):
+        DatabaseManager(ctx.db_path)
+    return 10
+
+
+def run_employee_list(ctx):
+    # Management Karyawan: semua karyawan + jumlah pelanggaran/izin dalam satu query
+    return len(ctx.db_manager.get_employee_summaries())
+
+
+def run_read_attendance(ctx):
+    # Semua record absensi semua karyawan ditahan sekaligus, seperti laporan kehadiran setahun
+    records = [
+        ctx.db_manager.get_attendance_by_employee_period(employee['id'], ctx.start_str, ctx.end_str)
+        for employee in ctx.db_manager.get_all_employees()
+    ]
+    return sum(len(rows) for rows in records)
+
+
+def sample_employees(ctx):
+    employees = sorted(ctx.db_manager.get_all_employees(), key=lambda x: x['id'])
+    return employees[:ctx.sample]
+
+
+def run_employee_report(ctx):
+    from report_calc import build_employee_report
+
+    rows = 0
+    for employee in sample_employees(ctx):
+        attendance_data = ctx.db_manager.get_attendance_by_employee_period(employee['id'], ctx.start_str, ctx.end_str)
+        report_rows, _ = build_employee_report(ctx.db_manager, employee['id'], attendance_data)
+        rows += len(report_rows)
+    return rows
+
+
+def run_attendance_matrix(ctx):
+    from report_calc import build_attendance_matrix
+    from report_export import build_attendance_matrix_table
+
+    employees, dates, attendance_data = build_attendance_matrix(ctx.db_manager, ctx.start_date, ctx.end_date)
+    rows, _ = build_attendance_matrix_table(ctx.db_manager, employees, dates, attendance_data)
+    return len(rows) * len(dates)
+
+
+def run_violation_report(ctx):
+    from report_calc import build_violation_report
+    from report_export import build_violation_report_table
+
+    employees, violation_data = build_violation_report(ctx.db_manager, ctx.start_date, ctx.end_date)
+    groups = build_violation_report_table(employees, violation_data)
+    return sum(len(violations) for _, violations in groups)
+
+
+def _run_employee_export(ctx, exporter, extension):
+    employees = sample_employees(ctx)
+    for employee in employees:
+        exporter(ctx.db_manager, ctx.output(f"karyawan_{employee['id']}.{extension}"),
+                 employee['id'], employee['name'], ctx.start_str, ctx.end_str)
+    return len(employees)
+
+
+def run_export_employee_xlsx(ctx):
+    from report_export import export_employee_report_xlsx
+    return _run_employee_export(ctx, export_employee_report_xlsx, 'xlsx')
+
+
+def run_export_employee_csv(ctx):
+    from report_export import export_employee_report_csv
+    return _run_employee_export(ctx, export_employee_report_csv, 'csv')
+
+
+def _run_matrix_export(ctx, exporter, extension):
+    from report_calc import build_attendance_matrix
+
+    employees, dates, attendance_data = build_attendance_matrix(ctx.db_manager, ctx.start_date, ctx.end_date)
+    exporter(ctx.db_manager, ctx.output(f"kehadiran.{extension}"), employees, dates, attendance_data)
+    return len(employees) * len(dates)
+
+
+def run_export_matrix_xlsx(ctx):
+    from report_export import export_attendance_matrix_xlsx
+    return _run_matrix_export(ctx, export_attendance_matrix_xlsx, 'xlsx')
+
+
+def run_export_matrix_csv(ctx):
+    from report_export import export_attendance_matrix_csv
+    return _run_matrix_export(ctx, export_attendance_matrix_csv, 'csv')
+
+
+def _run_violation_export(ctx, exporter, extension):
+    from report_calc import build_violation_report
+
+    employees, violation_data = build_violation_report(ctx.db_manager, ctx.start_date, ctx.end_date)
+    exporter(ctx.output(f"pelanggaran.{extension}"), employees, violation_data, ctx.start_date, ctx.end_date)
+    return sum(data['total_violations'] for data in violation_data.values())
+
+
+def run_export_violation_xlsx(ctx):
+    from report_export import export_violation_report_xlsx
+    return _run_violation_export(ctx, export_violation_report_xlsx, 'xlsx')
+
+
+def run_export_violation_csv(ctx):
+    from report_export import export_violation_report_csv
+    return _run_violation_export(ctx, export_violation_report_csv, 'csv')
+
+
+def run_reports_cached(ctx):
+    from report_calc import build_attendance_matrix, build_violation_report
+
+    rows = run_employee_report(ctx)
+    build_attendance_matrix(ctx.db_manager, ctx.start_date, ctx.end_date)
+    build_violation_report(ctx.db_manager, ctx.start_date, ctx.end_date)
+    return rows
+
+
+# ==================== RUNNER ====================
+
+def prepare(ctx, log_format):
+    """Buat log per hari dan database benchmark"""
+    ctx.log_files = synthetic_data.generate_logs(
+        ctx.output('logs'), ctx.employees, ctx.start_date, ctx.days, ctx.seed, f".{log_format}"
+    )
+    ctx.counts = synthetic_data.generate_database(ctx.db_path, ctx.employees, ctx.start_date, ctx.days, ctx.seed)
+    ctx.db_manager = DatabaseManager(ctx.db_path)
+
+
+def measure_memory(func, ctx):
+    """Puncak alokasi Python (KB) selama satu kali jalan, diukur terpisah karena tracemalloc memperlambat"""
+    tracemalloc.start()
+    try:
+        func(ctx)
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def time_scenario(ctx, name, repeat, memory=False):
+    func = globals()[f"run_{name}"]
+    timings = []
+    items = 0
+    warm = name in CACHED_SCENARIOS
+    query_cache.clear()
+    if warm:
+        func(ctx)
+    for _ in range(repeat):
+        if not warm:
+            query_cache.clear()
+        t0 = time.perf_counter()
+        items = func(ctx)
+        timings.append(time.perf_counter() - t0)
+    result = {
+        'runs': [round(t, 6) for t in timings],
+        'min_s': round(min(timings), 6),
+        'median_s': round(statistics.median(timings), 6),
+        'mean_s': round(statistics.mean(timings), 6),
+        'max_s': round(max(timings), 6),
+        'items': items
+    }
+    if memory:
+        if not warm:
+            query_cache.clear()
+        result['peak_kb'] = measure_memory(func, ctx)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Cetak perbandingan median dengan baseline; kembalikan daftar skenario yang melambat"""
+    regressions = []
+    print(f"\n{'Skenario':<24}{'Baseline':>12}{'Sekarang':>12}{'Rasio':>9}", file=sys.stderr)
+    for name, result in results['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if not old:
+            print(f"{name:<24}{'-':>12}{result['median_s']:>11.4f}s{'baru':>9}", file=sys.stderr)
+            continue
+        ratio = result['median_s'] / old['median_s'] if old['median_s'] else float('inf')
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  ⚠️"
+        print(f"{name:<24}{old['median_s']:>11.4f}s{result['median_s']:>11.4f}s{ratio:>8.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline absensi (data sintetis)")
+    parser.add_argument('--employees', type=int, default=50, help="Jumlah karyawan (default: 50)")
+    parser.add_argument('--days', type=int, default=30, help="Jumlah hari (default: 30)")
+    parser.add_argument('--start', type=synthetic_data.parse_date, default=synthetic_data.parse_date('2025-11-01'),
+                        help="Tanggal mulai YYYY-MM-DD (default: 2025-11-01)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed random (default: 0)")
+    parser.add_argument('--repeat', type=int, default=3, help="Jumlah pengulangan per skenario (default: 3)")
+    parser.add_argument('--sample', type=int, default=10,
+                        help="Jumlah karyawan untuk laporan/export karyawan satuan (default: 10)")
+    parser.add_argument('--log-format', choices=['xls', 'xlsx'], default='xls', help="Format log yang di-parse")
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS,
+                        help="Jalankan skenario tertentu saja (boleh berulang)")
+    parser.add_argument('--memory', action='store_true',
+                        help="Ukur juga puncak memori (tracemalloc) per skenario")
+    parser.add_argument('--workdir', help="Folder kerja (default: folder sementara yang dihapus setelah selesai)")
+    parser.add_argument('-o', '--output', help="Tulis hasil JSON ke file ini (default: stdout)")
+    parser.add_argument('--compare', help="File JSON hasil benchmark sebelumnya sebagai baseline")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="Batas perlambatan median sebelum dianggap regresi (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or SCENARIOS
+    if 'save' in scenarios and 'parse' not in scenarios:
+        scenarios = ['parse'] + scenarios  # save memakai hasil parse
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='absensi_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        # stdout dipakai untuk JSON; pesan print dari modul aplikasi dialihkan ke stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            ctx = BenchmarkContext(workdir, synthetic_data.generate_employees(args.employees, args.seed),
+                                   args.start, args.days, args.seed, args.sample)
+            print(f"⏳ Menyiapkan data: {args.employees} karyawan × {args.days} hari...")
+            prepare(ctx, args.log_format)
+
+            results = {}
+            for name in scenarios:
+                print(f"⏱️  {name}...")
+                results[name] = time_scenario(ctx, name, args.repeat, args.memory)
+                print(f"   median {results[name]['median_s']:.4f}s ({results[name]['items']} item)"
+                      + (f", puncak {results[name]['peak_kb']:.0f} KB" if args.memory else ""))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'params': {
+            'employees': args.employees,
+            'days': args.days,
+            'start': args.start.isoformat(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'sample': args.sample,
+            'log_format': args.log_format
+        },
+        'data': ctx.counts,
+        'results': results
+    }
+
+    text = json.dumps(output, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"✅ Hasil benchmark disimpan ke: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != output['params']:
+            print("⚠️  Parameter benchmark berbeda dengan baseline, perbandingan mungkin tidak setara", file=sys.stderr)
+        regressions = compare(output, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ Lebih lambat dari baseline: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
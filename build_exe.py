@@ -25,6 +25,12 @@ def create_executable():
         "--hidden-import=xlrd",         # Include xlrd
         "--hidden-import=pandas",       # Include pandas
         "--hidden-import=PySide6",      # Include PySide6
+        "--hidden-import=main",         # ExcelProcessor (diimport saat import Excel)
+        "--hidden-import=laporan_karyawan",     # Dialog laporan dimuat saat dibuka
+        "--hidden-import=laporan_kehadiran",
+        "--hidden-import=laporan_pelanggaran",
+        "--hidden-import=laporan_lainnya",
+        "--hidden-import=diagnostics",          # Dialog diagnostik (Ctrl+Shift+D di tab Manajemen)
         "app.py"                        # Main script
     ]
     
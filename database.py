@@ -2,52 +2,306 @@ import sqlite3
 import os
 from datetime import datetime
 import json
-import time
+import sys
+import threading
+from urllib.request import pathname2url
 
+import archive
+import db_retry
+import name_index
+import sql_trace
+from profiling import profile_methods
+from db_retry import write_transaction
+from query_cache import cached
+from records import SHIFT_COLUMNS, AttendanceRecord, LeaveRecord, ShiftRecord, ViolationRecord
+from report_calc import format_clock_minutes, parse_clock_minutes
+
+# Kolom jam (TEXT) dan kolom bayangan integernya: menit (HH:MM) atau detik (HH:MM:SS) sejak tengah malam
+ATTENDANCE_CLOCK_COLUMNS = {
+    'jam_masuk': 'jam_masuk_menit',
+    'jam_keluar': 'jam_keluar_menit',
+    'jam_masuk_lembur': 'jam_masuk_lembur_menit',
+    'jam_keluar_lembur': 'jam_keluar_lembur_menit',
+}
+VIOLATION_CLOCK_COLUMNS = {
+    'start_time': 'start_seconds',
+    'end_time': 'end_seconds',
+}
+# Kolom yang perubahannya dicatat di change_log (kolom jam integer hanya turunan)
+CHANGE_LOG_COLUMNS = {
+    'attendance': ('employee_id', 'date', 'jam_masuk', 'jam_keluar', 'jam_masuk_lembur', 'jam_keluar_lembur',
+                   'shift_id', 'keterangan'),
+    'leaves': ('employee_id', 'date', 'description'),
+}
+# Tabel yang punya kolom updated_at dan ikut menaikkan data_version
+TRACKED_TABLES = ('attendance', 'violations', 'leaves', 'employees', 'shifts')
+# Kolom yang diisi trigger; perubahannya bukan perubahan data
+DERIVED_COLUMNS = {'updated_at', *ATTENDANCE_CLOCK_COLUMNS.values(), *VIOLATION_CLOCK_COLUMNS.values()}
+# Timestamp dengan milidetik; CURRENT_TIMESTAMP hanya sampai detik
+NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+# Jumlah baris riwayat pemeliharaan yang disimpan
+MAINTENANCE_LOG_LIMIT = 200
+# Versi skema di PRAGMA user_version; init_database hanya menjalankan DDL/migrasi jika versi database lebih
+# lama. Naikkan setiap kali init_database (tabel, kolom, indeks, trigger, data awal) berubah.
+SCHEMA_VERSION = 3
+# Mode read-only (PC yang hanya membuka laporan): --read-only atau ABSENSI_READ_ONLY=1
+READ_ONLY_FLAG = '--read-only'
+ENV_READ_ONLY = 'ABSENSI_READ_ONLY'
+ENV_MMAP_MB = 'ABSENSI_MMAP_MB'
+READ_ONLY_MMAP_BYTES = int(float(os.environ.get(ENV_MMAP_MB, '') or 256) * 1024 * 1024)
+READ_ONLY_CACHE_KIB = 64 * 1024  # cache_size negatif = KiB; mode normal 10000 halaman
+# Scan ke-1..4 mengisi kolom jam absensi, scan ke-5 dst adalah jam anomali
+ATTENDANCE_SCAN_FIELDS = ('Jam Masuk', 'Jam Keluar', 'Jam Masuk Lembur', 'Jam Keluar Lembur')
+# Kolom attendance yang boleh diubah lewat update_attendance_field (nama kolom masuk ke teks SQL)
+ATTENDANCE_EDITABLE_FIELDS = frozenset({'jam_masuk', 'jam_keluar', 'jam_masuk_lembur', 'jam_keluar_lembur',
+                                        'shift_id', 'keterangan'})
+
+
+def clock_minutes_sql(column):
+    """Ekspresi SQL 'H:MM'/'HH:MM' -> menit sejak tengah malam (NULL jika format tidak valid)"""
+    return f"""(CASE
+        WHEN {column} GLOB '[0-9]:[0-5][0-9]'
+            THEN CAST(substr({column}, 1, 1) AS INTEGER) * 60 + CAST(substr({column}, 3, 2) AS INTEGER)
+        WHEN {column} GLOB '[01][0-9]:[0-5][0-9]' OR {column} GLOB '2[0-3]:[0-5][0-9]'
+            THEN CAST(substr({column}, 1, 2) AS INTEGER) * 60 + CAST(substr({column}, 4, 2) AS INTEGER)
+    END)"""
+
+
+def clock_seconds_sql(column):
+    """Ekspresi SQL 'HH:MM:SS' -> detik sejak tengah malam (NULL jika format tidak valid)"""
+    return f"""(CASE
+        WHEN {column} GLOB '[0-9]:[0-5][0-9]:[0-5][0-9]'
+            THEN CAST(substr({column}, 1, 1) AS INTEGER) * 3600 + CAST(substr({column}, 3, 2) AS INTEGER) * 60
+                 + CAST(substr({column}, 6, 2) AS INTEGER)
+        WHEN {column} GLOB '[01][0-9]:[0-5][0-9]:[0-5][0-9]' OR {column} GLOB '2[0-3]:[0-5][0-9]:[0-5][0-9]'
+            THEN CAST(substr({column}, 1, 2) AS INTEGER) * 3600 + CAST(substr({column}, 4, 2) AS INTEGER) * 60
+                 + CAST(substr({column}, 7, 2) AS INTEGER)
+    END)"""
+
+
+def attendance_scan_rows(employee_id, date, times, anomalies):
+    """Baris attendance_scans dari jam utama + jam anomali; teks asli hanya disimpan jika tidak sama dengan format menit"""
+    rows = []
+    for seq, text in enumerate(list(times) + list(anomalies or []), start=1):
+        if not text:
+            continue
+        minute = parse_clock_minutes(text)
+        raw = None if minute is not None and format_clock_minutes(minute) == text else text
+        rows.append((employee_id, date, seq, minute, raw))
+    return rows
+
+
+def scan_text(minute, raw):
+    """Teks jam dari baris attendance_scans"""
+    return raw if raw is not None else format_clock_minutes(minute)
+
+
+class EmployeeResolver:
+    """Identitas karyawan untuk import: tabel employees dibaca sekali, lalu setiap record dicocokkan di memori.
+
+    Urutan: Work No mesin, nama persis, nama yang sama setelah dinormalisasi (name_index.normalize)
+    jika hanya satu karyawan yang punya nama normalisasi itu.
+    Karyawan yang ganti nama di mesin tetap tercatat di riwayat yang sama selama Work No-nya sama.
+    Dalam satu batch (assign) satu karyawan tidak dipakai dua nama berbeda.
+    """
+
+    def __init__(self, employees):
+        """employees: dict id, name, shift_id, work_no (get_employee_identities / tabel employees)"""
+        self.by_work_no = {}
+        self.by_name = {}
+        self.by_normalized = {}  # compact(nama) -> [karyawan], seperti NameIndex.by_normalized
+        for employee in employees:
+            self._remember(dict(employee))
+
+    @classmethod
+    def load(cls, cursor):
+        cursor.execute('SELECT id, name, shift_id, work_no FROM employees')
+        return cls({'id': row[0], 'name': row[1], 'shift_id': row[2], 'work_no': row[3]} for row in cursor.fetchall())
+
+    def _remember(self, employee):
+        if employee['work_no']:
+            self.by_work_no.setdefault(employee['work_no'], employee)
+        self.by_name.setdefault(employee['name'], employee)
+        self.by_normalized.setdefault(name_index.compact(employee['name']), []).append(employee)
+
+    def lookup(self, record):
+        """Karyawan untuk record (dict: id, name, shift_id, work_no) lewat Work No atau nama persis, atau None.
+
+        Untuk record yang sudah melewati match_names (nama sudah disamakan dengan database).
+        """
+        work_no = record.get('Work No')
+        if work_no and work_no in self.by_work_no:
+            return self.by_work_no[work_no]
+        return self.by_name.get(record['Nama'])
+
+    def assign(self, records):
+        """Karyawan per record satu batch import (None = belum ada).
+
+        Work No dan nama persis lebih dulu; nama yang sama setelah dinormalisasi hanya dipakai
+        jika tepat satu karyawan punya nama itu (sama dengan NameIndex.match) dan karyawannya
+        belum dipakai nama lain di batch ini (tidak ada dua orang di file yang
+        jatuh ke satu karyawan lalu saling menimpa di INSERT OR REPLACE).
+        """
+        assigned = [self.lookup(record) for record in records]
+        claimed = {}
+        for record, employee in zip(records, assigned):
+            if employee is not None:
+                claimed.setdefault(employee['id'], record['Nama'])
+        for position, record in enumerate(records):
+            if assigned[position] is None:
+                candidates = self.by_normalized.get(name_index.compact(record['Nama']), [])
+                employee = candidates[0] if len(candidates) == 1 else None
+                if employee is not None and claimed.setdefault(employee['id'], record['Nama']) == record['Nama']:
+                    assigned[position] = employee
+        return assigned
+
+    def resolve(self, cursor, record, employee=None):
+        """Karyawan hasil assign untuk record; jika None karyawan baru ditambahkan (sekali per nama/Work No),
+        dan Work No disimpan ke karyawan yang belum punya"""
+        work_no = record.get('Work No') or None
+        if employee is None:
+            employee = self.lookup(record)  # Karyawan baru yang sudah dibuat record sebelumnya di batch ini
+        if employee is None:
+            cursor.execute('INSERT INTO employees (name, work_no) VALUES (?, ?)', (record['Nama'], work_no))
+            employee = {'id': cursor.lastrowid, 'name': record['Nama'], 'shift_id': 1, 'work_no': work_no}
+            self._remember(employee)
+        elif work_no and not employee['work_no'] and work_no not in self.by_work_no:
+            cursor.execute('UPDATE employees SET work_no = ? WHERE id = ?', (work_no, employee['id']))
+            employee['work_no'] = work_no
+            self.by_work_no[work_no] = employee
+        return employee
+
+    def match_names(self, records, index):
+        """Samakan record['Nama'] dengan nama karyawan di database sebelum ditampilkan/disimpan.
+
+        Record yang dikenal (assign: Work No / nama) memakai nama di database; sisanya lewat
+        name_index.resolve_import_names. Hasilnya (matched, suggested) seperti fungsi itu:
+        nama yang hanya mirip tidak diganti sebelum dikonfirmasi (name_index.apply_suggestions).
+        """
+        matched, pending, taken = [], [], set()
+        for record, employee in zip(records, self.assign(records)):
+            if employee is None:
+                pending.append(record)
+                continue
+            taken.add(employee['id'])
+            if employee['name'] != record['Nama']:
+                matched.append((record['Nama'], employee['name'], 1.0))
+                record['Nama'] = employee['name']
+        exact_matched, suggested = name_index.resolve_import_names(pending, index, taken)
+        return matched + exact_matched, suggested
+
+
+class ReadOnlyDatabaseError(sqlite3.OperationalError):
+    """Tulis ke database yang dibuka dengan read_only=True"""
+
+
+def read_only_from_argv(argv=None):
+    """True jika ada flag --read-only (dihapus dari argv) atau env ABSENSI_READ_ONLY=1"""
+    argv = sys.argv if argv is None else argv
+    requested = os.environ.get(ENV_READ_ONLY, '').strip() not in ('', '0')
+    if READ_ONLY_FLAG in argv:
+        argv.remove(READ_ONLY_FLAG)  # Jangan diteruskan ke QApplication
+        requested = True
+    return requested
+
+@profile_methods("db")
 class DatabaseManager:
-    def __init__(self, db_path="absensi.db"):
+    def __init__(self, db_path="absensi.db", read_only=False):
+        """read_only: buka dengan mode=ro + query_only + mmap, tanpa DDL/migrasi init_database (PC laporan)"""
         self.db_path = db_path
-        self.init_database()
+        self.read_only = read_only
+        self._version_local = threading.local()
+        if read_only:
+            self.check_read_only_schema()
+        else:
+            self.init_database()
+    
+    def _connect(self, **kwargs):
+        """sqlite3.connect ke database ini; mode read-only lewat URI mode=ro (tidak bisa membuat file/lock tulis)"""
+        if self.read_only:
+            return sqlite3.connect('file:' + pathname2url(os.path.abspath(self.db_path)) + '?mode=ro',
+                                   uri=True, **kwargs)
+        return sqlite3.connect(self.db_path, uri=True, **kwargs)
     
     def get_connection(self):
-        """Membuat koneksi ke database"""
-        max_retries = 3
-        retry_delay = 0.1
-        
-        for attempt in range(max_retries):
-            try:
-                conn = sqlite3.connect(self.db_path, timeout=30.0)
+        """Membuat koneksi ke database (di dalam write_transaction langsung BEGIN IMMEDIATE, di method baca
+        yang periodenya menyentuh tahun yang diarsipkan file arsipnya ikut di-ATTACH)"""
+        if self.read_only and db_retry.in_write_transaction():
+            raise ReadOnlyDatabaseError("Database dibuka read-only (mode laporan); data tidak bisa diubah di PC ini")
+        busy_timeout_ms = db_retry.busy_timeout_ms()
+        conn = self._connect(timeout=busy_timeout_ms / 1000, factory=sql_trace.connection_factory())
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {busy_timeout_ms}")  # Tunggu lock dilepas sebelum SQLITE_BUSY
+            if self.read_only:
+                conn.execute("PRAGMA query_only = ON")
+                conn.execute(f"PRAGMA mmap_size = {READ_ONLY_MMAP_BYTES}")  # Baca langsung dari page cache OS
+                conn.execute(f"PRAGMA cache_size = -{READ_ONLY_CACHE_KIB}")
+            else:
                 conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode for better concurrency
                 conn.execute("PRAGMA synchronous=NORMAL")  # Better performance
                 conn.execute("PRAGMA cache_size=10000")  # Increase cache
-                conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp tables
-                return conn
-            except sqlite3.OperationalError as e:
-                if "database is locked" in str(e).lower() and attempt < max_retries - 1:
-                    print(f"Database locked, retrying in {retry_delay}s... (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    raise e
+            conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp tables
+            if db_retry.in_write_transaction():
+                db_retry.begin_immediate(conn)
+            elif archive.in_scope():
+                archive.attach_archives(conn, self)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+    
+    def check_read_only_schema(self):
+        """Pengganti init_database di mode read-only: pastikan skema sudah dibuat/dimigrasi oleh mode normal"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] < SCHEMA_VERSION:
+                raise ReadOnlyDatabaseError(
+                    f"Database {self.db_path} belum diperbarui ke versi aplikasi ini; "
+                    f"buka sekali tanpa mode read-only")
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
     
     def init_database(self):
-        """Inisialisasi database dan tabel"""
+        """Inisialisasi database dan tabel (tidak melakukan apa pun jika user_version sudah SCHEMA_VERSION)"""
         conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] >= SCHEMA_VERSION:
+                return
+            
             # Tabel karyawan dengan shift assignment
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS employees (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL UNIQUE,
                 shift_id INTEGER DEFAULT 1,
+                work_no TEXT,              -- Nomor karyawan di mesin absensi (Work No)
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (shift_id) REFERENCES shifts (id)
             )
         ''')
-        
+
+            # Tambah kolom work_no jika belum ada (untuk database existing)
+            try:
+                cursor.execute('ALTER TABLE employees ADD COLUMN work_no TEXT')
+                print("✅ Kolom work_no berhasil ditambahkan ke tabel employees")
+            except sqlite3.OperationalError:
+                # Kolom sudah ada
+                pass
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_employees_work_no ON employees (work_no) WHERE work_no IS NOT NULL
+            ''')
+
             # Tabel absensi harian dengan shift per hari
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS attendance (
@@ -83,6 +337,31 @@ class DatabaseManager:
                 # Kolom sudah ada
                 pass
         
+            self._migrate_clock_columns(cursor, 'attendance', ATTENDANCE_CLOCK_COLUMNS, clock_minutes_sql)
+        
+            # Riwayat scan mesin per karyawan per hari (menggantikan JSON di attendance.jam_anomali)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attendance_scans'")
+            scans_exist = cursor.fetchone() is not None
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS attendance_scans (
+                employee_id INTEGER NOT NULL,
+                date DATE NOT NULL,
+                seq INTEGER NOT NULL,  -- Urutan scan: 1-4 jam masuk/keluar/lembur, 5 dst anomali
+                minute INTEGER,        -- Menit sejak tengah malam
+                raw TEXT,              -- Teks asli jika tidak sama dengan format HH:MM
+                PRIMARY KEY (employee_id, date, seq)
+            ) WITHOUT ROWID
+        ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_attendance_scans_date ON attendance_scans (date)')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS attendance_scans_delete AFTER DELETE ON attendance
+            BEGIN
+                DELETE FROM attendance_scans WHERE employee_id = OLD.employee_id AND date = OLD.date;
+            END
+        ''')
+            if not scans_exist:
+                self._migrate_attendance_scans(cursor)
+        
             # Tabel shifts dengan pengaturan per hari
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS shifts (
@@ -124,6 +403,9 @@ class DatabaseManager:
             )
         ''')
         
+            self._migrate_clock_columns(cursor, 'violations', VIOLATION_CLOCK_COLUMNS, clock_seconds_sql)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_violations_attendance ON violations (attendance_id)')
+            
             # Tabel izin/cuti
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS leaves (
@@ -136,6 +418,19 @@ class DatabaseManager:
             )
         ''')
         
+            # Log perubahan absensi/izin per (karyawan, tanggal) untuk refresh laporan inkremental
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                employee_id INTEGER,
+                date DATE,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+            for table, columns in CHANGE_LOG_COLUMNS.items():
+                self._create_change_log_triggers(cursor, table, columns)
+            
             # Tabel pengaturan shift
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS shift_settings (
@@ -194,6 +489,50 @@ class DatabaseManager:
                                           toleransi_terlambat, overtime_mode)
                 VALUES ('Default', '08:00', '17:00', '18:00', '22:00', '17:30', 15, 'per_jam')
             ''')
+            
+            # Penghitung global: naik setiap ada insert/update/delete di tabel data
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+            cursor.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)')
+            for table in TRACKED_TABLES:
+                self._create_change_tracking(cursor, table)
+            
+            # Riwayat pemeliharaan (maintenance.py): ukuran file dan query plan sebelum/sesudah
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS maintenance_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TIMESTAMP NOT NULL,
+                reason TEXT NOT NULL,
+                tasks TEXT NOT NULL,       -- Dipisah koma, urutan maintenance.TASKS
+                total_ms REAL,
+                db_size_before INTEGER,
+                db_size_after INTEGER,
+                wal_size_before INTEGER,
+                wal_size_after INTEGER,
+                details TEXT               -- JSON: hasil per tugas dan query plan
+            )
+        ''')
+            
+            # Tahun yang datanya sudah dipindah ke file arsip absensi_<tahun>.db (archive.py)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archives (
+                year INTEGER PRIMARY KEY,
+                file TEXT NOT NULL,        -- Nama file, di folder yang sama dengan database
+                attendance INTEGER NOT NULL DEFAULT 0,
+                violations INTEGER NOT NULL DEFAULT 0,
+                leaves INTEGER NOT NULL DEFAULT 0,
+                scans INTEGER NOT NULL DEFAULT 0,
+                min_attendance_id INTEGER,
+                max_attendance_id INTEGER,
+                archived_at TIMESTAMP NOT NULL
+            )
+        ''')
+            
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         
             conn.commit()
         except Exception as e:
@@ -204,6 +543,135 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    def _migrate_clock_columns(self, cursor, table, columns, to_int_sql):
+        """Kolom integer bayangan untuk kolom jam TEXT, diisi ulang oleh trigger setiap kali jam berubah"""
+        added = False
+        for shadow in columns.values():
+            try:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {shadow} INTEGER')
+                added = True
+            except sqlite3.OperationalError:
+                # Kolom sudah ada
+                pass
+        
+        assignments = ", ".join(f"{shadow} = {to_int_sql('NEW.' + text)}" for text, shadow in columns.items())
+        # Penulis yang sudah mengisi kolom integer sendiri (save_attendance_data) tidak perlu diproses ulang
+        missing = " OR ".join(f"(NEW.{text} IS NOT NULL AND NEW.{shadow} IS NULL)" for text, shadow in columns.items())
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_clock_insert AFTER INSERT ON {table}
+            WHEN {missing}
+            BEGIN
+                UPDATE {table} SET {assignments} WHERE id = NEW.id;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_clock_update AFTER UPDATE OF {", ".join(columns)} ON {table}
+            BEGIN
+                UPDATE {table} SET {assignments} WHERE id = NEW.id;
+            END
+        ''')
+        
+        if added:
+            # Isi kolom baru untuk data yang sudah ada
+            cursor.execute(f'''
+                UPDATE {table} SET {", ".join(f"{shadow} = {to_int_sql(text)}" for text, shadow in columns.items())}
+            ''')
+            print(f"✅ Kolom jam integer berhasil ditambahkan ke tabel {table}")
+    
+    def _create_change_tracking(self, cursor, table):
+        """Kolom updated_at yang diisi trigger, dan trigger yang menaikkan data_version"""
+        try:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN updated_at TIMESTAMP')
+            # Data lama dianggap terakhir berubah saat dibuat
+            cursor.execute(f'UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)')
+            print(f"✅ Kolom updated_at berhasil ditambahkan ke tabel {table}")
+        except sqlite3.OperationalError:
+            # Kolom sudah ada
+            pass
+        
+        # Trigger update hanya untuk kolom data: UPDATE dari trigger lain (updated_at, kolom jam
+        # integer) tidak boleh memicu tulis ulang dan kenaikan versi berantai
+        cursor.execute(f'PRAGMA table_info({table})')
+        columns = ", ".join(row[1] for row in cursor.fetchall() if row[1] not in DERIVED_COLUMNS)
+        bump_version = 'UPDATE data_version SET version = version + 1 WHERE id = 1;'
+        
+        # Penulis yang mengisi updated_at sendiri tidak diproses ulang
+        self._ensure_trigger(cursor, f'{table}_updated_insert', f'''CREATE TRIGGER {table}_updated_insert AFTER INSERT ON {table}
+            WHEN NEW.updated_at IS NULL
+            BEGIN
+                UPDATE {table} SET updated_at = {NOW_SQL} WHERE id = NEW.id;
+            END''')
+        self._ensure_trigger(cursor, f'{table}_updated_update', f'''CREATE TRIGGER {table}_updated_update AFTER UPDATE OF {columns} ON {table}
+            WHEN NEW.updated_at IS OLD.updated_at
+            BEGIN
+                UPDATE {table} SET updated_at = {NOW_SQL} WHERE id = NEW.id;
+            END''')
+        self._ensure_trigger(cursor, f'{table}_version_insert', f'''CREATE TRIGGER {table}_version_insert AFTER INSERT ON {table}
+            BEGIN
+                {bump_version}
+            END''')
+        self._ensure_trigger(cursor, f'{table}_version_update', f'''CREATE TRIGGER {table}_version_update AFTER UPDATE OF {columns} ON {table}
+            BEGIN
+                {bump_version}
+            END''')
+        self._ensure_trigger(cursor, f'{table}_version_delete', f'''CREATE TRIGGER {table}_version_delete AFTER DELETE ON {table}
+            BEGIN
+                {bump_version}
+            END''')
+    
+    def _ensure_trigger(self, cursor, name, sql):
+        """Buat trigger, atau buat ulang jika definisinya berbeda (misalnya daftar kolom bertambah)"""
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,))
+        row = cursor.fetchone()
+        if row and row[0] == sql:
+            return
+        if row:
+            cursor.execute(f'DROP TRIGGER {name}')
+        cursor.execute(sql)
+    
+    def _create_change_log_triggers(self, cursor, table, columns):
+        """Trigger yang mencatat (employee_id, date) ke change_log setiap insert/update/delete"""
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_log_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO change_log (source, employee_id, date) VALUES ('{table}', NEW.employee_id, NEW.date);
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_log_update AFTER UPDATE OF {", ".join(columns)} ON {table}
+            BEGIN
+                INSERT INTO change_log (source, employee_id, date) VALUES ('{table}', NEW.employee_id, NEW.date);
+                INSERT INTO change_log (source, employee_id, date)
+                SELECT '{table}', OLD.employee_id, OLD.date
+                WHERE OLD.employee_id IS NOT NEW.employee_id OR OLD.date IS NOT NEW.date;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_log_delete AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO change_log (source, employee_id, date) VALUES ('{table}', OLD.employee_id, OLD.date);
+            END
+        ''')
+    
+    def _migrate_attendance_scans(self, cursor):
+        """Pindahkan jam anomali (JSON) dan jam utama absensi yang sudah ada ke tabel attendance_scans"""
+        cursor.execute('''
+            SELECT employee_id, date, jam_masuk, jam_keluar, jam_masuk_lembur, jam_keluar_lembur, jam_anomali
+            FROM attendance
+            WHERE employee_id IS NOT NULL
+        ''')
+        rows = []
+        for employee_id, date, *times, jam_anomali in cursor.fetchall():
+            rows.extend(attendance_scan_rows(employee_id, date, times, json.loads(jam_anomali) if jam_anomali else []))
+        
+        cursor.executemany('''
+            INSERT OR IGNORE INTO attendance_scans (employee_id, date, seq, minute, raw) VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        cursor.execute('UPDATE attendance SET jam_anomali = NULL WHERE jam_anomali IS NOT NULL')
+        if rows:
+            print(f"✅ {len(rows)} scan absensi dipindahkan ke tabel attendance_scans")
+    
+    @write_transaction
     def add_or_get_employee(self, name):
         """Menambah karyawan baru atau mengambil ID karyawan yang sudah ada"""
         conn = None
@@ -232,6 +700,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def save_attendance_data(self, date, attendance_list, mode='replace'):
         """Menyimpan data absensi untuk tanggal tertentu
         
@@ -244,61 +713,65 @@ class DatabaseManager:
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
+            archive.check_writable(cursor, date)
             
             # If replace mode, delete existing data for this date first
             if mode == 'replace':
                 cursor.execute('DELETE FROM attendance WHERE date = ?', (date,))
             
-            for data in attendance_list:
-                # Get or create employee within the same connection
-                cursor.execute('SELECT id FROM employees WHERE name = ?', (data['Nama'],))
-                result = cursor.fetchone()
-                
-                if result:
-                    employee_id = result[0]
-                else:
-                    # Add new employee
-                    cursor.execute('INSERT INTO employees (name) VALUES (?)', (data['Nama'],))
-                    employee_id = cursor.lastrowid
-                
-                # Convert jam_anomali list to JSON string
-                jam_anomali_json = json.dumps(data['Jam Anomali']) if data['Jam Anomali'] else None
-                
+            # Semua karyawan dibaca sekali; record dicocokkan lewat Work No / nama tanpa query per baris
+            resolver = EmployeeResolver.load(cursor)
+
+            for data, employee in zip(attendance_list, resolver.assign(attendance_list)):
+                employee = resolver.resolve(cursor, data, employee)
+                employee_id = employee['id']
+
                 # Get shift_id from data, default to employee's default shift if not provided
-                shift_id = data.get('shift_id')
-                if not shift_id:
-                    # Get employee's default shift
-                    cursor.execute('SELECT shift_id FROM employees WHERE id = ?', (employee_id,))
-                    emp_result = cursor.fetchone()
-                    shift_id = emp_result[0] if emp_result else 1
+                shift_id = data.get('shift_id') or employee['shift_id'] or 1
                 
                 # Get keterangan from data
                 keterangan = data.get('keterangan', '') or ''
                 
+                # Kolom jam integer diisi langsung (trigger hanya untuk penulis lain)
+                clock_minutes = [parse_clock_minutes(data[key]) for key in ATTENDANCE_SCAN_FIELDS]
+                
                 if mode == 'insert_only':
                     # Only insert if not exists
-                    cursor.execute('''
+                    cursor.execute(f'''
                         INSERT OR IGNORE INTO attendance 
-                        (employee_id, date, jam_masuk, jam_keluar, jam_masuk_lembur, jam_keluar_lembur, jam_anomali, shift_id, keterangan)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        (employee_id, date, jam_masuk, jam_keluar, jam_masuk_lembur, jam_keluar_lembur, shift_id, keterangan,
+                         jam_masuk_menit, jam_keluar_menit, jam_masuk_lembur_menit, jam_keluar_lembur_menit, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {NOW_SQL})
                     ''', (
                         employee_id, date, 
                         data['Jam Masuk'], data['Jam Keluar'],
                         data['Jam Masuk Lembur'], data['Jam Keluar Lembur'],
-                        jam_anomali_json, shift_id, keterangan
+                        shift_id, keterangan, *clock_minutes
                     ))
+                    # Data yang sudah ada tidak diubah, begitu juga riwayat scannya
+                    write_scans = cursor.rowcount == 1
                 else:
                     # Insert or replace (for both 'replace' and 'merge' modes)
-                    cursor.execute('''
+                    cursor.execute(f'''
                         INSERT OR REPLACE INTO attendance 
-                        (employee_id, date, jam_masuk, jam_keluar, jam_masuk_lembur, jam_keluar_lembur, jam_anomali, shift_id, keterangan)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        (employee_id, date, jam_masuk, jam_keluar, jam_masuk_lembur, jam_keluar_lembur, shift_id, keterangan,
+                         jam_masuk_menit, jam_keluar_menit, jam_masuk_lembur_menit, jam_keluar_lembur_menit, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {NOW_SQL})
                     ''', (
                         employee_id, date, 
                         data['Jam Masuk'], data['Jam Keluar'],
                         data['Jam Masuk Lembur'], data['Jam Keluar Lembur'],
-                        jam_anomali_json, shift_id, keterangan
+                        shift_id, keterangan, *clock_minutes
                     ))
+                    # REPLACE tidak menjalankan trigger delete, jadi scan lama dihapus di sini
+                    cursor.execute('DELETE FROM attendance_scans WHERE employee_id = ? AND date = ?', (employee_id, date))
+                    write_scans = True
+                
+                if write_scans:
+                    cursor.executemany('''
+                        INSERT INTO attendance_scans (employee_id, date, seq, minute, raw) VALUES (?, ?, ?, ?, ?)
+                    ''', attendance_scan_rows(employee_id, date, (data[key] for key in ATTENDANCE_SCAN_FIELDS),
+                                              data.get('Jam Anomali')))
             
             conn.commit()
         except Exception as e:
@@ -309,6 +782,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @archive.routes('date')
     def get_attendance_summary_by_date(self, date):
         """Mengambil ringkasan data absensi untuk tanggal tertentu"""
         conn = None
@@ -341,8 +815,9 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
-    def get_attendance_by_date(self, date):
-        """Mengambil data absensi berdasarkan tanggal"""
+    @archive.routes('date')
+    def get_attendance_by_date(self, date, include_anomalies=False):
+        """Mengambil data absensi berdasarkan tanggal (jam anomali hanya dibaca jika include_anomalies)"""
         conn = None
         try:
             conn = self.get_connection()
@@ -350,7 +825,7 @@ class DatabaseManager:
             
             cursor.execute('''
                 SELECT a.id, e.name, a.jam_masuk, a.jam_keluar, 
-                       a.jam_masuk_lembur, a.jam_keluar_lembur, a.jam_anomali,
+                       a.jam_masuk_lembur, a.jam_keluar_lembur,
                        a.shift_id, s.name as shift_name, a.keterangan, a.employee_id
                 FROM attendance a
                 JOIN employees e ON a.employee_id = e.id
@@ -363,7 +838,6 @@ class DatabaseManager:
             
             attendance_data = []
             for row in results:
-                jam_anomali = json.loads(row[6]) if row[6] else []
                 attendance_data.append({
                     'id': row[0],
                     'Nama': row[1],
@@ -371,13 +845,26 @@ class DatabaseManager:
                     'Jam Keluar': row[3],
                     'Jam Masuk Lembur': row[4],
                     'Jam Keluar Lembur': row[5],
-                    'Jam Anomali': jam_anomali,
-                    'shift_id': row[7],
-                    'shift_name': row[8] or 'Default Shift',
-                    'keterangan': row[9] or '',
-                    'employee_id': row[10]
+                    'shift_id': row[6],
+                    'shift_name': row[7] or 'Default Shift',
+                    'keterangan': row[8] or '',
+                    'employee_id': row[9]
                 })
             
+            if include_anomalies:
+                # Satu query untuk semua karyawan pada tanggal ini
+                cursor.execute('''
+                    SELECT employee_id, minute, raw
+                    FROM attendance_scans
+                    WHERE date = ? AND seq > ?
+                    ORDER BY employee_id, seq
+                ''', (date, len(ATTENDANCE_SCAN_FIELDS)))
+                anomalies = {}
+                for employee_id, minute, raw in cursor.fetchall():
+                    anomalies.setdefault(employee_id, []).append(scan_text(minute, raw))
+                for item in attendance_data:
+                    item['Jam Anomali'] = anomalies.get(item['employee_id'], [])
+            
             return attendance_data
         except Exception as e:
             raise e
@@ -385,14 +872,19 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def update_attendance_field(self, attendance_id, field, value):
-        """Update field tertentu pada data absensi"""
+        """Update field tertentu pada data absensi (field harus salah satu ATTENDANCE_EDITABLE_FIELDS)"""
+        if field not in ATTENDANCE_EDITABLE_FIELDS:
+            raise ValueError(f"Kolom absensi tidak bisa diubah: {field!r}")
         conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute(f'UPDATE attendance SET {field} = ? WHERE id = ?', (value, attendance_id))
+            if cursor.rowcount == 0:
+                archive.check_writable(cursor, attendance_id=attendance_id)
             
             conn.commit()
         except Exception as e:
@@ -403,10 +895,12 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def update_attendance_shift(self, attendance_id, shift_id):
         """Update shift untuk record absensi tertentu"""
         return self.update_attendance_field(attendance_id, 'shift_id', shift_id)
     
+    @write_transaction
     def add_violation(self, attendance_id, start_time, end_time, description):
         """Menambah pelanggaran untuk attendance tertentu"""
         conn = None
@@ -414,6 +908,7 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            archive.check_writable(cursor, attendance_id=attendance_id)
             cursor.execute('''
                 INSERT INTO violations (attendance_id, start_time, end_time, description)
                 VALUES (?, ?, ?, ?)
@@ -428,6 +923,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @archive.routes(attendance_id='attendance_id')
     def get_violations_by_attendance(self, attendance_id):
         """Mengambil pelanggaran berdasarkan attendance_id"""
         conn = None
@@ -452,6 +948,70 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @cached("db.get_violations_by_employee")
+    @archive.routes('start', 'end')
+    def get_violations_by_employee(self, employee_id, start=None, end=None, limit=None, offset=0):
+        """Pelanggaran satu karyawan, terbaru dulu, lengkap dengan tanggal absensi (satu query; tanpa periode = semua tanggal)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            period = 'AND a.date BETWEEN ? AND ?' if start and end else ''
+            params = (employee_id, start, end) if start and end else (employee_id,)
+            cursor.execute(f'''
+                SELECT v.id, v.attendance_id, a.date, v.start_time, v.end_time, v.description, v.created_at
+                FROM attendance a
+                JOIN violations v ON v.attendance_id = a.id
+                WHERE a.employee_id = ? {period}
+                ORDER BY a.date DESC, v.start_time DESC, v.id DESC
+                LIMIT ? OFFSET ?
+            ''', params + (-1 if limit is None else limit, offset))
+            
+            return [{'id': row[0], 'attendance_id': row[1], 'date': row[2], 'start_time': row[3],
+                     'end_time': row[4], 'description': row[5], 'created_at': row[6]} for row in cursor.fetchall()]
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    @cached("db.get_violations_by_date_range")
+    @archive.routes('start_date', 'end_date')
+    def get_violations_by_date_range(self, start_date, end_date, employee_id=None):
+        """Mengambil semua pelanggaran dalam periode (satu query), lengkap dengan nama karyawan dan durasi (menit)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            # Durasi dihitung di SQL dari kolom detik; jam selesai < jam mulai berarti
+            # melewati tengah malam. Format jam tidak valid (NULL) menghasilkan durasi 0.
+            query = '''
+                SELECT v.id, v.attendance_id, a.employee_id, e.name, a.date,
+                       v.start_time, v.end_time, v.description, v.created_at,
+                       COALESCE((v.end_seconds - v.start_seconds
+                                 + CASE WHEN v.end_seconds < v.start_seconds THEN 86400 ELSE 0 END) / 60, 0)
+                FROM violations v
+                JOIN attendance a ON a.id = v.attendance_id
+                JOIN employees e ON e.id = a.employee_id
+                WHERE a.date BETWEEN ? AND ?
+            '''
+            params = [start_date, end_date]
+            if employee_id is not None:
+                query += ' AND a.employee_id = ?'
+                params.append(employee_id)
+            query += ' ORDER BY e.name, a.date, v.created_at, v.id'
+            
+            cursor.execute(query, params)
+            return ViolationRecord.from_rows(cursor.fetchall())
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    @write_transaction
     def update_violation(self, violation_id, start_time, end_time, description):
         """Update pelanggaran berdasarkan ID"""
         conn = None
@@ -464,6 +1024,8 @@ class DatabaseManager:
                 SET start_time = ?, end_time = ?, description = ?
                 WHERE id = ?
             ''', (start_time, end_time, description, violation_id))
+            if cursor.rowcount == 0:
+                archive.check_row_writable(cursor, self.db_path, 'violations', violation_id)
             
             conn.commit()
         except Exception as e:
@@ -474,6 +1036,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def delete_violation(self, violation_id):
         """Hapus pelanggaran berdasarkan ID"""
         conn = None
@@ -482,6 +1045,8 @@ class DatabaseManager:
             cursor = conn.cursor()
             
             cursor.execute('DELETE FROM violations WHERE id = ?', (violation_id,))
+            if cursor.rowcount == 0:
+                archive.check_row_writable(cursor, self.db_path, 'violations', violation_id)
             conn.commit()
         except Exception as e:
             if conn:
@@ -493,6 +1058,7 @@ class DatabaseManager:
     
     # ==================== LEAVES MANAGEMENT ====================
     
+    @write_transaction
     def add_leave(self, employee_id, date, description):
         """Tambah izin baru"""
         conn = None
@@ -500,6 +1066,7 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            archive.check_writable(cursor, date)
             cursor.execute('''
                 INSERT INTO leaves (employee_id, date, description)
                 VALUES (?, ?, ?)
@@ -515,6 +1082,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @archive.routes('date')
     def get_leaves_by_employee_date(self, employee_id, date):
         """Mengambil izin berdasarkan employee_id dan tanggal. Jika date None, ambil semua izin karyawan"""
         conn = None
@@ -550,6 +1118,8 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @cached("db.get_leaves_by_date_range")
+    @archive.routes('start_date', 'end_date')
     def get_leaves_by_date_range(self, start_date, end_date):
         """Mengambil semua izin dalam range tanggal"""
         conn = None
@@ -565,16 +1135,14 @@ class DatabaseManager:
                 ORDER BY l.date, e.name
             ''', (start_date, end_date))
             
-            results = cursor.fetchall()
-            
-            return [{'id': row[0], 'employee_id': row[1], 'date': row[2], 
-                    'description': row[3], 'created_at': row[4], 'employee_name': row[5]} for row in results]
+            return LeaveRecord.from_rows(cursor.fetchall())
         except Exception as e:
             raise e
         finally:
             if conn:
                 conn.close()
     
+    @write_transaction
     def update_leave(self, leave_id, employee_id, date, description):
         """Update izin berdasarkan ID"""
         conn = None
@@ -582,11 +1150,14 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
+            archive.check_writable(cursor, date)
             cursor.execute('''
                 UPDATE leaves 
                 SET employee_id = ?, date = ?, description = ?
                 WHERE id = ?
             ''', (employee_id, date, description, leave_id))
+            if cursor.rowcount == 0:
+                archive.check_row_writable(cursor, self.db_path, 'leaves', leave_id)
             
             conn.commit()
         except Exception as e:
@@ -597,6 +1168,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def delete_leave(self, leave_id):
         """Hapus izin berdasarkan ID"""
         conn = None
@@ -605,6 +1177,8 @@ class DatabaseManager:
             cursor = conn.cursor()
             
             cursor.execute('DELETE FROM leaves WHERE id = ?', (leave_id,))
+            if cursor.rowcount == 0:
+                archive.check_row_writable(cursor, self.db_path, 'leaves', leave_id)
             
             conn.commit()
         except Exception as e:
@@ -644,6 +1218,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def update_shift_settings(self, settings):
         """Update pengaturan shift"""
         conn = None
@@ -673,6 +1248,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @cached("db.get_all_employees")
     def get_all_employees(self):
         """Mengambil semua karyawan"""
         conn = None
@@ -690,6 +1266,57 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @cached("db.get_employee_summaries")
+    @archive.routes('start', 'end')
+    def get_employee_summaries(self, start=None, end=None):
+        """Semua karyawan beserta shift dan jumlah pelanggaran/izin (satu query GROUP BY; tanpa periode = semua tanggal)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            period = 'BETWEEN ? AND ?' if start and end else 'IS NOT NULL'
+            params = (start, end) if start and end else ()
+            cursor.execute(f'''
+                SELECT e.id, e.name, e.work_no, s.name, COALESCE(v.total, 0), COALESCE(l.total, 0)
+                FROM employees e
+                LEFT JOIN shifts s ON e.shift_id = s.id
+                LEFT JOIN (
+                    SELECT a.employee_id, COUNT(*) AS total
+                    FROM violations v JOIN attendance a ON v.attendance_id = a.id
+                    WHERE a.date {period}
+                    GROUP BY a.employee_id
+                ) v ON v.employee_id = e.id
+                LEFT JOIN (
+                    SELECT employee_id, COUNT(*) AS total FROM leaves WHERE date {period} GROUP BY employee_id
+                ) l ON l.employee_id = e.id
+                ORDER BY e.name
+            ''', params + params)
+            return [{'id': row[0], 'name': row[1], 'work_no': row[2], 'shift_name': row[3],
+                     'violations': row[4], 'leaves': row[5]} for row in cursor.fetchall()]
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+
+    @cached("db.get_employee_identities")
+    def get_employee_identities(self):
+        """Semua karyawan beserta shift default dan Work No (untuk EmployeeResolver)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT id, name, shift_id, work_no FROM employees')
+            return [{'id': row[0], 'name': row[1], 'shift_id': row[2], 'work_no': row[3]}
+                    for row in cursor.fetchall()]
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+
     def get_employee_by_name(self, name):
         """Mengambil data karyawan berdasarkan nama"""
         conn = None
@@ -720,6 +1347,8 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @cached("db.get_attendance_by_employee_period")
+    @archive.routes('start_date', 'end_date')
     def get_attendance_by_employee_period(self, employee_id, start_date, end_date):
         """Mengambil data absensi karyawan dalam periode tertentu"""
         conn = None
@@ -729,31 +1358,228 @@ class DatabaseManager:
             
             cursor.execute('''
                 SELECT a.id, a.date, a.jam_masuk, a.jam_keluar, 
-                       a.jam_masuk_lembur, a.jam_keluar_lembur, a.jam_anomali,
-                       a.shift_id, a.keterangan
+                       a.jam_masuk_lembur, a.jam_keluar_lembur,
+                       a.shift_id, COALESCE(a.keterangan, ''),
+                       a.jam_masuk_menit, a.jam_keluar_menit, a.jam_masuk_lembur_menit, a.jam_keluar_lembur_menit,
+                       a.employee_id
                 FROM attendance a
                 WHERE a.employee_id = ? AND a.date BETWEEN ? AND ?
                 ORDER BY a.date
             ''', (employee_id, start_date, end_date))
             
-            results = cursor.fetchall()
+            return AttendanceRecord.from_rows(cursor.fetchall())
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    @cached("db.get_attendance_by_date_range")
+    @archive.routes('start_date', 'end_date')
+    def get_attendance_by_date_range(self, start_date, end_date, employee_ids=None):
+        """Mengambil absensi semua karyawan (atau hanya employee_ids) dalam periode dengan satu query"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
             
-            attendance_data = []
-            for row in results:
-                jam_anomali = json.loads(row[6]) if row[6] else []
-                attendance_data.append({
-                    'id': row[0],
-                    'date': row[1],
-                    'jam_masuk': row[2],
-                    'jam_keluar': row[3],
-                    'jam_masuk_lembur': row[4],
-                    'jam_keluar_lembur': row[5],
-                    'jam_anomali': jam_anomali,
-                    'shift_id': row[7],
-                    'keterangan': row[8] or ''
-                })
+            query = '''
+                SELECT a.id, a.date, a.jam_masuk, a.jam_keluar, 
+                       a.jam_masuk_lembur, a.jam_keluar_lembur,
+                       a.shift_id, COALESCE(a.keterangan, ''),
+                       a.jam_masuk_menit, a.jam_keluar_menit, a.jam_masuk_lembur_menit, a.jam_keluar_lembur_menit,
+                       a.employee_id
+                FROM attendance a
+                WHERE a.date BETWEEN ? AND ?
+            '''
+            params = [start_date, end_date]
+            if employee_ids is not None:
+                employee_ids = list(employee_ids)
+                query += f" AND a.employee_id IN ({', '.join('?' * len(employee_ids))})"
+                params.extend(employee_ids)
+            query += ' ORDER BY a.employee_id, a.date'
+            cursor.execute(query, params)
+            
+            return AttendanceRecord.from_rows(cursor.fetchall())
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    # ==================== CHANGE TRACKING FUNCTIONS ====================
+    
+    def get_data_version(self):
+        """Nomor versi data global; berubah jika ada tulis ke tabel data mana pun"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
             
-            return attendance_data
+            cursor.execute('SELECT version FROM data_version WHERE id = 1')
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    def peek_data_version(self):
+        """Versi data lewat koneksi per-thread yang dipakai ulang (untuk cek cache, tanpa trace/profiling)"""
+        conn = getattr(self._version_local, 'conn', None)
+        if conn is None:
+            conn = self._connect(timeout=30.0, isolation_level=None, check_same_thread=False)
+            self._version_local.conn = conn
+        rows = conn.execute('SELECT version FROM data_version WHERE id = 1').fetchall()
+        return rows[0][0] if rows else 0
+    
+    def close_version_connection(self):
+        """Tutup koneksi cek versi milik thread ini (misalnya sebelum file database diganti)"""
+        conn = getattr(self._version_local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._version_local.conn = None
+    
+    def get_last_modified(self):
+        """Waktu perubahan terakhir (updated_at terbesar) per tabel data"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute(' UNION ALL '.join(
+                f"SELECT '{table}', MAX(updated_at) FROM {table}" for table in TRACKED_TABLES
+            ))
+            return dict(cursor.fetchall())
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    def get_change_watermark(self):
+        """Nomor urut perubahan terakhir di change_log (0 jika belum pernah ada perubahan)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            # sqlite_sequence tetap naik walaupun log lama sudah dihapus
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    def get_changed_cells(self, since, start_date, end_date):
+        """Set (employee_id, date) yang absensi/izinnya berubah setelah watermark since dalam periode
+        
+        Mengembalikan None jika log setelah watermark sudah terhapus (pemanggil harus memuat ulang penuh).
+        """
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT (SELECT MIN(seq) FROM change_log),
+                       (SELECT seq FROM sqlite_sequence WHERE name = 'change_log')
+            ''')
+            first_seq, last_seq = cursor.fetchone()
+            if last_seq and last_seq > since and (first_seq is None or first_seq > since + 1):
+                return None
+            
+            cursor.execute('''
+                SELECT DISTINCT employee_id, date
+                FROM change_log
+                WHERE seq > ? AND date BETWEEN ? AND ?
+            ''', (since, start_date, end_date))
+            return set(cursor.fetchall())
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    # ==================== SCAN HISTORY FUNCTIONS ====================
+    
+    @archive.routes('start_date', 'end_date')
+    def get_attendance_scans(self, start_date, end_date, employee_id=None, anomalies_only=False):
+        """Mengambil riwayat scan mesin dalam periode tertentu (opsional satu karyawan / hanya anomali)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT s.employee_id, e.name, s.date, s.seq, s.minute, s.raw
+                FROM attendance_scans s
+                JOIN employees e ON s.employee_id = e.id
+                WHERE s.date BETWEEN ? AND ?
+            '''
+            params = [start_date, end_date]
+            if employee_id is not None:
+                query += ' AND s.employee_id = ?'
+                params.append(employee_id)
+            if anomalies_only:
+                query += ' AND s.seq > ?'
+                params.append(len(ATTENDANCE_SCAN_FIELDS))
+            query += ' ORDER BY s.date, e.name, s.seq'
+            cursor.execute(query, params)
+            
+            return [{
+                'employee_id': row[0],
+                'employee_name': row[1],
+                'date': row[2],
+                'seq': row[3],
+                'minute': row[4],
+                'time': scan_text(row[4], row[5]),
+                'is_anomaly': row[3] > len(ATTENDANCE_SCAN_FIELDS)
+            } for row in cursor.fetchall()]
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    @archive.routes('start_date', 'end_date')
+    def get_repeated_scans(self, start_date, end_date, max_gap_minutes=5, employee_id=None):
+        """Mengambil pasangan scan berurutan yang jaraknya <= max_gap_minutes (tap ganda di mesin)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT s1.employee_id, e.name, s1.date, s1.seq, s1.minute, s1.raw, s2.minute, s2.raw,
+                       s2.minute - s1.minute AS gap
+                FROM attendance_scans s1
+                JOIN attendance_scans s2
+                    ON s2.employee_id = s1.employee_id AND s2.date = s1.date AND s2.seq = s1.seq + 1
+                JOIN employees e ON s1.employee_id = e.id
+                WHERE s1.date BETWEEN ? AND ?
+                  AND s2.minute - s1.minute BETWEEN 0 AND ?
+            '''
+            params = [start_date, end_date, max_gap_minutes]
+            if employee_id is not None:
+                query += ' AND s1.employee_id = ?'
+                params.append(employee_id)
+            query += ' ORDER BY s1.date, e.name, s1.seq'
+            cursor.execute(query, params)
+            
+            return [{
+                'employee_id': row[0],
+                'employee_name': row[1],
+                'date': row[2],
+                'seq': row[3],
+                'first_time': scan_text(row[4], row[5]),
+                'second_time': scan_text(row[6], row[7]),
+                'gap_minutes': row[8]
+            } for row in cursor.fetchall()]
         except Exception as e:
             raise e
         finally:
@@ -762,6 +1588,7 @@ class DatabaseManager:
     
     # ==================== SHIFT MANAGEMENT FUNCTIONS ====================
     
+    @cached("db.get_all_shifts")
     def get_all_shifts(self):
         """Mengambil semua shifts"""
         conn = None
@@ -769,35 +1596,15 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('SELECT * FROM shifts ORDER BY id')
-            results = cursor.fetchall()
-            
-            shifts = []
-            for row in results:
-                shifts.append({
-                    'id': row[0],
-                    'name': row[1],
-                    'weekday_work_start': row[2],
-                    'weekday_work_end': row[3],
-                    'weekday_overtime_start': row[4],
-                    'weekday_overtime_end': row[5],
-                    'weekday_overtime_limit': row[6],
-                    'saturday_work_start': row[7],
-                    'saturday_work_end': row[8],
-                    'saturday_overtime_start': row[9],
-                    'saturday_overtime_end': row[10],
-                    'saturday_overtime_limit': row[11],
-                    'late_tolerance': row[12],
-                    'overtime_mode': row[13]
-                })
-            
-            return shifts
+            cursor.execute(f'SELECT {SHIFT_COLUMNS} FROM shifts ORDER BY id')
+            return ShiftRecord.from_rows(cursor.fetchall())
         except Exception as e:
             raise e
         finally:
             if conn:
                 conn.close()
     
+    @cached("db.get_shift_by_id")
     def get_shift_by_id(self, shift_id):
         """Mengambil shift berdasarkan ID"""
         conn = None
@@ -805,33 +1612,16 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('SELECT * FROM shifts WHERE id = ?', (shift_id,))
+            cursor.execute(f'SELECT {SHIFT_COLUMNS} FROM shifts WHERE id = ?', (shift_id,))
             row = cursor.fetchone()
-            
-            if row:
-                return {
-                    'id': row[0],
-                    'name': row[1],
-                    'weekday_work_start': row[2],
-                    'weekday_work_end': row[3],
-                    'weekday_overtime_start': row[4],
-                    'weekday_overtime_end': row[5],
-                    'weekday_overtime_limit': row[6],
-                    'saturday_work_start': row[7],
-                    'saturday_work_end': row[8],
-                    'saturday_overtime_start': row[9],
-                    'saturday_overtime_end': row[10],
-                    'saturday_overtime_limit': row[11],
-                    'late_tolerance': row[12],
-                    'overtime_mode': row[13]
-                }
-            return None
+            return ShiftRecord(*row) if row else None
         except Exception as e:
             raise e
         finally:
             if conn:
                 conn.close()
     
+    @write_transaction
     def update_shift(self, shift_id, shift_data):
         """Update data shift"""
         conn = None
@@ -867,6 +1657,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def update_attendance_shift(self, attendance_id, shift_id):
         """Update shift untuk record attendance tertentu"""
         conn = None
@@ -877,6 +1668,8 @@ class DatabaseManager:
             cursor.execute('''
                 UPDATE attendance SET shift_id = ? WHERE id = ?
             ''', (shift_id, attendance_id))
+            if cursor.rowcount == 0:
+                archive.check_writable(cursor, attendance_id=attendance_id)
             
             conn.commit()
         except Exception as e:
@@ -887,6 +1680,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def update_attendance_keterangan(self, attendance_id, keterangan):
         """Update keterangan untuk record attendance tertentu"""
         conn = None
@@ -897,6 +1691,8 @@ class DatabaseManager:
             cursor.execute('''
                 UPDATE attendance SET keterangan = ? WHERE id = ?
             ''', (keterangan, attendance_id))
+            if cursor.rowcount == 0:
+                archive.check_writable(cursor, attendance_id=attendance_id)
             
             conn.commit()
         except Exception as e:
@@ -907,6 +1703,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def assign_employee_shift(self, employee_id, shift_id):
         """Assign shift ke karyawan"""
         conn = None
@@ -955,6 +1752,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def create_shift(self, shift_data):
         """Create shift baru"""
         conn = None
@@ -989,6 +1787,7 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @write_transaction
     def delete_shift(self, shift_id):
         """Delete shift"""
         conn = None
@@ -1013,3 +1812,124 @@ class DatabaseManager:
             if conn:
                 conn.close()
 
+    
+    # ==================== MAINTENANCE ====================
+    
+    @write_transaction
+    def save_maintenance_run(self, result):
+        """Menyimpan hasil maintenance.run_maintenance (hanya MAINTENANCE_LOG_LIMIT terakhir yang disimpan)"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            details = {key: result[key] for key in ('results', 'before', 'after', 'plans_before', 'plans_after')}
+            cursor.execute('''
+                INSERT INTO maintenance_log (started_at, reason, tasks, total_ms, db_size_before, db_size_after,
+                                             wal_size_before, wal_size_after, details)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (result['started_at'], result['reason'], ','.join(result['tasks']), result['total_ms'],
+                  result['before']['db_size'], result['after']['db_size'],
+                  result['before']['wal_size'], result['after']['wal_size'], json.dumps(details)))
+            cursor.execute('''
+                DELETE FROM maintenance_log WHERE id <= (SELECT MAX(id) FROM maintenance_log) - ?
+            ''', (MAINTENANCE_LOG_LIMIT,))
+            
+            conn.commit()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    def get_maintenance_runs(self, limit=20, tasks=None):
+        """Riwayat pemeliharaan terbaru; tasks membatasi ke kombinasi tugas tertentu"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT id, started_at, reason, tasks, total_ms, db_size_before, db_size_after,
+                       wal_size_before, wal_size_after, details
+                FROM maintenance_log
+            '''
+            params = []
+            if tasks is not None:
+                query += ' WHERE tasks = ?'
+                params.append(','.join(tasks))
+            query += ' ORDER BY id DESC LIMIT ?'
+            params.append(limit)
+            cursor.execute(query, params)
+            
+            return [{'id': row[0], 'started_at': row[1], 'reason': row[2], 'tasks': row[3].split(','),
+                     'total_ms': row[4], 'db_size_before': row[5], 'db_size_after': row[6],
+                     'wal_size_before': row[7], 'wal_size_after': row[8],
+                     **json.loads(row[9] or '{}')} for row in cursor.fetchall()]
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+    
+    # ==================== ARCHIVE ====================
+
+    def get_archives(self):
+        """Daftar tahun yang sudah diarsipkan beserta path file arsip dan jumlah barisnya"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT year, file, attendance, violations, leaves, scans,
+                       min_attendance_id, max_attendance_id, archived_at
+                FROM archives
+                ORDER BY year
+            ''')
+            return [{'year': row[0], 'file': row[1], 'path': archive.archive_path(self.db_path, row[0]),
+                     'attendance': row[2], 'violations': row[3], 'leaves': row[4], 'scans': row[5],
+                     'min_attendance_id': row[6], 'max_attendance_id': row[7], 'archived_at': row[8]}
+                    for row in cursor.fetchall()]
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
+
+    # ==================== STATISTICS ====================
+    
+    def get_database_stats(self):
+        """Mengambil statistik isi database"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            stats = {}
+            for table in ('employees', 'attendance', 'violations', 'leaves', 'shifts'):
+                cursor.execute(f'SELECT COUNT(*) FROM {table}')
+                stats[table] = cursor.fetchone()[0]
+            
+            cursor.execute('SELECT MIN(date), MAX(date), COUNT(DISTINCT date) FROM attendance')
+            first_date, last_date, total_days = cursor.fetchone()
+            stats['first_date'] = first_date
+            stats['last_date'] = last_date
+            stats['attendance_days'] = total_days
+            
+            cursor.execute('SELECT COUNT(*), COUNT(CASE WHEN seq > ? THEN 1 END) FROM attendance_scans',
+                           (len(ATTENDANCE_SCAN_FIELDS),))
+            stats['scans'], stats['anomaly_scans'] = cursor.fetchone()
+            
+            cursor.execute('SELECT version FROM data_version WHERE id = 1')
+            stats['data_version'] = cursor.fetchone()[0]
+            
+            stats['file_size'] = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
+            return stats
+        except Exception as e:
+            raise e
+        finally:
+            if conn:
+                conn.close()
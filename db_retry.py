@@ -0,0 +1,172 @@
+"""
+Transaksi tulis dengan retry otomatis saat database sedang dikunci.
+
+Method tulis DatabaseManager dibungkus `write_transaction`:
+
+- koneksi dibuka dengan PRAGMA busy_timeout (SQLite menunggu sendiri sampai
+  lock dilepas, default 5 detik, ABSENSI_BUSY_TIMEOUT_MS),
+- transaksi dimulai dengan BEGIN IMMEDIATE sehingga lock tulis diambil di awal
+  (bukan di tengah transaksi / saat commit, di mana SQLite bisa langsung
+  menyerah tanpa menunggu),
+- jika statement mana pun tetap gagal dengan SQLITE_BUSY/SQLITE_LOCKED, seluruh
+  method diulang dengan exponential backoff + jitter (maksimal
+  ABSENSI_WRITE_RETRIES kali, default 6).
+
+Waktu tunggu lock (BEGIN IMMEDIATE + jeda backoff), jumlah retry dan kegagalan
+dicatat per method; lihat get_stats() atau tab 🔒 Lock di dialog Diagnostik.
+Method tulis tidak boleh memanggil method tulis lain (koneksi kedua akan
+menunggu lock milik koneksi pertama).
+"""
+
+import functools
+import os
+import random
+import sqlite3
+import threading
+import time
+
+ENV_BUSY_TIMEOUT = 'ABSENSI_BUSY_TIMEOUT_MS'
+ENV_RETRIES = 'ABSENSI_WRITE_RETRIES'
+BACKOFF_BASE = 0.05  # detik; jeda ke-n diacak antara 0 dan min(BACKOFF_MAX, BACKOFF_BASE * 2**n)
+BACKOFF_MAX = 2.0
+
+_busy_timeout_ms = int(os.environ.get(ENV_BUSY_TIMEOUT, '') or 5000)
+_max_retries = int(os.environ.get(ENV_RETRIES, '') or 6)
+_lock = threading.Lock()
+_local = threading.local()
+_stats = {}
+
+
+class _Stat:
+    __slots__ = ('calls', 'retried', 'retries', 'busy_errors', 'failures', 'wait', 'max_wait')
+
+    def __init__(self):
+        self.calls = 0
+        self.retried = 0
+        self.retries = 0
+        self.busy_errors = 0
+        self.failures = 0
+        self.wait = 0.0
+        self.max_wait = 0.0
+
+
+def busy_timeout_ms():
+    return _busy_timeout_ms
+
+
+def max_retries():
+    return _max_retries
+
+
+def configure(busy_timeout_ms=None, max_retries=None):
+    """Ubah busy_timeout (ms) dan/atau jumlah retry maksimum"""
+    global _busy_timeout_ms, _max_retries
+    if busy_timeout_ms is not None:
+        _busy_timeout_ms = max(0, int(busy_timeout_ms))
+    if max_retries is not None:
+        _max_retries = max(0, int(max_retries))
+
+
+def is_busy_error(error):
+    """True untuk SQLITE_BUSY / SQLITE_LOCKED ("database is locked") dari statement mana pun"""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return (code & 0xff) in (5, 6)  # SQLITE_BUSY, SQLITE_LOCKED (termasuk kode extended)
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def in_write_transaction():
+    return getattr(_local, 'wait', None) is not None
+
+
+def begin_immediate(conn):
+    """BEGIN IMMEDIATE pada koneksi baru di dalam write_transaction; waktu tunggu lock dicatat"""
+    t0 = time.perf_counter()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+    finally:
+        _local.wait += time.perf_counter() - t0
+
+
+def backoff_delay(attempt):
+    """Jeda sebelum retry ke-attempt (mulai 0): full jitter agar penulis yang bertabrakan tidak serempak"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def write_transaction(func):
+    """Decorator method tulis: BEGIN IMMEDIATE + retry dengan backoff saat database terkunci"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if in_write_transaction():
+            return func(*args, **kwargs)  # Sudah di dalam retry luar
+
+        _local.wait = 0.0
+        attempt = 0
+        busy_errors = 0
+        try:
+            while True:
+                try:
+                    result = func(*args, **kwargs)
+                    _record(name, attempt, busy_errors, False)
+                    return result
+                except sqlite3.OperationalError as e:
+                    if not is_busy_error(e):
+                        raise
+                    busy_errors += 1
+                    if attempt >= _max_retries:
+                        _record(name, attempt, busy_errors, True)
+                        raise
+                    delay = backoff_delay(attempt)
+                    time.sleep(delay)
+                    _local.wait += delay
+                    attempt += 1
+        finally:
+            _local.wait = None
+
+    return wrapper
+
+
+def _record(name, retries, busy_errors, failed):
+    wait = _local.wait
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = _Stat()
+        stat.calls += 1
+        stat.retries += retries
+        stat.busy_errors += busy_errors
+        if retries:
+            stat.retried += 1
+        if failed:
+            stat.failures += 1
+        stat.wait += wait
+        if wait > stat.max_wait:
+            stat.max_wait = wait
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def get_stats():
+    """Statistik lock per method tulis, diurutkan dari total waktu tunggu terbesar"""
+    with _lock:
+        result = [{
+            'name': name,
+            'calls': stat.calls,
+            'retried': stat.retried,
+            'retries': stat.retries,
+            'busy_errors': stat.busy_errors,
+            'failures': stat.failures,
+            'wait_ms': round(stat.wait * 1000, 2),
+            'avg_wait_ms': round(stat.wait * 1000 / stat.calls, 3) if stat.calls else 0.0,
+            'max_wait_ms': round(stat.max_wait * 1000, 2)
+        } for name, stat in _stats.items()]
+    result.sort(key=lambda item: -item['wait_ms'])
+    return result
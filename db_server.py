@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+Mode multi-user: satu proses server memiliki file database, workstation lain
+mengakses lewat HTTP/JSON.
+
+SQLite (apalagi WAL) tidak aman dibuka bersamaan dari beberapa PC lewat
+shared folder. Dengan mode ini hanya server yang membuka `absensi.db` (di
+disk lokal server); aplikasi/CLI di PC lain memakai RemoteDatabaseManager
+yang meneruskan panggilan method DatabaseManager (REMOTE_METHODS) ke server.
+
+- Baca dikerjakan paralel di thread handler (WAL di disk lokal).
+- Tulis masuk satu antrean dan dikerjakan oleh satu thread penulis. Permintaan
+  yang menunggu digabung menjadi satu transaksi (batch, maksimal
+  --max-batch), masing-masing dalam SAVEPOINT sendiri sehingga kegagalan satu
+  permintaan tidak membatalkan yang lain. Klien baru mendapat jawaban setelah
+  COMMIT batch-nya selesai.
+
+Hanya method di REMOTE_METHODS yang bisa dipanggil (backup, restore, arsip,
+pemeliharaan dan DDL tetap di PC server). Server mendengarkan di 127.0.0.1
+secara default; agar bisa diakses PC lain (--host selain loopback) wajib
+memakai token bersama yang dikirim klien di header X-Absensi-Token.
+
+Menjalankan server dan klien (token juga bisa lewat env ABSENSI_SERVER_TOKEN):
+
+    python db_server.py --db absensi.db --host 0.0.0.0 --port 8765 --token RAHASIA
+    ABSENSI_SERVER_TOKEN=RAHASIA python app.py --server http://192.168.1.10:8765
+    ABSENSI_SERVER_TOKEN=RAHASIA python -m absensi --server http://192.168.1.10:8765 stats
+
+Protokol: POST /call {"method", "args", "kwargs"} -> {"result"} atau
+{"error": {"type", "message"}}; GET /health -> status dan statistik server.
+"""
+
+import argparse
+import datetime
+import hmac
+import http.client
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import records
+import sql_trace
+from database import DatabaseManager
+
+FLAG = '--server'
+ENV_VAR = 'ABSENSI_SERVER'
+TOKEN_ENV_VAR = 'ABSENSI_SERVER_TOKEN'
+TOKEN_HEADER = 'X-Absensi-Token'
+DEFAULT_PORT = 8765
+LOOPBACK_HOSTS = frozenset({'127.0.0.1', 'localhost', '::1'})
+
+READ, WRITE = 'read', 'write'
+# Satu-satunya method DatabaseManager yang boleh dipanggil lewat jaringan; WRITE lewat antrean penulis
+REMOTE_METHODS = {
+    'get_all_employees': READ,
+    'get_all_shifts': READ,
+    'get_archives': READ,
+    'get_attendance_by_date': READ,
+    'get_attendance_by_date_range': READ,
+    'get_attendance_by_employee_period': READ,
+    'get_attendance_scans': READ,
+    'get_attendance_summary_by_date': READ,
+    'get_change_watermark': READ,
+    'get_changed_cells': READ,
+    'get_data_version': READ,
+    'get_database_stats': READ,
+    'get_employee_by_name': READ,
+    'get_employee_identities': READ,
+    'get_employee_summaries': READ,
+    'get_employees_with_shifts': READ,
+    'get_last_modified': READ,
+    'get_leaves_by_date_range': READ,
+    'get_leaves_by_employee_date': READ,
+    'get_maintenance_runs': READ,
+    'get_repeated_scans': READ,
+    'get_shift_by_id': READ,
+    'get_shift_settings': READ,
+    'get_violations_by_attendance': READ,
+    'get_violations_by_date_range': READ,
+    'get_violations_by_employee': READ,
+    'peek_data_version': READ,
+    'add_leave': WRITE,
+    'add_or_get_employee': WRITE,
+    'add_violation': WRITE,
+    'assign_employee_shift': WRITE,
+    'create_shift': WRITE,
+    'delete_leave': WRITE,
+    'delete_shift': WRITE,
+    'delete_violation': WRITE,
+    'save_attendance_data': WRITE,
+    'update_attendance_field': WRITE,
+    'update_attendance_keterangan': WRITE,
+    'update_attendance_shift': WRITE,
+    'update_leave': WRITE,
+    'update_shift': WRITE,
+    'update_shift_settings': WRITE,
+    'update_violation': WRITE,
+}
+
+
+# ==================== ENCODING ====================
+
+def encode(value):
+    """Nilai hasil/argumen DatabaseManager -> struktur JSON (Record, tuple, set, tanggal ditandai)"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, records.Record):
+        return {'__record__': type(value).__name__, 'v': [encode(v) for v in value.values()]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: encode(v) for key, v in value.items()}
+        return {'__dict__': [[encode(key), encode(v)] for key, v in value.items()]}
+    if isinstance(value, list):
+        return [encode(v) for v in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [encode(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': [encode(v) for v in value]}
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    raise TypeError(f"Tipe {type(value).__name__} tidak bisa dikirim lewat server")
+
+
+def _decode_object(obj):
+    if '__record__' in obj:
+        return getattr(records, obj['__record__'])(*obj['v'])
+    if '__tuple__' in obj:
+        return tuple(obj['__tuple__'])
+    if '__set__' in obj:
+        return {_hashable(v) for v in obj['__set__']}
+    if '__dict__' in obj:
+        return {_hashable(key): v for key, v in obj['__dict__']}
+    if '__date__' in obj:
+        return datetime.date.fromisoformat(obj['__date__'])
+    if '__datetime__' in obj:
+        return datetime.datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def dumps(value):
+    return json.dumps(encode(value), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    return json.loads(data, object_hook=_decode_object)
+
+
+# ==================== SERVER ====================
+
+def is_write_method(name):
+    return REMOTE_METHODS.get(name) == WRITE
+
+
+def is_loopback(host):
+    return host in LOOPBACK_HOSTS
+
+
+class _BatchConnection:
+    """Koneksi transaksi batch untuk method DatabaseManager: commit/rollback/close diatur oleh penulis"""
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return self._conn.cursor()
+
+    def execute(self, *args):
+        return self._conn.execute(*args)
+
+    def executemany(self, *args):
+        return self._conn.executemany(*args)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ServerDatabaseManager(DatabaseManager):
+    """DatabaseManager sisi server: di thread penulis, get_connection memakai transaksi batch"""
+    def __init__(self, db_path):
+        self._batch_local = threading.local()
+        super().__init__(db_path)
+
+    def get_connection(self):
+        batch = getattr(self._batch_local, 'connection', None)
+        if batch is not None:
+            return batch
+        return super().get_connection()
+
+    def open_batch_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None,
+                               factory=sql_trace.connection_factory())
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._batch_local.connection = _BatchConnection(conn)
+        return conn
+
+
+class WriteBatcher:
+    """Satu thread penulis; permintaan tulis yang menunggu digabung dalam satu transaksi"""
+    def __init__(self, db_manager, max_batch=64):
+        self.db_manager = db_manager
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self.stats = {'writes': 0, 'batches': 0, 'max_batch': 0, 'failed': 0, 'busy_ms': 0.0}
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, method, args, kwargs):
+        future = Future()
+        self._queue.put((method, args, kwargs, future))
+        return future
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        conn = self.db_manager.open_batch_connection()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                batch = [item]
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self._queue.put(None)  # Selesaikan batch ini dulu, lalu berhenti
+                        break
+                    batch.append(item)
+                self._execute(conn, batch)
+        finally:
+            conn.close()
+
+    def _execute(self, conn, batch):
+        t0 = time.perf_counter()
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for method, args, kwargs, _ in batch:
+                conn.execute("SAVEPOINT request")
+                try:
+                    outcomes.append((True, getattr(self.db_manager, method)(*args, **kwargs)))
+                    conn.execute("RELEASE request")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO request")
+                    conn.execute("RELEASE request")
+                    outcomes.append((False, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            outcomes = [(False, e)] * len(batch)
+
+        failed = 0
+        for (_, _, _, future), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                failed += 1
+                future.set_exception(value)
+
+        with self._stats_lock:
+            self.stats['writes'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+            self.stats['failed'] += failed
+            self.stats['busy_ms'] += (time.perf_counter() - t0) * 1000
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['busy_ms'] = round(stats['busy_ms'], 1)
+        stats['avg_batch'] = round(stats['writes'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive: satu koneksi TCP per thread klien
+    disable_nagle_algorithm = True  # Header dan body dikirim terpisah; tanpa ini tiap jawaban tertahan ~40 ms
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        body = dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        """True jika server tanpa token atau header token cocok; jika tidak, jawaban 401 sudah dikirim"""
+        token = self.server.token
+        if token is None or hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), token):
+            return True
+        self._send(401, {'error': {'type': 'Unauthorized', 'message': "Token server tidak cocok"}})
+        return False
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path != '/health':
+            self._send(404, {'error': {'type': 'NotFound', 'message': self.path}})
+            return
+        self._send(200, {'status': 'ok', 'db_path': os.path.abspath(self.server.db_manager.db_path),
+                         'reads': self.server.reads, 'writer': self.server.batcher.get_stats()})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path != '/call':
+            self._send(404, {'error': {'type': 'NotFound', 'message': self.path}})
+            return
+        try:
+            request = loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            method = request['method']
+            args = request.get('args', [])
+            kwargs = request.get('kwargs', {})
+        except Exception as e:
+            self._send(400, {'error': {'type': 'BadRequest', 'message': str(e)}})
+            return
+
+        if method not in REMOTE_METHODS:
+            self._send(403, {'error': {'type': 'Forbidden', 'message': f"Method tidak diizinkan lewat server: {method}"}})
+            return
+
+        try:
+            if is_write_method(method):
+                result = self.server.batcher.submit(method, args, kwargs).result()
+            else:
+                self.server.count_read()
+                result = getattr(self.server.db_manager, method)(*args, **kwargs)
+            self._send(200, {'result': result})
+        except Exception as e:
+            self._send(500, {'error': {'type': type(e).__name__, 'message': str(e)}})
+
+
+class DatabaseServer(ThreadingHTTPServer):
+    """Server HTTP/JSON untuk satu file database"""
+    daemon_threads = True
+
+    def __init__(self, db_path, host='127.0.0.1', port=DEFAULT_PORT, max_batch=64, verbose=False, token=None):
+        """token: wajib jika host bukan loopback (server bisa diakses PC lain)"""
+        if not token and not is_loopback(host):
+            raise ValueError(f"Server di {host} bisa diakses PC lain: jalankan dengan --token "
+                             f"(atau env {TOKEN_ENV_VAR})")
+        self.token = token or None
+        self.db_manager = ServerDatabaseManager(db_path)
+        self.batcher = WriteBatcher(self.db_manager, max_batch)
+        self.verbose = verbose
+        self.reads = 0
+        self._reads_lock = threading.Lock()
+        super().__init__((host, port), _RequestHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_read(self):
+        with self._reads_lock:
+            self.reads += 1
+
+    def start_background(self):
+        """Jalankan serve_forever di thread terpisah (untuk test/benchmark di satu mesin)"""
+        thread = threading.Thread(target=self.serve_forever, name="db-server", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.batcher.stop()
+
+
+# ==================== CLIENT ====================
+
+class RemoteDatabaseError(Exception):
+    """Error dari server yang tidak punya padanan tipe lokal"""
+    def __init__(self, error_type, message):
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+
+
+_ERROR_TYPES = {
+    'IntegrityError': sqlite3.IntegrityError,
+    'OperationalError': sqlite3.OperationalError,
+    'DatabaseError': sqlite3.DatabaseError,
+    'ValueError': ValueError,
+    'KeyError': KeyError,
+    'TypeError': TypeError,
+    'Unauthorized': PermissionError,
+    'Forbidden': PermissionError,
+}
+
+
+class RemoteDatabaseManager:
+    """Pengganti DatabaseManager yang meneruskan method REMOTE_METHODS ke DatabaseServer"""
+    def __init__(self, url, timeout=60.0, token=None):
+        """token: token bersama server (default env ABSENSI_SERVER_TOKEN)"""
+        parts = urlsplit(url if '://' in url else f"http://{url}")
+        self.host = parts.hostname
+        self.port = parts.port or DEFAULT_PORT
+        self.db_path = f"http://{self.host}:{self.port}"  # Key cache/worker per server
+        self.timeout = timeout
+        self.token = token if token is not None else os.environ.get(TOKEN_ENV_VAR, '').strip() or None
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, http_method, path, body=None):
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(http_method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, loads(response.read())
+            except (http.client.HTTPException, ConnectionError):
+                # Koneksi keep-alive ditutup server; buka ulang sekali
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+
+    def call(self, method, *args, **kwargs):
+        status, payload = self._request("POST", "/call", dumps({'method': method, 'args': args, 'kwargs': kwargs}))
+        if 'error' in payload:
+            error = payload['error']
+            error_class = _ERROR_TYPES.get(error['type'])
+            if error_class is not None:
+                raise error_class(error['message'])
+            raise RemoteDatabaseError(error['type'], error['message'])
+        return payload['result']
+
+    def health(self):
+        return self._request("GET", "/health")[1]
+
+    def close_version_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __getattr__(self, name):
+        if name not in REMOTE_METHODS:
+            raise AttributeError(name)
+        method = lambda *args, **kwargs: self.call(name, *args, **kwargs)
+        method.__name__ = name
+        return method
+
+
+def connect_from_argv(argv=None, db_path="absensi.db"):
+    """DatabaseManager lokal, atau RemoteDatabaseManager jika ada --server URL / env ABSENSI_SERVER"""
+    argv = sys.argv if argv is None else argv
+    url = os.environ.get(ENV_VAR, '').strip()
+    if FLAG in argv:
+        index = argv.index(FLAG)
+        if index + 1 < len(argv):
+            url = argv[index + 1]
+            del argv[index:index + 2]
+        else:
+            del argv[index]
+    if url:
+        return RemoteDatabaseManager(url)
+    return DatabaseManager(db_path)
+
+
+# ==================== SIMULASI KLIEN ====================
+
+def _simulated_client(url, index, operations, write_ratio, employees, start_at):
+    """Satu klien simulasi (proses terpisah agar tidak berbagi GIL dengan server)"""
+    remote = RemoteDatabaseManager(url)
+    names = [f"KLIEN {index} KARYAWAN {n}" for n in range(employees)]
+    remote.get_all_employees()  # Buka koneksi sebelum waktu mulai
+    time.sleep(max(0.0, start_at - time.time()))
+    write_every = max(1, round(1 / write_ratio)) if write_ratio else 0
+    employee_id = remote.add_or_get_employee(names[0])
+    try:
+        for op in range(operations):
+            day = f"2030-01-{op % 28 + 1:02d}"
+            if write_every and op % write_every == 0:
+                employee_id = remote.add_or_get_employee(names[op % employees])
+                remote.add_leave(employee_id, day, f"Simulasi {index}-{op}")
+            else:
+                remote.get_leaves_by_employee_date(employee_id, day)
+    except Exception as e:
+        return time.time(), repr(e)
+    return time.time(), None
+
+
+def simulate_clients(url, clients, operations, write_ratio=0.2, employees=20):
+    """N klien paralel (proses), masing-masing `operations` panggilan campuran baca/tulis.
+
+    Setiap operasi tulis = add_or_get_employee + add_leave; sisanya
+    get_leaves_by_employee_date (ukuran hasil tetap kecil berapa pun jumlah klien).
+
+    Returns:
+        dict dengan jumlah operasi, durasi, throughput (ops/detik) dan statistik penulis server
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=clients) as pool:
+        # Proses dipanaskan dulu (import modul) sebelum waktu mulai bersama
+        list(pool.map(time.sleep, [0] * clients))
+        start_at = time.time() + 0.5
+        futures = [pool.submit(_simulated_client, url, index, operations, write_ratio, employees, start_at)
+                   for index in range(clients)]
+        outcomes = [future.result() for future in futures]
+
+    elapsed = max(end for end, _ in outcomes) - start_at
+    total = clients * operations
+    return {
+        'clients': clients,
+        'operations': total,
+        'elapsed_s': round(elapsed, 4),
+        'ops_per_s': round(total / elapsed, 1) if elapsed > 0 else 0.0,
+        'errors': [error for _, error in outcomes if error],
+        'writer': RemoteDatabaseManager(url).health()['writer']
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server database absensi untuk banyak workstation")
+    parser.add_argument('--db', default='absensi.db', help="Path file database (default: absensi.db)")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Alamat listen (default: 127.0.0.1; 0.0.0.0 agar bisa diakses PC lain, wajib --token)")
+    parser.add_argument('--token', default=os.environ.get(TOKEN_ENV_VAR) or None,
+                        help=f"Token bersama yang wajib dikirim klien (default: env {TOKEN_ENV_VAR})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('--max-batch', type=int, default=64, help="Maksimal permintaan tulis per transaksi")
+    parser.add_argument('--verbose', action='store_true', help="Tampilkan log setiap request")
+    parser.add_argument('--simulate', type=int, metavar='N',
+                        help="Jalankan server sementara lalu ukur throughput N klien simulasi")
+    parser.add_argument('--operations', type=int, default=200, help="Operasi per klien simulasi (default: 200)")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        server = DatabaseServer(args.db, args.host, 0, args.max_batch, args.verbose, args.token)
+        server.start_background()
+        try:
+            result = simulate_clients(server.url, args.simulate, args.operations)
+        finally:
+            server.stop()
+        print(json.dumps(result, indent=2))
+        return 1 if result['errors'] else 0
+
+    try:
+        server = DatabaseServer(args.db, args.host, args.port, args.max_batch, args.verbose, args.token)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"🗄️  Server database {os.path.abspath(args.db)} di {server.url} (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Akses database di thread terpisah agar UI Qt tidak membeku.
+
+Semua permintaan masuk ke satu antrean dan dikerjakan berurutan oleh satu
+thread DB per file database (DatabaseManager membuka koneksi per panggilan,
+jadi aman dipakai dari thread itu). `submit` mengembalikan
+concurrent.futures.Future; `call` juga memanggil callback di thread GUI lewat
+signal Qt begitu hasil tersedia:
+
+    worker = DatabaseWorker.for_manager(self.db_manager)
+    worker.call(build_violation_report, start, end,
+                on_result=self.show_report, on_error=self.show_error, owner=self)
+
+Fungsi yang dikirim menerima DatabaseManager sebagai argumen pertama (method
+DatabaseManager bisa dikirim langsung, mis. DatabaseManager.get_all_employees)
+dan tidak boleh menyentuh widget Qt.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+from shiboken6 import isValid
+
+_lock = threading.Lock()
+_workers = {}  # db_path -> DatabaseWorker
+
+
+class _Dispatcher(QObject):
+    """Meneruskan hasil dari thread DB ke thread GUI (koneksi signal antar-thread = queued)"""
+    finished = Signal(object, object, object)  # callback, value, owner
+
+    def __init__(self):
+        super().__init__()
+        self.finished.connect(self._deliver, Qt.QueuedConnection)
+
+    @Slot(object, object, object)
+    def _deliver(self, callback, value, owner):
+        if owner is not None and not isValid(owner):
+            return  # Widget sudah ditutup/dihapus sebelum hasil datang
+        callback(value)
+
+
+class DatabaseWorker:
+    """Satu thread DB dengan antrean permintaan untuk satu DatabaseManager"""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-worker")
+        self._dispatcher = _Dispatcher()
+
+    @classmethod
+    def for_manager(cls, db_manager):
+        """Worker bersama untuk file database db_manager (dibuat saat pertama dipakai, di thread GUI)"""
+        with _lock:
+            worker = _workers.get(db_manager.db_path)
+            if worker is None or worker.db_manager is not db_manager:
+                worker = cls(db_manager)
+                _workers[db_manager.db_path] = worker
+            return worker
+
+    def submit(self, func, *args, **kwargs):
+        """Antrekan func(db_manager, *args, **kwargs); hasil berupa Future"""
+        return self._executor.submit(func, self.db_manager, *args, **kwargs)
+
+    def call(self, func, *args, on_result=None, on_error=None, owner=None, **kwargs):
+        """Seperti submit, lalu panggil on_result(hasil) / on_error(exception) di thread GUI.
+
+        Jika owner (QObject) sudah dihapus saat hasil datang, callback dilewati.
+        """
+        future = self.submit(func, *args, **kwargs)
+
+        def done(future):
+            error = future.exception()
+            if error is not None:
+                if on_error is not None:
+                    self._dispatcher.finished.emit(on_error, error, owner)
+            elif on_result is not None:
+                self._dispatcher.finished.emit(on_result, future.result(), owner)
+
+        future.add_done_callback(done)
+        return future
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,466 @@
+"""Dialog diagnostik tersembunyi (Management → Ctrl+Shift+D): hasil profiling, trace SQL, cache query, lock dan pemeliharaan"""
+
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                               QPushButton, QLabel, QFileDialog, QMessageBox, QDialog,
+                               QHeaderView, QTabWidget, QWidget, QSpinBox, QDoubleSpinBox)
+from PySide6.QtCore import Qt
+
+import db_retry
+import maintenance
+import profiling
+import query_cache
+import sql_trace
+
+PROFILE_COLUMNS = [
+    ('name', "Operasi"), ('calls', "Calls"), ('total_ms', "Total (ms)"), ('avg_ms', "Rata-rata (ms)"),
+    ('p95_ms', "p95 (ms)"), ('max_ms', "Max (ms)"), ('rows', "Rows"), ('errors', "Error")
+]
+
+QUERY_COLUMNS = [
+    ('sql', "Query"), ('calls', "Calls"), ('total_ms', "Total (ms)"), ('avg_ms', "Rata-rata (ms)"),
+    ('max_ms', "Max (ms)"), ('rows', "Rows"), ('slow', "Lambat"), ('callers', "Pemanggil Terbanyak")
+]
+
+SLOW_COLUMNS = [
+    ('time', "Waktu"), ('elapsed_ms', "Durasi (ms)"), ('method', "Method DB"), ('caller', "Pemanggil"), ('sql', "Query")
+]
+
+N_PLUS_ONE_COLUMNS = [
+    ('time', "Waktu"), ('action', "Aksi"), ('count', "Jumlah"), ('total_ms', "Total (ms)"),
+    ('callers', "Pemanggil"), ('sql', "Query")
+]
+
+CACHE_COLUMNS = [
+    ('name', "Fungsi"), ('hits', "Hit"), ('misses', "Miss"), ('hit_rate', "Hit Rate (%)")
+]
+
+LOCK_COLUMNS = [
+    ('name', "Method Tulis"), ('calls', "Calls"), ('retried', "Kena Retry"), ('retries', "Total Retry"),
+    ('failures', "Gagal"), ('wait_ms', "Tunggu Lock (ms)"), ('avg_wait_ms', "Rata-rata (ms)"), ('max_wait_ms', "Max (ms)")
+]
+
+MAINTENANCE_COLUMNS = [
+    ('started_at', "Waktu"), ('reason', "Pemicu"), ('tasks', "Tugas"), ('total_ms', "Durasi (ms)"),
+    ('db_kb_before', "DB Sebelum (KB)"), ('db_kb_after', "DB Sesudah (KB)"),
+    ('wal_kb_before', "WAL Sebelum (KB)"), ('wal_kb_after', "WAL Sesudah (KB)")
+]
+
+PLAN_COLUMNS = [
+    ('name', "Query"), ('full_scans', "Full Scan"), ('ms_before', "Sebelum (ms)"), ('ms_after', "Sesudah (ms)"),
+    ('plan', "Query Plan")
+]
+
+
+def fill_table(table, columns, rows):
+    """Isi QTableWidget dari list of dict; angka disimpan sebagai data agar bisa diurutkan"""
+    table.setSortingEnabled(False)
+    table.setRowCount(len(rows))
+    for row, record in enumerate(rows):
+        for col, (key, _) in enumerate(columns):
+            value = record[key]
+            item = QTableWidgetItem()
+            if isinstance(value, (int, float)):
+                item.setData(Qt.DisplayRole, value)  # Numeric sort
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            else:
+                item.setText(str(value))
+                item.setToolTip(str(value))
+            table.setItem(row, col, item)
+    table.setSortingEnabled(True)
+
+
+def create_table(columns, stretch_column):
+    table = QTableWidget()
+    table.setColumnCount(len(columns))
+    table.setHorizontalHeaderLabels([title for _, title in columns])
+    table.horizontalHeader().setSectionResizeMode(stretch_column, QHeaderView.Stretch)
+    table.setEditTriggers(QTableWidget.NoEditTriggers)
+    table.setSortingEnabled(True)
+    return table
+
+
+class DiagnosticsDialog(QDialog):
+    """Dialog diagnostik: statistik profiling per operasi, trace query SQL, hit rate cache, tunggu lock dan pemeliharaan"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("🩺 Diagnostik Aplikasi")
+        self.resize(1000, 600)
+
+        layout = QVBoxLayout()
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.create_profile_tab(), "⏱️ Profiling")
+        self.tabs.addTab(self.create_sql_tab(), "🗄️ Query SQL")
+        self.tabs.addTab(self.create_cache_tab(), "💾 Cache")
+        self.tabs.addTab(self.create_lock_tab(), "🔒 Lock")
+        self.tabs.addTab(self.create_maintenance_tab(), "🧹 Maintenance")
+        layout.addWidget(self.tabs)
+
+        close_layout = QHBoxLayout()
+        close_layout.addStretch()
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+
+        self.setLayout(layout)
+        self.refresh_profile()
+        self.refresh_sql()
+        self.refresh_cache()
+        self.refresh_lock()
+        self.refresh_maintenance()
+
+    def create_profile_tab(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.profile_status = QLabel()
+        self.profile_status.setWordWrap(True)
+        layout.addWidget(self.profile_status)
+
+        self.profile_table = create_table(PROFILE_COLUMNS, 0)
+        layout.addWidget(self.profile_table)
+
+        buttons_layout = QHBoxLayout()
+        self.toggle_btn = QPushButton()
+        self.toggle_btn.clicked.connect(self.toggle_profiling)
+        buttons_layout.addWidget(self.toggle_btn)
+
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh_profile)
+        buttons_layout.addWidget(refresh_btn)
+
+        reset_btn = QPushButton("🗑️ Reset")
+        reset_btn.clicked.connect(self.reset_profile)
+        buttons_layout.addWidget(reset_btn)
+
+        export_btn = QPushButton("💾 Simpan JSON")
+        export_btn.clicked.connect(self.export_profile)
+        buttons_layout.addWidget(export_btn)
+
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+        return widget
+
+    def refresh_profile(self):
+        """Isi ulang tabel profiling"""
+        enabled = profiling.is_enabled()
+        stats = profiling.get_stats()
+
+        if enabled:
+            self.profile_status.setText(f"✅ Profiling aktif - {len(stats)} operasi tercatat. "
+                                        "Hasil juga disimpan ke file JSON saat aplikasi ditutup.")
+            self.toggle_btn.setText("⏸️ Nonaktifkan Profiling")
+        else:
+            self.profile_status.setText("⏸️ Profiling tidak aktif. Jalankan aplikasi dengan --profile "
+                                        "(atau ABSENSI_PROFILE=1), atau aktifkan di sini.")
+            self.toggle_btn.setText("▶️ Aktifkan Profiling")
+
+        fill_table(self.profile_table, PROFILE_COLUMNS, stats)
+
+    def toggle_profiling(self):
+        if profiling.is_enabled():
+            profiling.disable()
+        else:
+            profiling.enable()
+        self.refresh_profile()
+
+    def reset_profile(self):
+        profiling.reset()
+        self.refresh_profile()
+
+    def export_profile(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Simpan Profil", "profile.json", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            profiling.dump(file_path)
+            QMessageBox.information(self, "Success", f"Profil disimpan ke:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal menyimpan profil: {str(e)}")
+
+    def create_sql_tab(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.sql_status = QLabel()
+        self.sql_status.setWordWrap(True)
+        layout.addWidget(self.sql_status)
+
+        slow_ms, n_plus_one = sql_trace.get_thresholds()
+        threshold_layout = QHBoxLayout()
+        threshold_layout.addWidget(QLabel("Query lambat ≥"))
+        self.slow_spin = QDoubleSpinBox()
+        self.slow_spin.setRange(0, 60000)
+        self.slow_spin.setSuffix(" ms")
+        self.slow_spin.setValue(slow_ms)
+        threshold_layout.addWidget(self.slow_spin)
+        threshold_layout.addWidget(QLabel("N+1 jika statement sama >"))
+        self.n_plus_one_spin = QSpinBox()
+        self.n_plus_one_spin.setRange(1, 100000)
+        self.n_plus_one_spin.setSuffix(" kali per aksi")
+        self.n_plus_one_spin.setValue(n_plus_one)
+        threshold_layout.addWidget(self.n_plus_one_spin)
+        apply_btn = QPushButton("Terapkan")
+        apply_btn.clicked.connect(self.apply_sql_thresholds)
+        threshold_layout.addWidget(apply_btn)
+        threshold_layout.addStretch()
+        layout.addLayout(threshold_layout)
+
+        self.sql_tabs = QTabWidget()
+        self.query_table = create_table(QUERY_COLUMNS, 0)
+        self.slow_table = create_table(SLOW_COLUMNS, 4)
+        self.n_plus_one_table = create_table(N_PLUS_ONE_COLUMNS, 5)
+        self.sql_tabs.addTab(self.query_table, "Semua Query")
+        self.sql_tabs.addTab(self.slow_table, "Query Lambat")
+        self.sql_tabs.addTab(self.n_plus_one_table, "Pola N+1")
+        layout.addWidget(self.sql_tabs)
+
+        buttons_layout = QHBoxLayout()
+        self.sql_toggle_btn = QPushButton()
+        self.sql_toggle_btn.clicked.connect(self.toggle_sql_trace)
+        buttons_layout.addWidget(self.sql_toggle_btn)
+
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh_sql)
+        buttons_layout.addWidget(refresh_btn)
+
+        reset_btn = QPushButton("🗑️ Reset")
+        reset_btn.clicked.connect(self.reset_sql)
+        buttons_layout.addWidget(reset_btn)
+
+        export_btn = QPushButton("💾 Simpan JSON")
+        export_btn.clicked.connect(self.export_sql)
+        buttons_layout.addWidget(export_btn)
+
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+        return widget
+
+    def refresh_sql(self):
+        """Isi ulang tabel trace SQL"""
+        report = sql_trace.get_report()
+
+        if report['enabled']:
+            self.sql_status.setText(
+                f"✅ Trace SQL aktif - {len(report['queries'])} query berbeda, "
+                f"{len(report['slow_queries'])} query lambat, {len(report['n_plus_one'])} pola N+1. "
+                "Hasil juga disimpan ke file JSON saat aplikasi ditutup."
+            )
+            self.sql_toggle_btn.setText("⏸️ Nonaktifkan Trace SQL")
+        else:
+            self.sql_status.setText("⏸️ Trace SQL tidak aktif. Jalankan aplikasi dengan --sql-trace "
+                                    "(atau ABSENSI_SQL_TRACE=1), atau aktifkan di sini.")
+            self.sql_toggle_btn.setText("▶️ Aktifkan Trace SQL")
+
+        queries = [
+            {**query, 'callers': ", ".join(f"{c['caller']} ({c['count']}x)" for c in query['callers'])}
+            for query in report['queries']
+        ]
+        findings = [
+            {**finding, 'callers': ", ".join(f"{c['caller']} → {c['method']} ({c['count']}x)"
+                                             for c in finding['callers'])}
+            for finding in reversed(report['n_plus_one'])
+        ]
+        fill_table(self.query_table, QUERY_COLUMNS, queries)
+        fill_table(self.slow_table, SLOW_COLUMNS, list(reversed(report['slow_queries'])))
+        fill_table(self.n_plus_one_table, N_PLUS_ONE_COLUMNS, findings)
+
+        self.sql_tabs.setTabText(1, f"Query Lambat ({len(report['slow_queries'])})")
+        self.sql_tabs.setTabText(2, f"Pola N+1 ({len(report['n_plus_one'])})")
+
+    def apply_sql_thresholds(self):
+        sql_trace.set_thresholds(self.slow_spin.value(), self.n_plus_one_spin.value())
+        self.refresh_sql()
+
+    def toggle_sql_trace(self):
+        if sql_trace.is_enabled():
+            sql_trace.disable()
+        else:
+            sql_trace.enable(self.slow_spin.value(), self.n_plus_one_spin.value())
+        self.refresh_sql()
+
+    def reset_sql(self):
+        sql_trace.reset()
+        self.refresh_sql()
+
+    def export_sql(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Simpan Trace SQL", "sql_trace.json", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            sql_trace.dump(file_path)
+            QMessageBox.information(self, "Success", f"Trace SQL disimpan ke:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal menyimpan trace SQL: {str(e)}")
+
+    def create_cache_tab(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.cache_status = QLabel()
+        self.cache_status.setWordWrap(True)
+        layout.addWidget(self.cache_status)
+
+        self.cache_table = create_table(CACHE_COLUMNS, 0)
+        layout.addWidget(self.cache_table)
+
+        buttons_layout = QHBoxLayout()
+        self.cache_toggle_btn = QPushButton()
+        self.cache_toggle_btn.clicked.connect(self.toggle_cache)
+        buttons_layout.addWidget(self.cache_toggle_btn)
+
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh_cache)
+        buttons_layout.addWidget(refresh_btn)
+
+        clear_btn = QPushButton("🗑️ Kosongkan")
+        clear_btn.clicked.connect(self.clear_cache)
+        buttons_layout.addWidget(clear_btn)
+
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+        return widget
+
+    def refresh_cache(self):
+        """Isi ulang tabel statistik cache"""
+        stats = query_cache.get_stats()
+
+        if stats['enabled']:
+            self.cache_status.setText(
+                f"✅ Cache aktif - {stats['size']}/{stats['maxsize']} entri, hit rate {stats['hit_rate']}% "
+                f"({stats['hits']} hit, {stats['misses']} miss), {stats['invalidations']} entri dibuang karena "
+                f"data berubah, {stats['evictions']} dibuang karena penuh."
+            )
+            self.cache_toggle_btn.setText("⏸️ Nonaktifkan Cache")
+        else:
+            self.cache_status.setText("⏸️ Cache tidak aktif (ABSENSI_CACHE=0), atau aktifkan di sini.")
+            self.cache_toggle_btn.setText("▶️ Aktifkan Cache")
+
+        fill_table(self.cache_table, CACHE_COLUMNS, stats['functions'])
+
+    def toggle_cache(self):
+        if query_cache.is_enabled():
+            query_cache.disable()
+        else:
+            query_cache.enable()
+        self.refresh_cache()
+
+    def clear_cache(self):
+        query_cache.reset()
+        self.refresh_cache()
+
+    def create_lock_tab(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.lock_status = QLabel()
+        self.lock_status.setWordWrap(True)
+        layout.addWidget(self.lock_status)
+
+        self.lock_table = create_table(LOCK_COLUMNS, 0)
+        layout.addWidget(self.lock_table)
+
+        buttons_layout = QHBoxLayout()
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh_lock)
+        buttons_layout.addWidget(refresh_btn)
+
+        reset_btn = QPushButton("🗑️ Reset")
+        reset_btn.clicked.connect(self.reset_lock)
+        buttons_layout.addWidget(reset_btn)
+
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+        return widget
+
+    def refresh_lock(self):
+        """Isi ulang tabel statistik tunggu lock"""
+        stats = db_retry.get_stats()
+        self.lock_status.setText(
+            f"Setiap tulis memakai BEGIN IMMEDIATE dengan busy_timeout {db_retry.busy_timeout_ms()} ms dan "
+            f"maksimal {db_retry.max_retries()} retry (backoff acak) saat database terkunci. "
+            f"Total: {sum(stat['retries'] for stat in stats)} retry, "
+            f"{sum(stat['failures'] for stat in stats)} gagal."
+        )
+        fill_table(self.lock_table, LOCK_COLUMNS, stats)
+
+    def reset_lock(self):
+        db_retry.reset()
+        self.refresh_lock()
+
+    def create_maintenance_tab(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.maintenance_status = QLabel()
+        self.maintenance_status.setWordWrap(True)
+        layout.addWidget(self.maintenance_status)
+
+        self.maintenance_table = create_table(MAINTENANCE_COLUMNS, 2)
+        layout.addWidget(self.maintenance_table)
+
+        layout.addWidget(QLabel("Query plan pada pemeliharaan terakhir:"))
+        self.plan_table = create_table(PLAN_COLUMNS, 4)
+        layout.addWidget(self.plan_table)
+
+        buttons_layout = QHBoxLayout()
+        self.maintenance_run_btn = QPushButton("▶️ Jalankan Sekarang")
+        self.maintenance_run_btn.clicked.connect(self.run_maintenance_now)
+        self.maintenance_run_btn.setEnabled('://' not in self.db_manager.db_path
+                                            and not getattr(self.db_manager, 'read_only', False))
+        buttons_layout.addWidget(self.maintenance_run_btn)
+
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh_maintenance)
+        buttons_layout.addWidget(refresh_btn)
+
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+        return widget
+
+    def refresh_maintenance(self):
+        """Isi ulang riwayat pemeliharaan dan query plan terakhir"""
+        runs = self.db_manager.get_maintenance_runs()
+        scheduler = "aktif" if maintenance.is_scheduler_enabled() else "nonaktif (ABSENSI_MAINTENANCE=0)"
+        self.maintenance_status.setText(
+            f"Pemeliharaan otomatis {scheduler}: semua tugas setiap {maintenance.INTERVAL_HOURS:g} jam, "
+            f"checkpoint saja jika WAL > {maintenance.WAL_CHECKPOINT_BYTES // 1024} KB, dijalankan setelah "
+            f"{maintenance.IDLE_SECONDS:g} detik tanpa aktivitas."
+        )
+        fill_table(self.maintenance_table, MAINTENANCE_COLUMNS, [{
+            'started_at': run['started_at'].replace('T', ' '),
+            'reason': run['reason'],
+            'tasks': ', '.join(run['tasks']),
+            'total_ms': run['total_ms'],
+            'db_kb_before': round(run['db_size_before'] / 1024, 1),
+            'db_kb_after': round(run['db_size_after'] / 1024, 1),
+            'wal_kb_before': round(run['wal_size_before'] / 1024, 1),
+            'wal_kb_after': round(run['wal_size_after'] / 1024, 1),
+        } for run in runs])
+
+        plans = []
+        if runs:
+            for before, after in zip(runs[0].get('plans_before', []), runs[0].get('plans_after', [])):
+                plans.append({'name': after['name'], 'full_scans': after['full_scans'],
+                              'ms_before': before['ms'], 'ms_after': after['ms'], 'plan': after['plan']})
+        fill_table(self.plan_table, PLAN_COLUMNS, plans)
+
+    def run_maintenance_now(self):
+        from db_worker import DatabaseWorker
+
+        self.maintenance_run_btn.setEnabled(False)
+        self.maintenance_run_btn.setText("⏳ Menjalankan...")
+        DatabaseWorker.for_manager(self.db_manager).call(
+            maintenance.run_maintenance, on_result=self.on_maintenance_finished,
+            on_error=self.on_maintenance_failed, owner=self)
+
+    def on_maintenance_finished(self, result):
+        self.maintenance_run_btn.setEnabled(True)
+        self.maintenance_run_btn.setText("▶️ Jalankan Sekarang")
+        self.refresh_maintenance()
+
+    def on_maintenance_failed(self, error):
+        self.on_maintenance_finished(None)
+        QMessageBox.critical(self, "Error", f"Pemeliharaan database gagal: {error}")
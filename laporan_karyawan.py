@@ -0,0 +1,480 @@
+"""Laporan karyawan satuan (ReportTab dan dialog pembungkusnya)"""
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                               QPushButton, QLabel, QFileDialog, QMessageBox, QHeaderView,
+                               QComboBox, QTextEdit, QDialog, QFormLayout, QGroupBox, QSplitter)
+from PySide6.QtCore import Qt, QDate
+from PySide6.QtGui import QColor
+
+from widgets import BusySpinner, IndonesianDateEdit, attach_employee_search
+from db_worker import DatabaseWorker
+from report_calc import build_employee_report, format_time_duration
+from report_export import export_employee_report_xlsx
+from profiling import profiled
+
+
+def load_employee_report(db_manager, employee_id, start_date, end_date):
+    """Ambil absensi dan hitung laporan karyawan (dijalankan di thread DB)
+
+    Returns:
+        (rows, totals), atau None jika tidak ada absensi dalam periode
+    """
+    attendance_data = db_manager.get_attendance_by_employee_period(employee_id, start_date, end_date)
+    if not attendance_data:
+        return None
+    return build_employee_report(db_manager, employee_id, attendance_data)
+
+
+class ReportTab(QWidget):
+    def __init__(self, db_manager):
+        super().__init__()
+        self.db_manager = db_manager
+        self.report_request = 0  # Nomor permintaan terakhir; hasil permintaan lama diabaikan
+        self.init_ui()
+    
+    def init_ui(self):
+        # Main splitter
+        splitter = QSplitter(Qt.Horizontal)
+        
+        # Left panel - Settings
+        left_panel = self.create_settings_panel()
+        splitter.addWidget(left_panel)
+        
+        # Right panel - Reports
+        right_panel = self.create_report_panel()
+        splitter.addWidget(right_panel)
+        
+        # Set splitter proportions
+        splitter.setSizes([300, 500])
+        
+        layout = QVBoxLayout()
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+        
+        # Load employees
+        self.load_employees()
+    
+    def create_settings_panel(self):
+        group = QGroupBox("Info Shift Karyawan")
+        layout = QVBoxLayout()
+        
+        # Info label
+        info_label = QLabel("Shift akan otomatis diambil berdasarkan karyawan yang dipilih di panel laporan.")
+        info_label.setWordWrap(True)
+        info_label.setStyleSheet("QLabel { color: #666; font-style: italic; }")
+        layout.addWidget(info_label)
+        
+        # Shift info display
+        self.shift_info_display = QTextEdit()
+        self.shift_info_display.setReadOnly(True)
+        self.shift_info_display.setMaximumHeight(400)
+        self.shift_info_display.setText("Pilih karyawan di panel laporan untuk melihat info shift")
+        layout.addWidget(self.shift_info_display)
+        
+        group.setLayout(layout)
+        return group
+    
+    def create_report_panel(self):
+        group = QGroupBox("Generate Laporan")
+        layout = QVBoxLayout()
+        
+        # Employee selection
+        form_layout = QFormLayout()
+        
+        self.employee_combo = QComboBox()
+        self.employee_combo.currentIndexChanged.connect(self.on_employee_changed)
+        self.load_employees()
+        attach_employee_search(self.employee_combo)
+        form_layout.addRow("Pilih Karyawan:", self.employee_combo)
+        
+        # Date range dengan format Indonesia
+        date_layout = QHBoxLayout()
+        
+        # Tanggal mulai dengan format Indonesia
+        self.start_date = IndonesianDateEdit()
+        self.start_date.setDate(QDate.currentDate().addDays(-30))
+        date_layout.addWidget(self.start_date)
+        
+        date_layout.addWidget(QLabel(" - "))
+        
+        # Tanggal akhir dengan format Indonesia
+        self.end_date = IndonesianDateEdit()
+        self.end_date.setDate(QDate.currentDate())
+        date_layout.addWidget(self.end_date)
+        
+        form_layout.addRow("Periode:", date_layout)
+        
+        # Buttons layout
+        buttons_layout = QHBoxLayout()
+        
+        # Refresh button
+        self.refresh_btn = QPushButton("Refresh Data")
+        self.refresh_btn.clicked.connect(self.refresh_employees)
+        buttons_layout.addWidget(self.refresh_btn)
+        
+        # Generate button
+        self.generate_btn = QPushButton("Generate Laporan")
+        self.generate_btn.clicked.connect(self.generate_report)
+        buttons_layout.addWidget(self.generate_btn)
+        
+        # Export button
+        self.export_btn = QPushButton("Export Excel")
+        self.export_btn.clicked.connect(self.export_to_excel)
+        self.export_btn.setEnabled(False)  # Enable after generate
+        buttons_layout.addWidget(self.export_btn)
+        
+        form_layout.addRow(buttons_layout)
+        
+        # Indikator loading selama data diambil di thread DB
+        self.spinner = BusySpinner()
+        form_layout.addRow(self.spinner)
+        
+        layout.addLayout(form_layout)
+        
+        # Report table
+        self.report_table = QTableWidget()
+        self.report_table.setColumnCount(14)  # Tambah kolom Shift dan Loyalitas
+        self.report_table.setHorizontalHeaderLabels([
+            "Tanggal", "Shift", "Jam Masuk", "Jam Keluar", "Jam Masuk Lembur", "Jam Keluar Lembur",
+            "Jam Kerja Total", "Jam Lembur", "Loyalitas", "Overtime", "Keterlambatan", "Status", "Keterangan", "Pelanggaran"
+        ])
+        
+        # Resize columns - ubah ke Interactive agar pengguna dapat mengubah ukuran kolom
+        header = self.report_table.horizontalHeader()
+        
+        # Set semua kolom ke Interactive (bisa diubah ukurannya oleh user)
+        for i in range(14):  # Semua kolom termasuk Shift, Loyalitas, keterangan dan pelanggaran
+            header.setSectionResizeMode(i, QHeaderView.Interactive)
+        
+        # Set default width untuk kolom
+        self.report_table.setColumnWidth(0, 100)  # Tanggal
+        self.report_table.setColumnWidth(1, 80)   # Jam Masuk
+        self.report_table.setColumnWidth(2, 80)   # Jam Keluar
+        self.report_table.setColumnWidth(3, 120)  # Jam Masuk Lembur
+        self.report_table.setColumnWidth(4, 120)  # Jam Keluar Lembur
+        self.report_table.setColumnWidth(5, 100)  # Jam Kerja
+        self.report_table.setColumnWidth(6, 100)  # Jam Lembur
+        self.report_table.setColumnWidth(7, 100)  # Loyalitas
+        self.report_table.setColumnWidth(8, 100)  # Overtime
+        self.report_table.setColumnWidth(9, 100)  # Keterlambatan
+        self.report_table.setColumnWidth(10, 80)  # Status
+        self.report_table.setColumnWidth(11, 200) # Keterangan
+        self.report_table.setColumnWidth(12, 300) # Pelanggaran
+        
+        # Enable stretching table to fill available space
+        self.report_table.horizontalHeader().setStretchLastSection(True)
+        
+        # Enable sorting when clicking on headers
+        self.report_table.setSortingEnabled(True)
+        
+        # Enable word wrap untuk semua cells
+        self.report_table.setWordWrap(True)
+        
+        # Set row height yang cukup untuk multiple lines
+        self.report_table.verticalHeader().setDefaultSectionSize(45)
+        
+        layout.addWidget(self.report_table)
+        
+        # Summary
+        self.summary_label = QLabel("Pilih karyawan dan periode untuk melihat laporan")
+        self.summary_label.setStyleSheet("font-weight: bold; padding: 10px;")
+        layout.addWidget(self.summary_label)
+        
+        group.setLayout(layout)
+        return group
+    
+    def update_shift_info_display(self, employee_id):
+        """Update shift info display based on selected employee - shows per-day shift info"""
+        if not employee_id:
+            self.shift_info_display.setText("Pilih karyawan untuk melihat info shift")
+            return
+        
+        try:
+            employees = self.db_manager.get_employees_with_shifts()
+            employee_info = None
+            for emp in employees:
+                if emp['id'] == employee_id:
+                    employee_info = emp
+                    break
+            
+            if not employee_info:
+                self.shift_info_display.setText("Karyawan tidak ditemukan!")
+                return
+            
+            # Get attendance data for this employee to show actual shifts used
+            start_date = self.start_date.date().toPython().strftime('%Y-%m-%d')
+            end_date = self.end_date.date().toPython().strftime('%Y-%m-%d')
+            attendance_data = self.db_manager.get_attendance_by_employee_period(employee_id, start_date, end_date)
+            
+            # Collect unique shifts used in the period
+            shifts_used = {}
+            for record in attendance_data:
+                shift_id = record.get('shift_id', 1)
+                if shift_id not in shifts_used:
+                    shift_settings = self.db_manager.get_shift_by_id(shift_id)
+                    if shift_settings:
+                        shifts_used[shift_id] = shift_settings
+            
+            if not shifts_used:
+                # Show default shift if no attendance data
+                default_shift = self.db_manager.get_shift_by_id(employee_info.get('shift_id', 1))
+                if default_shift:
+                    shifts_used[default_shift['id']] = default_shift
+            
+            # Format shift info
+            shift_info = f"""KARYAWAN: {employee_info['name']}
+
+📋 INFORMASI SHIFT PERIODE ({start_date} s/d {end_date}):
+⚠️  Shift di-set PER HARI di Input Harian (bukan shift tetap)
+
+SHIFT YANG DIGUNAKAN DALAM PERIODE INI:"""
+            
+            for shift_id, shift_settings in shifts_used.items():
+                shift_info += f"""
+
+🔸 SHIFT: {shift_settings['name']} (ID: {shift_id})
+SENIN - JUMAT:
+• Jam Kerja: {shift_settings['weekday_work_start']} - {shift_settings['weekday_work_end']}
+• Jam Lembur: {shift_settings['weekday_overtime_start']} - {shift_settings['weekday_overtime_end']}
+• Batas Overtime: {shift_settings['weekday_overtime_limit']}
+
+SABTU:
+• Jam Kerja: {shift_settings['saturday_work_start']} - {shift_settings['saturday_work_end']}
+• Jam Lembur: {shift_settings['saturday_overtime_start']} - {shift_settings['saturday_overtime_end']}
+• Batas Overtime: {shift_settings['saturday_overtime_limit']}
+
+PENGATURAN:
+• Toleransi Terlambat: {shift_settings['late_tolerance']} menit
+• Mode Overtime: {shift_settings['overtime_mode'].replace('_', ' ').title()}"""
+            
+            shift_info += f"""
+
+📝 CATATAN:
+• Setiap hari bisa menggunakan shift yang berbeda
+• Shift ditentukan saat input data harian
+• Laporan ini menggunakan shift sesuai yang di-set per hari
+• Minggu: Hitung durasi kerja saja (tidak ada lembur/overtime)"""
+            
+            self.shift_info_display.setText(shift_info)
+            
+        except Exception as e:
+            self.shift_info_display.setText(f"Error: {str(e)}")
+    
+    def load_employees(self):
+        self.employee_combo.clear()
+        employees = self.db_manager.get_all_employees()
+        for emp in employees:
+            self.employee_combo.addItem(emp['name'], emp['id'])
+        
+        # Update shift info for first employee if any
+        if employees:
+            self.update_shift_info_display(employees[0]['id'])
+    
+    def on_employee_changed(self):
+        """Handle employee selection change"""
+        employee_id = self.employee_combo.currentData()
+        self.update_shift_info_display(employee_id)
+    
+    def refresh_employees(self):
+        """Refresh employee list - dipanggil setelah save data baru"""
+        current_selection = self.employee_combo.currentData()
+        self.load_employees()
+        
+        # Restore selection if possible
+        if current_selection:
+            for i in range(self.employee_combo.count()):
+                if self.employee_combo.itemData(i) == current_selection:
+                    self.employee_combo.setCurrentIndex(i)
+                    break
+    
+    def generate_report(self):
+        if self.employee_combo.count() == 0:
+            QMessageBox.warning(self, "Warning", "Tidak ada data karyawan")
+            return
+        
+        employee_id = self.employee_combo.currentData()
+        employee_name = self.employee_combo.currentText()
+        start_date = self.start_date.date().toString("yyyy-MM-dd")
+        end_date = self.end_date.date().toString("yyyy-MM-dd")
+        
+        # Ambil data dan hitung laporan di thread DB; tabel diisi saat hasil datang
+        self.report_request += 1
+        request = self.report_request
+        self.generate_btn.setEnabled(False)
+        self.spinner.start(f"Memuat laporan {employee_name}...")
+        DatabaseWorker.for_manager(self.db_manager).call(
+            load_employee_report, employee_id, start_date, end_date,
+            on_result=lambda result: self.on_report_loaded(request, employee_id, employee_name, result),
+            on_error=lambda error: self.on_report_failed(request, error),
+            owner=self
+        )
+    
+    def finish_request(self, request):
+        """True jika request masih yang terbaru (lalu hentikan loading)"""
+        if request != self.report_request:
+            return False
+        self.spinner.stop()
+        self.generate_btn.setEnabled(True)
+        return True
+    
+    def on_report_loaded(self, request, employee_id, employee_name, result):
+        if not self.finish_request(request):
+            return
+        
+        if result is None:
+            QMessageBox.information(self, "Info", "Tidak ada data absensi untuk periode yang dipilih")
+            return
+        
+        rows, totals = result
+        self.populate_report(employee_name, rows, totals)
+        
+        # Update shift info display with current period
+        self.update_shift_info_display(employee_id)
+    
+    def on_report_failed(self, request, error):
+        if not self.finish_request(request):
+            return
+        QMessageBox.critical(self, "Error", f"Gagal membuat laporan: {str(error)}")
+    
+    @profiled("ui.laporan_karyawan.populate")
+    def populate_report(self, employee_name, rows, totals):
+        """Isi tabel dan ringkasan dari hasil build_employee_report"""
+        self.report_table.setRowCount(len(rows))
+        
+        for row, report_row in enumerate(rows):
+            data = report_row['data']
+            metrics = report_row['metrics']
+            
+            # Populate raw attendance data first
+            self.report_table.setItem(row, 0, QTableWidgetItem(data['date']))
+            self.report_table.setItem(row, 1, QTableWidgetItem(report_row['shift_name']))
+            self.report_table.setItem(row, 2, QTableWidgetItem(data['jam_masuk'] or "-"))
+            self.report_table.setItem(row, 3, QTableWidgetItem(data['jam_keluar'] or "-"))
+            self.report_table.setItem(row, 4, QTableWidgetItem(data['jam_masuk_lembur'] or "-"))
+            self.report_table.setItem(row, 5, QTableWidgetItem(data['jam_keluar_lembur'] or "-"))
+            
+            # Populate calculated data with new format "X jam Y menit"
+            jam_kerja_total_text = format_time_duration(metrics['jam_kerja_total'])
+            if report_row['day_of_week'] == 6:  # Sunday - only work duration
+                self.report_table.setItem(row, 6, QTableWidgetItem(jam_kerja_total_text))
+                self.report_table.setItem(row, 7, QTableWidgetItem("-"))  # No lembur on Sunday
+                self.report_table.setItem(row, 8, QTableWidgetItem("-"))  # No loyalitas on Sunday
+                self.report_table.setItem(row, 9, QTableWidgetItem("-"))  # No overtime on Sunday
+                self.report_table.setItem(row, 10, QTableWidgetItem("-"))  # No lateness on Sunday
+            else:
+                loyalitas = metrics['loyalitas']
+                overtime = metrics['overtime']
+                jam_lembur_text = format_time_duration(metrics['jam_lembur'])
+                loyalitas_text = format_time_duration(loyalitas / 60, "menit_only") if loyalitas > 0 else "-"  # loyalitas is in minutes
+                overtime_text = format_time_duration(overtime) if overtime > 0 else "-"  # overtime in hours
+                terlambat_text = format_time_duration(metrics['terlambat'] / 60, "menit_only")  # terlambat is in minutes
+                
+                self.report_table.setItem(row, 6, QTableWidgetItem(jam_kerja_total_text))  # Total jam kerja
+                self.report_table.setItem(row, 7, QTableWidgetItem(jam_lembur_text))
+                self.report_table.setItem(row, 8, QTableWidgetItem(loyalitas_text))
+                self.report_table.setItem(row, 9, QTableWidgetItem(overtime_text))
+                self.report_table.setItem(row, 10, QTableWidgetItem(terlambat_text))
+            
+            # Status
+            status_item = QTableWidgetItem(report_row['status'])
+            if report_row['has_leaves']:
+                status_item.setBackground(QColor(200, 255, 200))  # Light green background
+            self.report_table.setItem(row, 11, status_item)
+            
+            # Kolom Pelanggaran - setiap pelanggaran dalam baris terpisah (newline)
+            # "12:30:00-23:00:00 Tidur\n14:30:00-15:00:00 makan"
+            pelanggaran = "\n".join(
+                f"{violation['start_time']}-{violation['end_time']} {violation['description']}"
+                for violation in report_row['violations']
+            ) or "-"
+            
+            # Set keterangan dengan word wrap untuk text panjang
+            keterangan = report_row['keterangan']
+            keterangan_item = QTableWidgetItem(keterangan)
+            keterangan_item.setToolTip(keterangan)  # Tooltip untuk text panjang
+            self.report_table.setItem(row, 12, keterangan_item)
+            
+            # Set pelanggaran dengan word wrap untuk text panjang
+            pelanggaran_item = QTableWidgetItem(pelanggaran)
+            pelanggaran_item.setToolTip(pelanggaran)  # Tooltip untuk text panjang
+            if pelanggaran != "-":
+                pelanggaran_item.setForeground(QColor(255, 0, 0))  # Warna merah untuk pelanggaran
+            self.report_table.setItem(row, 13, pelanggaran_item)
+        
+        # Update summary with new format including loyalitas
+        # Format totals using the new time format
+        total_kerja_text = format_time_duration(totals['jam_kerja'])
+        total_lembur_text = format_time_duration(totals['jam_lembur'])
+        total_loyalitas_text = format_time_duration(totals['loyalitas'] / 60, "menit_only") if totals['loyalitas'] > 0 else "0 menit"  # loyalitas is in minutes
+        total_overtime_text = format_time_duration(totals['overtime']) if totals['overtime'] > 0 else "0 jam"  # overtime in hours
+        total_terlambat_text = format_time_duration(totals['terlambat'] / 60, "menit_only")  # terlambat is in minutes
+        
+        summary_text = (f"Laporan: {employee_name} | "
+                       f"Total Kerja: {total_kerja_text} | "
+                       f"Total Lembur: {total_lembur_text} | "
+                       f"Total Loyalitas: {total_loyalitas_text} | "
+                       f"Total Overtime: {total_overtime_text} | "
+                       f"Total Terlambat: {total_terlambat_text}")
+        
+        self.summary_label.setText(summary_text)
+        
+        # Enable export button after successful report generation
+        self.export_btn.setEnabled(True)
+    
+    def export_to_excel(self):
+        """Export laporan ke file Excel dengan tanggal lengkap termasuk hari kosong"""
+        if self.report_table.rowCount() == 0:
+            QMessageBox.warning(self, "Warning", "Tidak ada data untuk diekspor. Generate laporan terlebih dahulu.")
+            return
+        
+        # Get file path from user
+        employee_name = self.employee_combo.currentText()
+        employee_id = self.employee_combo.currentData()
+        start_date = self.start_date.date().toString("yyyy-MM-dd")
+        end_date = self.end_date.date().toString("yyyy-MM-dd")
+        
+        default_filename = f"Laporan_Absensi_{employee_name}_{start_date}_to_{end_date}.xlsx"
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Laporan ke Excel", default_filename, "Excel Files (*.xlsx)"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            export_employee_report_xlsx(self.db_manager, file_path, employee_id, employee_name, start_date, end_date)
+            
+            QMessageBox.information(
+                self, "Export Berhasil", 
+                f"Laporan berhasil diekspor ke:\n{file_path}"
+            )
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal mengekspor laporan:\n{str(e)}")
+
+
+class LaporanKaryawanSatuanDialog(QDialog):
+    """Dialog untuk laporan karyawan satuan menggunakan ReportTab yang sudah ada"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("📊 Laporan Karyawan Satuan")
+        self.setModal(True)
+        self.resize(1000, 700)
+        
+        layout = QVBoxLayout()
+        
+        # Embed existing ReportTab
+        self.report_tab = ReportTab(db_manager)
+        layout.addWidget(self.report_tab)
+        
+        # Close button
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        close_layout = QHBoxLayout()
+        close_layout.addStretch()
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+        
+        self.setLayout(layout)
@@ -0,0 +1,546 @@
+"""Laporan kehadiran (masuk) semua karyawan dalam bentuk matrix tanggal"""
+
+from datetime import datetime
+
+from PySide6.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                               QPushButton, QLabel, QFileDialog, QMessageBox, QDialog,
+                               QScrollArea, QProgressBar)
+from PySide6.QtCore import Qt, QDate
+from PySide6.QtGui import QFont, QColor
+
+from widgets import IndonesianDateEdit
+from report_calc import (LeaveCalendar, attendance_presence, build_attendance_matrix, date_range,
+                         load_attendance_range)
+from report_export import export_attendance_matrix_xlsx
+from profiling import profiled
+
+class LaporanMasukSemuaDialog(QDialog):
+    """Dialog untuk laporan masuk semua karyawan"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("👥 Laporan Masuk Semua Karyawan")
+        self.setModal(True)
+        self.resize(1400, 900)
+        
+        # Data storage
+        self.attendance_data = {}
+        self.employees = []
+        self.date_range = []
+        self.leave_calendar = LeaveCalendar()
+        self.watermark = 0
+        self.data_version = None
+        
+        layout = QVBoxLayout()
+        
+        # Header
+        header = QLabel("📊 LAPORAN KEHADIRAN SEMUA KARYAWAN")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("""
+            QLabel {
+                font-size: 20px;
+                font-weight: bold;
+                padding: 15px;
+                background-color: #f8f9fa;
+                border: 2px solid #dee2e6;
+                border-radius: 8px;
+                color: #495057;
+            }
+        """)
+        layout.addWidget(header)
+        
+        # Controls
+        controls_layout = QHBoxLayout()
+        
+        controls_layout.addWidget(QLabel("Dari Tanggal:"))
+        self.start_date = IndonesianDateEdit()
+        self.start_date.setDate(QDate.currentDate().addDays(-30))
+        controls_layout.addWidget(self.start_date)
+        
+        controls_layout.addWidget(QLabel("Sampai Tanggal:"))
+        self.end_date = IndonesianDateEdit()
+        self.end_date.setDate(QDate.currentDate())
+        controls_layout.addWidget(self.end_date)
+        
+        generate_btn = QPushButton("🔄 Generate Laporan")
+        generate_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #007bff;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 10px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #0056b3;
+            }
+        """)
+        generate_btn.clicked.connect(self.generate_report)
+        controls_layout.addWidget(generate_btn)
+        
+        self.export_btn = QPushButton("📊 Export Excel")
+        self.export_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #28a745;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 10px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #1e7e34;
+            }
+        """)
+        self.export_btn.clicked.connect(self.export_excel)
+        self.export_btn.setEnabled(False)
+        controls_layout.addWidget(self.export_btn)
+        
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+        
+        # Progress bar (hidden by default)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        # Table with scroll area
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        
+        self.table = QTableWidget()
+        self.table.setAlternatingRowColors(True)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(False)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                gridline-color: #dee2e6;
+                background-color: white;
+            }
+            QTableWidget::item {
+                padding: 8px;
+                text-align: center;
+            }
+            QHeaderView::section {
+                background-color: #f8f9fa;
+                padding: 8px;
+                border: 1px solid #dee2e6;
+                font-weight: bold;
+            }
+        """)
+        
+        scroll_area.setWidget(self.table)
+        layout.addWidget(scroll_area)
+        
+        # Legend
+        legend_layout = QHBoxLayout()
+        legend_label = QLabel("KETERANGAN: ✅ = Hadir lengkap  |  ⚠️ (orange) = Hadir tidak lengkap  |  📧 (hijau) = Karyawan izin  |  (kosong) = Tidak hadir  |  (merah) = Hari Minggu")
+        legend_label.setStyleSheet("""
+            QLabel {
+                font-size: 12px;
+                padding: 8px;
+                background-color: #e9ecef;
+                border-radius: 5px;
+                color: #495057;
+            }
+        """)
+        legend_layout.addWidget(legend_label)
+        layout.addLayout(legend_layout)
+        
+        # Close button
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        close_layout = QHBoxLayout()
+        close_layout.addStretch()
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+        
+        self.setLayout(layout)
+    
+    def validate_date_range(self):
+        """Validasi range tanggal"""
+        start = self.start_date.date().toPython()
+        end = self.end_date.date().toPython()
+        
+        if start > end:
+            QMessageBox.warning(self, "Error", "Tanggal mulai tidak boleh lebih besar dari tanggal akhir!")
+            return False
+        
+        # Check maksimal 3 bulan
+        max_days = 90
+        days_diff = (end - start).days + 1
+        
+        if days_diff > max_days:
+            QMessageBox.warning(self, "Error", f"Range tanggal maksimal {max_days} hari!\nRange yang dipilih: {days_diff} hari")
+            return False
+        
+        return True
+    
+    def generate_report(self):
+        """Generate laporan masuk semua karyawan (inkremental jika matrix sudah dimuat)"""
+        if not self.validate_date_range():
+            return
+        
+        # Show loading
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        QApplication.processEvents()
+        
+        try:
+            # Get date range
+            start_date = self.start_date.date().toPython()
+            end_date = self.end_date.date().toPython()
+            
+            changes = self.refresh_matrix(start_date, end_date)
+            if changes is None:
+                self.load_matrix(start_date, end_date)
+                detail = ""
+            else:
+                detail = f"\nDiperbarui: {changes[0]} tanggal baru, {changes[1]} sel berubah"
+            
+            # Enable export button
+            self.export_btn.setEnabled(True)
+            
+            QMessageBox.information(self, "Success", f"Laporan berhasil dibuat!\nPeriode: {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}\nTotal: {len(self.employees)} karyawan, {len(self.date_range)} hari{detail}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal membuat laporan: {str(e)}")
+        finally:
+            # Hide loading
+            self.progress_bar.setVisible(False)
+    
+    def refresh_loaded_report(self):
+        """Terapkan perubahan database ke matrix yang sudah dimuat (dipakai saat dialog dibuka lagi)"""
+        if not self.date_range:
+            return
+        try:
+            if self.refresh_matrix(self.date_range[0], self.date_range[-1]) is None:
+                self.load_matrix(self.date_range[0], self.date_range[-1])
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal memperbarui laporan: {str(e)}")
+    
+    def load_matrix(self, start_date, end_date):
+        """Muat ulang seluruh matrix dari database"""
+        # Watermark diambil sebelum membaca data agar perubahan di sela-selanya ikut di refresh berikutnya
+        data_version = self.db_manager.get_data_version()
+        watermark = self.db_manager.get_change_watermark()
+        
+        # Employees (sorted alphabetically), date range and attendance per employee per date
+        self.employees, self.date_range, self.attendance_data = build_attendance_matrix(
+            self.db_manager, start_date, end_date
+        )
+        self.leave_calendar = LeaveCalendar(self.db_manager, start_date, end_date)
+        self.watermark = watermark
+        self.data_version = data_version
+        
+        # Populate table
+        self.populate_attendance_matrix()
+    
+    @profiled("ui.laporan_kehadiran.refresh")
+    def refresh_matrix(self, start_date, end_date):
+        """Perbarui matrix yang sudah dimuat: hanya tanggal baru dan sel yang berubah sejak watermark
+        
+        Returns:
+            (jumlah tanggal baru, jumlah sel berubah), atau None jika matrix harus dimuat ulang penuh
+            (belum ada data, periode tidak beririsan, daftar karyawan berubah, atau log perubahan terpotong)
+        """
+        if not self.date_range or start_date > self.date_range[-1] or end_date < self.date_range[0]:
+            return None
+        
+        data_version = self.db_manager.get_data_version()
+        if data_version == self.data_version:
+            # Tidak ada tulis sama sekali sejak dimuat
+            if (start_date, end_date) == (self.date_range[0], self.date_range[-1]):
+                return 0, 0
+            watermark, changed = self.watermark, set()
+        else:
+            employees = sorted(self.db_manager.get_all_employees(), key=lambda x: x['name'])
+            if [(e['id'], e['name']) for e in employees] != [(e['id'], e['name']) for e in self.employees]:
+                return None
+            
+            watermark = self.db_manager.get_change_watermark()
+            changed = self.db_manager.get_changed_cells(
+                self.watermark, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+            )
+            if changed is None:
+                return None
+        
+        old_first, old_last = self.date_range[0], self.date_range[-1]
+        dates = date_range(start_date, end_date)
+        dates_before = [date for date in dates if date < old_first]
+        dates_after = [date for date in dates if date > old_last]
+        
+        # Tanggal baru: satu query per sisi periode lama
+        for new_dates in (dates_before, dates_after):
+            if new_dates:
+                loaded = load_attendance_range(self.db_manager, new_dates[0], new_dates[-1])
+                for employee_id, records in loaded.items():
+                    if employee_id in self.attendance_data:
+                        self.attendance_data[employee_id].update(records)
+                self.leave_calendar.load(self.db_manager, new_dates[0], new_dates[-1])
+        
+        # Sel lama yang berubah: dibaca ulang hanya untuk karyawan dan rentang tanggal yang terdampak
+        old_date_strs = {date.strftime('%Y-%m-%d') for date in self.date_range}
+        stale = {(employee_id, date_str) for employee_id, date_str in changed
+                 if date_str in old_date_strs and employee_id in self.attendance_data}
+        if stale:
+            stale_dates = sorted(date_str for _, date_str in stale)
+            loaded = load_attendance_range(
+                self.db_manager,
+                datetime.strptime(stale_dates[0], '%Y-%m-%d').date(),
+                datetime.strptime(stale_dates[-1], '%Y-%m-%d').date(),
+                {employee_id for employee_id, _ in stale}
+            )
+            for employee_id, date_str in stale:
+                record = loaded.get(employee_id, {}).get(date_str)
+                if record:
+                    self.attendance_data[employee_id][date_str] = record
+                else:
+                    self.attendance_data[employee_id].pop(date_str, None)
+            self.leave_calendar.load(self.db_manager, stale_dates[0], stale_dates[-1],
+                                     {employee_id for employee_id, _ in stale})
+        
+        # Buang data dan kolom tanggal yang keluar dari periode
+        removed_cols = [col for col, date in enumerate(self.date_range, 1) if date < start_date or date > end_date]
+        removed_strs = {self.date_range[col - 1].strftime('%Y-%m-%d') for col in removed_cols}
+        for col in reversed(removed_cols):
+            self.table.removeColumn(col)
+        if removed_strs:
+            for records in self.attendance_data.values():
+                for date_str in removed_strs:
+                    records.pop(date_str, None)
+            self.leave_calendar.drop_dates(removed_strs)
+        
+        # Kolom tanggal baru disisipkan di awal/akhir, sebelum kolom total
+        for _ in dates_before:
+            self.table.insertColumn(1)
+        kept = len(self.date_range) - len(removed_cols)
+        for _ in dates_after:
+            self.table.insertColumn(1 + len(dates_before) + kept)
+        
+        self.date_range = dates
+        self.watermark = watermark
+        self.data_version = data_version
+        self.table.setHorizontalHeaderLabels(self.matrix_headers())
+        
+        rows = {employee['id']: row for row, employee in enumerate(self.employees)}
+        new_cols = list(range(1, 1 + len(dates_before))) + \
+            list(range(1 + len(dates_before) + kept, 1 + len(dates)))
+        for col in new_cols:
+            for row, employee in enumerate(self.employees):
+                self.fill_cell(row, col, employee['id'], dates[col - 1])
+            self.table.setColumnWidth(col, 80)
+        
+        for employee_id, date_str in stale:
+            date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            if start_date <= date <= end_date:
+                self.fill_cell(rows[employee_id], (date - start_date).days + 1, employee_id, date)
+        
+        self.update_totals()
+        return len(new_cols), len(stale)
+    
+    def matrix_headers(self):
+        """Header kolom: nama, tanggal dengan nama hari, total"""
+        day_names = ["Sen", "Sel", "Rab", "Kam", "Jum", "Sab", "Min"]
+        headers = ["Nama Karyawan"]
+        headers.extend(f"{day_names[date.weekday()]}, {date.strftime('%d/%m')}" for date in self.date_range)
+        headers.append("Total Hadir")
+        return headers
+    
+    def leave_count(self, employee_id, date_str):
+        """Jumlah izin karyawan pada tanggal (dari LeaveCalendar periode yang dimuat)"""
+        return self.leave_calendar.count(employee_id, date_str)
+    
+    def fill_cell(self, row, col, employee_id, date):
+        """Isi satu sel matrix dari data absensi dan izin"""
+        date_str = date.strftime('%Y-%m-%d')
+        attendance = self.attendance_data[employee_id].get(date_str)
+        
+        item = QTableWidgetItem()
+        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+        item.setTextAlignment(Qt.AlignCenter)
+        
+        # Check for leaves first
+        leave_count = self.leave_count(employee_id, date_str)
+        
+        if leave_count:
+            # Employee has leave - green background with envelope symbol
+            if leave_count > 1:
+                item.setText(f"📧 ({leave_count})")
+            else:
+                item.setText("📧")
+            item.setBackground(QColor(200, 255, 200))  # Light green background
+        elif attendance:
+            # Check if data is complete
+            has_masuk, has_keluar = attendance_presence(attendance)
+            
+            if has_masuk and has_keluar:
+                # Complete data - checkmark
+                item.setText("✅")
+                # Check if Sunday for background color
+                if date.weekday() == 6:  # Sunday
+                    item.setBackground(QColor(255, 200, 200))  # Light red for Sunday
+                else:
+                    item.setBackground(QColor(255, 255, 255))  # White background
+            elif has_masuk or has_keluar:
+                # Incomplete data - error symbol with orange background
+                item.setText("⚠️")
+                if date.weekday() == 6:  # Sunday
+                    item.setBackground(QColor(255, 150, 150))  # Darker red for Sunday + incomplete
+                else:
+                    item.setBackground(QColor(255, 140, 0))  # Darker orange background for better visibility
+            else:
+                # No attendance data
+                item.setText("")
+                if date.weekday() == 6:  # Sunday
+                    item.setBackground(QColor(255, 200, 200))  # Light red for Sunday
+                else:
+                    item.setBackground(QColor(255, 255, 255))
+        else:
+            # No attendance record and no leave
+            item.setText("")
+            # Highlight Sundays in red
+            if date.weekday() == 6:  # Sunday
+                item.setBackground(QColor(255, 200, 200))  # Light red
+            else:
+                item.setBackground(QColor(255, 255, 255))
+        
+        self.table.setItem(row, col, item)
+    
+    def update_totals(self):
+        """Hitung ulang kolom total per karyawan dan baris total per tanggal dari data yang sudah dimuat"""
+        total_col = len(self.date_range) + 1
+        
+        for row, employee in enumerate(self.employees):
+            # Izin dihitung hadir
+            total_present = 0
+            for date in self.date_range:
+                date_str = date.strftime('%Y-%m-%d')
+                has_masuk, has_keluar = attendance_presence(self.attendance_data[employee['id']].get(date_str))
+                if self.leave_count(employee['id'], date_str) or has_masuk or has_keluar:
+                    total_present += 1
+            
+            total_item = QTableWidgetItem(str(total_present))
+            total_item.setFlags(total_item.flags() & ~Qt.ItemIsEditable)
+            total_item.setTextAlignment(Qt.AlignCenter)
+            total_item.setBackground(QColor(240, 248, 255))  # Light blue
+            self.table.setItem(row, total_col, total_item)
+        
+        # Summary row (total employees present per date)
+        summary_row = len(self.employees)
+        
+        # Summary row label
+        summary_label = QTableWidgetItem("TOTAL HADIR")
+        summary_label.setFlags(summary_label.flags() & ~Qt.ItemIsEditable)
+        summary_label.setBackground(QColor(240, 248, 255))
+        summary_label.setFont(QFont("", 0, QFont.Bold))
+        self.table.setItem(summary_row, 0, summary_label)
+        
+        # Calculate totals per date
+        for col, date in enumerate(self.date_range, 1):
+            date_str = date.strftime('%Y-%m-%d')
+            total_present_on_date = 0
+            
+            for employee in self.employees:
+                has_masuk, has_keluar = attendance_presence(self.attendance_data[employee['id']].get(date_str))
+                if has_masuk or has_keluar:
+                    total_present_on_date += 1
+            
+            total_item = QTableWidgetItem(str(total_present_on_date))
+            total_item.setFlags(total_item.flags() & ~Qt.ItemIsEditable)
+            total_item.setTextAlignment(Qt.AlignCenter)
+            total_item.setBackground(QColor(240, 248, 255))
+            total_item.setFont(QFont("", 0, QFont.Bold))
+            
+            # Highlight Sundays in summary row too
+            if date.weekday() == 6:  # Sunday
+                total_item.setBackground(QColor(255, 200, 200))
+            
+            self.table.setItem(summary_row, col, total_item)
+        
+        # Grand total (not really meaningful, so leave empty)
+        grand_total_item = QTableWidgetItem("")
+        grand_total_item.setFlags(grand_total_item.flags() & ~Qt.ItemIsEditable)
+        grand_total_item.setBackground(QColor(240, 248, 255))
+        self.table.setItem(summary_row, total_col, grand_total_item)
+    
+    @profiled("ui.laporan_kehadiran.populate")
+    def populate_attendance_matrix(self):
+        """Populate tabel matrix kehadiran"""
+        if not self.employees or not self.date_range:
+            return
+        
+        # Setup table dimensions
+        # Columns: Nama + Tanggal + Summary
+        # Rows: Employees + Summary row
+        num_cols = 1 + len(self.date_range) + 1  # Nama + dates + summary
+        num_rows = len(self.employees) + 1  # employees + summary row
+        
+        self.table.setRowCount(num_rows)
+        self.table.setColumnCount(num_cols)
+        self.table.setHorizontalHeaderLabels(self.matrix_headers())
+        
+        # Populate employee rows
+        for row, employee in enumerate(self.employees):
+            # Employee name
+            name_item = QTableWidgetItem(employee['name'])
+            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+            self.table.setItem(row, 0, name_item)
+            
+            # Attendance data for each date
+            for col, date in enumerate(self.date_range, 1):
+                self.fill_cell(row, col, employee['id'], date)
+        
+        self.update_totals()
+        
+        # Adjust column widths
+        self.table.setColumnWidth(0, 200)  # Name column wider
+        for i in range(1, len(self.date_range) + 1):
+            self.table.setColumnWidth(i, 80)  # Date columns
+        self.table.setColumnWidth(len(self.date_range) + 1, 100)  # Total column
+    
+    def export_excel(self):
+        """Export laporan ke Excel"""
+        if not self.attendance_data:
+            QMessageBox.warning(self, "Warning", "Tidak ada data untuk di-export. Generate laporan terlebih dahulu!")
+            return
+        
+        # Get file path
+        start_date = self.start_date.date().toPython()
+        end_date = self.end_date.date().toPython()
+        default_filename = f"Laporan_Kehadiran_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.xlsx"
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, 
+            "Export Laporan Kehadiran", 
+            default_filename,
+            "Excel Files (*.xlsx)"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            # Show loading
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setRange(0, 100)
+            
+            export_attendance_matrix_xlsx(
+                self.db_manager, file_path, self.employees, self.date_range, self.attendance_data,
+                progress=self.update_progress
+            )
+            
+            QMessageBox.information(self, "Success", f"Laporan berhasil di-export ke:\n{file_path}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal export ke Excel: {str(e)}")
+        finally:
+            self.progress_bar.setVisible(False)
+    
+    def update_progress(self, value):
+        """Update progress bar dari proses export"""
+        self.progress_bar.setValue(value)
+        QApplication.processEvents()
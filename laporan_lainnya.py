@@ -0,0 +1,105 @@
+"""Laporan yang belum tersedia (overtime, bulanan, kinerja)"""
+
+from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QDialog
+from PySide6.QtCore import Qt
+
+class LaporanOvertimeSemuaDialog(QDialog):
+    """Dialog untuk laporan overtime semua karyawan"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("📈 Laporan Overtime Semua Karyawan")
+        self.setModal(True)
+        self.resize(1200, 800)
+        
+        layout = QVBoxLayout()
+        
+        # Header
+        header = QLabel("📈 LAPORAN OVERTIME & LOYALITAS")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("font-size: 18px; font-weight: bold; padding: 10px; color: #f39c12;")
+        layout.addWidget(header)
+        
+        # Placeholder content
+        content = QLabel("Fitur laporan overtime semua karyawan akan segera ditambahkan.\n\nFitur ini akan menampilkan:\n• Total overtime per karyawan\n• Total loyalitas per karyawan\n• Ranking karyawan berdasarkan overtime\n• Grafik trend overtime bulanan")
+        content.setAlignment(Qt.AlignCenter)
+        content.setStyleSheet("font-size: 14px; padding: 50px;")
+        layout.addWidget(content)
+        
+        # Close button
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        close_layout = QHBoxLayout()
+        close_layout.addStretch()
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+        
+        self.setLayout(layout)
+
+
+class LaporanBulananDialog(QDialog):
+    """Dialog untuk laporan bulanan"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("📅 Laporan Bulanan Rekap Absensi")
+        self.setModal(True)
+        self.resize(1200, 800)
+        
+        layout = QVBoxLayout()
+        
+        # Header
+        header = QLabel("📅 REKAP ABSENSI BULANAN")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("font-size: 18px; font-weight: bold; padding: 10px; color: #9b59b6;")
+        layout.addWidget(header)
+        
+        # Placeholder content
+        content = QLabel("Fitur laporan bulanan akan segera ditambahkan.\n\nFitur ini akan menampilkan:\n• Rekap kehadiran per bulan\n• Statistik keterlambatan\n• Total jam kerja dan overtime\n• Persentase kehadiran\n• Grafik trend bulanan")
+        content.setAlignment(Qt.AlignCenter)
+        content.setStyleSheet("font-size: 14px; padding: 50px;")
+        layout.addWidget(content)
+        
+        # Close button
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        close_layout = QHBoxLayout()
+        close_layout.addStretch()
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+        
+        self.setLayout(layout)
+
+
+class LaporanKinerjaDialog(QDialog):
+    """Dialog untuk laporan kinerja kehadiran"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("🏆 Laporan Kinerja Kehadiran")
+        self.setModal(True)
+        self.resize(1200, 800)
+        
+        layout = QVBoxLayout()
+        
+        # Header
+        header = QLabel("🏆 ANALISIS KINERJA KEHADIRAN")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("font-size: 18px; font-weight: bold; padding: 10px; color: #1abc9c;")
+        layout.addWidget(header)
+        
+        # Placeholder content
+        content = QLabel("Fitur laporan kinerja akan segera ditambahkan.\n\nFitur ini akan menampilkan:\n• Ranking karyawan terbaik\n• Skor kehadiran per karyawan\n• Analisis pola keterlambatan\n• Rekomendasi perbaikan\n• Dashboard kinerja visual")
+        content.setAlignment(Qt.AlignCenter)
+        content.setStyleSheet("font-size: 14px; padding: 50px;")
+        layout.addWidget(content)
+        
+        # Close button
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        close_layout = QHBoxLayout()
+        close_layout.addStretch()
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+        
+        self.setLayout(layout)
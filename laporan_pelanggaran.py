@@ -0,0 +1,388 @@
+"""Laporan pelanggaran semua karyawan"""
+
+from PySide6.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                               QPushButton, QLabel, QFileDialog, QMessageBox, QDialog,
+                               QScrollArea)
+from PySide6.QtCore import Qt, QDate
+from PySide6.QtGui import QFont, QColor
+
+from widgets import BusySpinner, IndonesianDateEdit
+from db_worker import DatabaseWorker
+from report_calc import build_violation_report, format_duration
+from report_export import export_violation_report_xlsx
+from profiling import profiled
+
+class LaporanPelanggaranSemuaDialog(QDialog):
+    """Dialog untuk laporan pelanggaran semua karyawan"""
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("⚠️ Laporan Pelanggaran Semua Karyawan")
+        self.setModal(True)
+        self.resize(1400, 900)
+        
+        # Data storage
+        self.violation_data = {}
+        self.employees = []
+        
+        layout = QVBoxLayout()
+        
+        # Header
+        header = QLabel("⚠️ LAPORAN PELANGGARAN & KETERLAMBATAN SEMUA KARYAWAN")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("""
+            QLabel {
+                font-size: 20px;
+                font-weight: bold;
+                padding: 15px;
+                background-color: #ffebee;
+                border: 2px solid #e74c3c;
+                border-radius: 8px;
+                color: #c62828;
+            }
+        """)
+        layout.addWidget(header)
+        
+        # Controls
+        controls_layout = QHBoxLayout()
+        
+        controls_layout.addWidget(QLabel("Dari Tanggal:"))
+        self.start_date = IndonesianDateEdit()
+        self.start_date.setDate(QDate.currentDate().addDays(-30))
+        controls_layout.addWidget(self.start_date)
+        
+        controls_layout.addWidget(QLabel("Sampai Tanggal:"))
+        self.end_date = IndonesianDateEdit()
+        self.end_date.setDate(QDate.currentDate())
+        controls_layout.addWidget(self.end_date)
+        
+        self.generate_btn = QPushButton("🔄 Generate Laporan")
+        self.generate_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #e74c3c;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 10px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #c0392b;
+            }
+        """)
+        self.generate_btn.clicked.connect(self.generate_report)
+        controls_layout.addWidget(self.generate_btn)
+        
+        self.export_btn = QPushButton("📊 Export Excel")
+        self.export_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #28a745;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                padding: 10px 20px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #1e7e34;
+            }
+        """)
+        self.export_btn.clicked.connect(self.export_excel)
+        self.export_btn.setEnabled(False)
+        controls_layout.addWidget(self.export_btn)
+        
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+        
+        # Indikator loading selama data diambil di thread DB
+        self.spinner = BusySpinner()
+        layout.addWidget(self.spinner)
+        
+        # Table with scroll area
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        
+        self.table = QTableWidget()
+        self.table.setAlternatingRowColors(True)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(False)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                gridline-color: #dee2e6;
+                background-color: white;
+            }
+            QTableWidget::item {
+                padding: 8px;
+                text-align: left;
+            }
+            QHeaderView::section {
+                background-color: #f8f9fa;
+                padding: 8px;
+                border: 1px solid #dee2e6;
+                font-weight: bold;
+            }
+        """)
+        
+        scroll_area.setWidget(self.table)
+        layout.addWidget(scroll_area)
+        
+        # Summary info
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("""
+            QLabel {
+                font-size: 12px;
+                padding: 8px;
+                background-color: #e9ecef;
+                border-radius: 5px;
+                color: #495057;
+            }
+        """)
+        layout.addWidget(self.summary_label)
+        
+        # Close button
+        close_btn = QPushButton("Tutup")
+        close_btn.clicked.connect(self.close)
+        close_layout = QHBoxLayout()
+        close_layout.addStretch()
+        close_layout.addWidget(close_btn)
+        layout.addLayout(close_layout)
+        
+        self.setLayout(layout)
+    
+    def validate_date_range(self):
+        """Validasi range tanggal"""
+        start = self.start_date.date().toPython()
+        end = self.end_date.date().toPython()
+        
+        if start > end:
+            QMessageBox.warning(self, "Error", "Tanggal mulai tidak boleh lebih besar dari tanggal akhir!")
+            return False
+        
+        # Check maksimal 3 bulan
+        max_days = 90
+        days_diff = (end - start).days + 1
+        
+        if days_diff > max_days:
+            QMessageBox.warning(self, "Error", f"Range tanggal maksimal {max_days} hari!\nRange yang dipilih: {days_diff} hari")
+            return False
+        
+        return True
+    
+    def generate_report(self):
+        """Generate laporan pelanggaran semua karyawan"""
+        if not self.validate_date_range():
+            return
+        
+        start_date = self.start_date.date().toPython()
+        end_date = self.end_date.date().toPython()
+        
+        # Data diambil di thread DB; tabel diisi saat hasil datang tanpa membekukan dialog
+        self.generate_btn.setEnabled(False)
+        self.spinner.start("Memuat data pelanggaran...")
+        DatabaseWorker.for_manager(self.db_manager).call(
+            build_violation_report, start_date, end_date,
+            on_result=lambda result: self.on_report_loaded(start_date, end_date, result),
+            on_error=self.on_report_failed,
+            owner=self
+        )
+    
+    def on_report_loaded(self, start_date, end_date, result):
+        self.spinner.stop()
+        self.generate_btn.setEnabled(True)
+        
+        try:
+            # Get violation data for all employees in date range (sorted alphabetically)
+            self.employees, self.violation_data = result
+            total_violations = sum(emp_data['total_violations'] for emp_data in self.violation_data.values())
+            total_violation_time = sum(emp_data['total_time_minutes'] for emp_data in self.violation_data.values())
+            
+            # Populate table
+            self.populate_violation_table()
+            
+            # Update summary
+            total_time_text = format_duration(total_violation_time)
+            employees_with_violations = sum(1 for emp_data in self.violation_data.values() if emp_data['violations'])
+            
+            self.summary_label.setText(
+                f"RINGKASAN: {employees_with_violations} karyawan memiliki pelanggaran | "
+                f"Total {total_violations} pelanggaran | "
+                f"Total waktu pelanggaran: {total_time_text} | "
+                f"Periode: {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}"
+            )
+            
+            # Enable export button
+            self.export_btn.setEnabled(True)
+            
+            if total_violations == 0:
+                QMessageBox.information(self, "Info", "Tidak ada pelanggaran ditemukan dalam periode yang dipilih.")
+            else:
+                QMessageBox.information(self, "Success", 
+                    f"Laporan berhasil dibuat!\n"
+                    f"Periode: {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}\n"
+                    f"Total: {employees_with_violations} karyawan dengan pelanggaran\n"
+                    f"Total pelanggaran: {total_violations}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal membuat laporan: {str(e)}")
+    
+    def on_report_failed(self, error):
+        self.spinner.stop()
+        self.generate_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Gagal membuat laporan: {str(error)}")
+    
+    @profiled("ui.laporan_pelanggaran.populate")
+    def populate_violation_table(self):
+        """Populate tabel dengan format yang mudah dibaca berdasarkan karyawan"""
+        if not self.violation_data:
+            return
+        
+        # Setup table columns - format seperti pada gambar
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels([
+            "NAMA", "TANGGAL", "HARI", "RENTANG WAKTU", "DURASI", "NOTE"
+        ])
+        
+        # Calculate total rows needed
+        total_rows = 0
+        for emp_data in self.violation_data.values():
+            if emp_data['violations']:
+                total_rows += len(emp_data['violations'])  # Only violation rows
+        
+        # If no violations, show empty state
+        if total_rows == 0:
+            self.table.setRowCount(1)
+            no_data_item = QTableWidgetItem("Tidak ada pelanggaran dalam periode yang dipilih")
+            no_data_item.setTextAlignment(Qt.AlignCenter)
+            no_data_item.setFont(QFont("", 0, QFont.Bold))
+            no_data_item.setBackground(QColor(255, 248, 220))  # Light yellow
+            self.table.setItem(0, 0, no_data_item)
+            
+            # Merge cells for the message
+            self.table.setSpan(0, 0, 1, 6)
+            return
+        
+        self.table.setRowCount(total_rows)
+        current_row = 0
+        
+        # Populate data - group by employee
+        for employee in self.employees:
+            emp_data = self.violation_data[employee['id']]
+            
+            if not emp_data['violations']:
+                continue  # Skip employees without violations
+            
+            # Sort violations by date
+            violations_sorted = sorted(emp_data['violations'], key=lambda x: x['date'])
+            
+            for i, violation in enumerate(violations_sorted):
+                # Employee name (only on first row for each employee)
+                if i == 0:
+                    name_item = QTableWidgetItem(emp_data['name'].upper())
+                    name_item.setFont(QFont("", 0, QFont.Bold))
+                    name_item.setBackground(QColor(173, 216, 230))  # Light blue like in image
+                    name_item.setTextAlignment(Qt.AlignCenter)
+                    name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+                    self.table.setItem(current_row, 0, name_item)
+                    
+                    # Merge cells for employee name if multiple violations
+                    if len(violations_sorted) > 1:
+                        self.table.setSpan(current_row, 0, len(violations_sorted), 1)
+                else:
+                    # Empty for subsequent rows (handled by span)
+                    pass
+                
+                # Date
+                date_item = QTableWidgetItem(violation['date'])
+                date_item.setTextAlignment(Qt.AlignCenter)
+                date_item.setFlags(date_item.flags() & ~Qt.ItemIsEditable)
+                self.table.setItem(current_row, 1, date_item)
+                
+                # Day of week
+                from datetime import datetime
+                try:
+                    date_obj = datetime.strptime(violation['date'], '%Y-%m-%d')
+                    day_names = ['SEN', 'SEL', 'RAB', 'KAM', 'JUM', 'SAB', 'MIN']
+                    day_name = day_names[date_obj.weekday()]
+                except:
+                    day_name = ""
+                
+                day_item = QTableWidgetItem(day_name)
+                day_item.setTextAlignment(Qt.AlignCenter)
+                day_item.setFlags(day_item.flags() & ~Qt.ItemIsEditable)
+                self.table.setItem(current_row, 2, day_item)
+                
+                # Time range (separate column)
+                time_range = f"{violation['start_time']} - {violation['end_time']}"
+                time_range_item = QTableWidgetItem(time_range)
+                time_range_item.setTextAlignment(Qt.AlignCenter)
+                time_range_item.setFlags(time_range_item.flags() & ~Qt.ItemIsEditable)
+                self.table.setItem(current_row, 3, time_range_item)
+                
+                # Duration (separate column)
+                duration_text = f"{violation['duration_text']}"
+                duration_item = QTableWidgetItem(duration_text)
+                duration_item.setTextAlignment(Qt.AlignCenter)
+                duration_item.setFlags(duration_item.flags() & ~Qt.ItemIsEditable)
+                self.table.setItem(current_row, 4, duration_item)
+                
+                # Note (description)
+                note_item = QTableWidgetItem(violation['description'].upper())
+                note_item.setFlags(note_item.flags() & ~Qt.ItemIsEditable)
+                self.table.setItem(current_row, 5, note_item)
+                
+                current_row += 1
+        
+        # Adjust column widths to match the format in image
+        self.table.setColumnWidth(0, 120)  # NAMA
+        self.table.setColumnWidth(1, 100)  # TANGGAL
+        self.table.setColumnWidth(2, 60)   # HARI
+        self.table.setColumnWidth(3, 150)  # RENTANG WAKTU
+        self.table.setColumnWidth(4, 100)  # DURASI
+        self.table.setColumnWidth(5, 300)  # NOTE
+        
+        # Set row height for better readability
+        for row in range(self.table.rowCount()):
+            self.table.setRowHeight(row, 45)
+    
+    def export_excel(self):
+        """Export laporan pelanggaran ke Excel"""
+        if not self.violation_data:
+            QMessageBox.warning(self, "Warning", "Tidak ada data untuk di-export. Generate laporan terlebih dahulu!")
+            return
+        
+        # Get file path
+        start_date = self.start_date.date().toPython()
+        end_date = self.end_date.date().toPython()
+        default_filename = f"Laporan_Pelanggaran_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.xlsx"
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, 
+            "Export Laporan Pelanggaran", 
+            default_filename,
+            "Excel Files (*.xlsx)"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            self.spinner.start("Export Excel...")
+            
+            export_violation_report_xlsx(
+                file_path, self.employees, self.violation_data, start_date, end_date,
+                progress=self.update_progress
+            )
+            
+            QMessageBox.information(self, "Success", f"Laporan berhasil di-export ke:\n{file_path}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal export ke Excel: {str(e)}")
+        finally:
+            self.spinner.stop()
+    
+    def update_progress(self, value):
+        """Tampilkan persentase proses export di indikator loading"""
+        self.spinner.start(f"Export Excel... {value}%")
+        QApplication.processEvents()
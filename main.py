@@ -5,6 +5,8 @@ import warnings
 import sys
 import contextlib
 
+from profiling import profiled
+
 # --- BAGIAN 1: KONFIGURASI MEMBISUKAN WARNING ---
 @contextlib.contextmanager
 def suppress_output():
@@ -21,7 +23,26 @@ def suppress_output():
 
 warnings.filterwarnings("ignore")
 
+# Label nomor karyawan di mesin absensi, satu baris dengan nama ("Work No" di Grid++Report)
+WORK_NO_LABELS = ["WORK NO", "ENM NO"]
+
 class ExcelProcessor:
+    @staticmethod
+    def _work_no_after(row, label_index):
+        """Nilai Work No di kolom +1 atau +2 dari labelnya, sebagai teks ('7', bukan '7.0'); None jika kosong"""
+        for offset in (1, 2):
+            if label_index + offset >= len(row):
+                break
+            value = row.iloc[label_index + offset]
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            text = str(value).strip()
+            if text.endswith('.0') and text[:-2].isdigit():
+                text = text[:-2]
+            if text and text.lower() not in ['nan', 'none', ':', '=']:
+                return text
+        return None
+
     @staticmethod
     def _extract_from_dataframe(df):
         """
@@ -70,6 +91,13 @@ class ExcelProcessor:
                     # Validasi nama (skip jika tidak valid)
                     if nama_karyawan in ["Unknown", "nan", "None", ""]:
                         continue
+
+                    # Nomor karyawan di mesin (kunci identitas saat import), di kanan labelnya
+                    work_no = None
+                    for label in WORK_NO_LABELS:
+                        if label in row_upper:
+                            work_no = ExcelProcessor._work_no_after(row, row_upper.index(label))
+                            break
                     
                     # --- TAHAP 3: MENGAMBIL JAM (LOGIKA BARU) ---
                     # Data jam ada di baris tepat di bawah nama (i + 1)
@@ -96,6 +124,7 @@ class ExcelProcessor:
                     # --- TAHAP 4: MAPPING JAM KE STRUKTUR (SESUAI REQUEST) ---
                     entry = {
                         "Nama": str(nama_karyawan).strip(),
+                        "Work No": work_no,
                         "Jam Masuk": None,            # Data ke-1
                         "Jam Keluar": None,           # Data ke-2
                         "Jam Masuk Lembur": None,     # Data ke-3
@@ -128,6 +157,7 @@ class ExcelProcessor:
         return results
 
     @staticmethod
+    @profiled("import.process_excel_log")
     def process_excel_log(file_path):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File tidak ditemukan: '{file_path}'")
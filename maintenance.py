@@ -0,0 +1,233 @@
+"""
+Pemeliharaan rutin database: checkpoint WAL, statistik query planner dan vacuum.
+
+Di mode WAL, absensi.db-wal terus membesar jika tidak pernah di-checkpoint
+sampai kosong, dan halaman kosong bekas data yang dihapus tidak pernah
+dikembalikan. run_maintenance menjalankan (urutan tetap):
+
+- analyze    : ANALYZE, statistik indeks untuk query planner (sqlite_stat1)
+- optimize   : PRAGMA optimize
+- vacuum     : hapus change_log lama, lalu PRAGMA incremental_vacuum bertahap
+               VACUUM_STEP halaman; database lama (auto_vacuum=NONE) diubah sekali
+               ke INCREMENTAL lewat VACUUM penuh, tetapi hanya pada pemeliharaan yang
+               dijalankan pengguna (CLI, dialog, arsip): VACUUM penuh memegang lock
+               tulis dan butuh ruang disk ~2x ukuran database, jadi pemeliharaan
+               terjadwal hanya melaporkan needs_conversion
+- checkpoint : PRAGMA wal_checkpoint(TRUNCATE), terakhir agar WAL hasil tugas
+               lain ikut dikosongkan
+
+Ukuran file (database, WAL, halaman kosong) sebelum/sesudah dan query plan +
+waktu eksekusi query utama (PLAN_QUERIES) sebelum/sesudah dicatat di tabel
+maintenance_log. Di aplikasi, MaintenanceScheduler menjalankan run_due saat
+aplikasi menganggur; dari CLI: `python -m absensi maintenance`.
+
+Pengaturan (environment):
+    ABSENSI_MAINTENANCE=0            scheduler di aplikasi dimatikan
+    ABSENSI_MAINTENANCE_HOURS        jarak antar pemeliharaan penuh (default 24)
+    ABSENSI_MAINTENANCE_IDLE_S       lama menganggur sebelum dijalankan (default 120)
+    ABSENSI_WAL_CHECKPOINT_MB        WAL sebesar ini di-checkpoint walau belum waktunya (default 4)
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+ENV_ENABLED = 'ABSENSI_MAINTENANCE'
+ENV_INTERVAL_HOURS = 'ABSENSI_MAINTENANCE_HOURS'
+ENV_IDLE_SECONDS = 'ABSENSI_MAINTENANCE_IDLE_S'
+ENV_WAL_CHECKPOINT_MB = 'ABSENSI_WAL_CHECKPOINT_MB'
+
+TASKS = ('analyze', 'optimize', 'vacuum', 'checkpoint')
+SCHEDULED = 'scheduled'  # reason run_due; tidak pernah menjalankan VACUUM penuh
+VACUUM_STEP = 512  # halaman per PRAGMA incremental_vacuum; lock tulis dilepas di antaranya
+CHANGE_LOG_KEEP_DAYS = 1
+
+INTERVAL_HOURS = float(os.environ.get(ENV_INTERVAL_HOURS, '') or 24)
+IDLE_SECONDS = float(os.environ.get(ENV_IDLE_SECONDS, '') or 120)
+WAL_CHECKPOINT_BYTES = int(float(os.environ.get(ENV_WAL_CHECKPOINT_MB, '') or 4) * 1024 * 1024)
+
+# Query utama aplikasi (bentuk WHERE sama dengan method DatabaseManager terkait)
+PLAN_QUERIES = [
+    ('attendance_by_date_range',
+     "SELECT a.id FROM attendance a JOIN employees e ON e.id = a.employee_id WHERE a.date BETWEEN :start AND :end"),
+    ('attendance_by_employee_period',
+     "SELECT id FROM attendance WHERE employee_id = :employee_id AND date BETWEEN :start AND :end"),
+    ('violations_by_date_range',
+     "SELECT v.id FROM violations v JOIN attendance a ON a.id = v.attendance_id "
+     "JOIN employees e ON e.id = a.employee_id WHERE a.date BETWEEN :start AND :end"),
+    ('violations_by_attendance', "SELECT id FROM violations WHERE attendance_id = :attendance_id"),
+    ('leaves_by_date_range',
+     "SELECT l.id FROM leaves l JOIN employees e ON l.employee_id = e.id WHERE l.date BETWEEN :start AND :end"),
+    ('leaves_by_employee_date', "SELECT id FROM leaves WHERE employee_id = :employee_id AND date = :end"),
+]
+
+
+def is_scheduler_enabled():
+    return os.environ.get(ENV_ENABLED, '1') not in ('0', 'false', 'no', 'off')
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+# ==================== Ukuran & Query Plan ====================
+
+def database_sizes(db_path, conn=None):
+    """Ukuran file database dan WAL (bytes) beserta jumlah halaman dan halaman kosong"""
+    own = conn is None
+    if own:
+        conn = sqlite3.connect(db_path)
+    try:
+        sizes = {
+            'db_size': os.path.getsize(db_path) if os.path.exists(db_path) else 0,
+            'wal_size': os.path.getsize(db_path + '-wal') if os.path.exists(db_path + '-wal') else 0,
+            'page_size': conn.execute("PRAGMA page_size").fetchone()[0],
+            'page_count': conn.execute("PRAGMA page_count").fetchone()[0],
+            'freelist_count': conn.execute("PRAGMA freelist_count").fetchone()[0],
+            'auto_vacuum': conn.execute("PRAGMA auto_vacuum").fetchone()[0],
+        }
+    finally:
+        if own:
+            conn.close()
+    return sizes
+
+
+def _plan_params(conn):
+    """Parameter contoh untuk PLAN_QUERIES: 31 hari terakhir data dan karyawan pertama"""
+    last_date, = conn.execute("SELECT MAX(date) FROM attendance").fetchone()
+    end = last_date or datetime.now().strftime('%Y-%m-%d')
+    start = (datetime.strptime(end, '%Y-%m-%d') - timedelta(days=30)).strftime('%Y-%m-%d')
+    row = conn.execute("SELECT id, employee_id FROM attendance WHERE date = ? LIMIT 1", (end,)).fetchone()
+    attendance_id, employee_id = row if row else (0, 0)
+    return {'start': start, 'end': end, 'employee_id': employee_id, 'attendance_id': attendance_id}
+
+
+def query_plans(conn, params):
+    """EXPLAIN QUERY PLAN dan waktu eksekusi setiap PLAN_QUERIES"""
+    plans = []
+    for name, sql in PLAN_QUERIES:
+        details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+        t0 = time.perf_counter()
+        rows = len(conn.execute(sql, params).fetchall())
+        plans.append({
+            'name': name,
+            'plan': ' | '.join(details),
+            # "SCAN t" = baca seluruh tabel; "SCAN t USING INDEX" / "SEARCH" memakai indeks
+            'full_scans': sum(1 for detail in details if detail.startswith('SCAN') and 'USING' not in detail),
+            'rows': rows,
+            'ms': _ms(t0),
+        })
+    return plans
+
+
+# ==================== Tugas ====================
+
+def _analyze(conn):
+    conn.execute("ANALYZE")
+    conn.commit()
+    return {'stat_rows': conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0]}
+
+
+def _optimize(conn):
+    conn.execute("PRAGMA optimize")
+    return {}
+
+
+def _vacuum(conn, convert=True):
+    """convert=False: database auto_vacuum=NONE tidak diubah (tidak ada VACUUM penuh)"""
+    # change_log hanya dibaca selama dialog laporan terbuka; log lebih dari sehari tidak diperlukan lagi
+    pruned = conn.execute("DELETE FROM change_log WHERE changed_at < datetime('now', ?)",
+                          (f'-{CHANGE_LOG_KEEP_DAYS} day',)).rowcount
+    conn.commit()
+    freed = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        if not convert:
+            return {'freed_pages': 0, 'converted': False, 'needs_conversion': True, 'pruned_change_log': pruned}
+        # Mode auto_vacuum hanya bisa diubah lewat VACUUM penuh (sekali saja)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return {'freed_pages': freed, 'converted': True, 'pruned_change_log': pruned}
+    while conn.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+        conn.execute(f"PRAGMA incremental_vacuum({VACUUM_STEP})").fetchall()
+        conn.commit()
+    return {'freed_pages': freed, 'converted': False, 'pruned_change_log': pruned}
+
+
+def _checkpoint(conn):
+    busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    # busy = 1: ada pembaca lain sehingga WAL belum bisa dikosongkan penuh
+    return {'busy': bool(busy), 'log_frames': log_frames, 'checkpointed': checkpointed}
+
+
+TASK_FUNCTIONS = {
+    'analyze': _analyze,
+    'optimize': _optimize,
+    'vacuum': _vacuum,
+    'checkpoint': _checkpoint,
+}
+
+
+def run_maintenance(db_manager, tasks=TASKS, reason='manual', progress=None):
+    """Jalankan tugas pemeliharaan (urutan TASKS) dan simpan hasilnya ke maintenance_log.
+
+    Bisa dikirim langsung ke DatabaseWorker (argumen pertama DatabaseManager).
+    progress(task, done, total) dipanggil sebelum setiap tugas.
+    """
+    unknown = set(tasks) - set(TASKS)
+    if unknown:
+        raise ValueError(f"Tugas pemeliharaan tidak dikenal: {', '.join(sorted(unknown))}")
+    tasks = [task for task in TASKS if task in tasks]
+
+    started = time.perf_counter()
+    result = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'reason': reason,
+        'tasks': tasks,
+        'before': database_sizes(db_manager.db_path),
+        'results': [],
+    }
+    conn = db_manager.get_connection()
+    try:
+        params = _plan_params(conn)
+        result['plans_before'] = query_plans(conn, params)
+        for index, task in enumerate(tasks):
+            if progress:
+                progress(task, index, len(tasks))
+            t0 = time.perf_counter()
+            if task == 'vacuum':
+                detail = _vacuum(conn, convert=reason != SCHEDULED)
+            else:
+                detail = TASK_FUNCTIONS[task](conn)
+            result['results'].append({'task': task, 'ms': _ms(t0), **detail})
+        result['plans_after'] = query_plans(conn, params)
+        result['after'] = database_sizes(db_manager.db_path, conn)
+    finally:
+        conn.close()
+    result['total_ms'] = _ms(started)
+    db_manager.save_maintenance_run(result)
+    return result
+
+
+# ==================== Jadwal ====================
+
+def due_tasks(last_full_run, wal_size, now=None):
+    """Tugas yang perlu dijalankan: semua jika pemeliharaan penuh terakhir sudah lewat
+    INTERVAL_HOURS, hanya checkpoint jika WAL melewati WAL_CHECKPOINT_BYTES"""
+    now = now or datetime.now()
+    if last_full_run is None or now - datetime.fromisoformat(last_full_run) >= timedelta(hours=INTERVAL_HOURS):
+        return TASKS
+    if wal_size >= WAL_CHECKPOINT_BYTES:
+        return ('checkpoint',)
+    return ()
+
+
+def run_due(db_manager):
+    """Jalankan tugas yang sudah waktunya (dipanggil scheduler saat aplikasi menganggur); None jika tidak ada"""
+    runs = db_manager.get_maintenance_runs(limit=1, tasks=TASKS)
+    wal_path = db_manager.db_path + '-wal'
+    wal_size = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+    tasks = due_tasks(runs[0]['started_at'] if runs else None, wal_size)
+    if not tasks:
+        return None
+    return run_maintenance(db_manager, tasks, reason=SCHEDULED)
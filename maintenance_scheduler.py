@@ -0,0 +1,68 @@
+"""
+Menjalankan maintenance.run_due saat aplikasi menganggur.
+
+Setiap CHECK_INTERVAL_MS, posisi kursor dan data_version dibandingkan dengan
+pengecekan sebelumnya; jika keduanya tidak berubah selama
+maintenance.IDLE_SECONDS, aplikasi dianggap menganggur dan run_due dikirim ke
+DatabaseWorker (tidak pernah di thread GUI). Cara ini sengaja tidak memasang
+event filter di QApplication agar tidak ada kode Python di jalur setiap event.
+"""
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QCursor
+
+import maintenance
+from db_worker import DatabaseWorker
+
+CHECK_INTERVAL_MS = 30_000
+
+
+class MaintenanceScheduler(QObject):
+    """Pemeliharaan database otomatis saat tidak ada aktivitas user"""
+    finished = Signal(object)  # Hasil run_maintenance
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.running = False
+        self.last_error = None
+        self.last_activity = time.monotonic()
+        self.last_state = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(CHECK_INTERVAL_MS)
+        self.timer.timeout.connect(self.check)
+
+    def start(self):
+        if maintenance.is_scheduler_enabled():
+            self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def check(self):
+        """Dipanggil timer: catat aktivitas terakhir, jalankan pemeliharaan jika sudah cukup lama menganggur"""
+        state = (QCursor.pos().toTuple(), self.db_manager.peek_data_version())
+        now = time.monotonic()
+        if state != self.last_state:
+            self.last_state = state
+            self.last_activity = now
+            return
+        if self.running or now - self.last_activity < maintenance.IDLE_SECONDS:
+            return
+
+        self.running = True
+        DatabaseWorker.for_manager(self.db_manager).call(
+            maintenance.run_due, on_result=self.on_finished, on_error=self.on_failed, owner=self)
+
+    def on_finished(self, result):
+        self.running = False
+        self.last_error = None
+        if result is not None:
+            self.finished.emit(result)
+
+    def on_failed(self, error):
+        self.running = False
+        self.last_error = error
+        print(f"⚠️ Pemeliharaan database gagal: {error}")
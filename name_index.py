@@ -0,0 +1,189 @@
+"""
+Indeks nama karyawan di memori untuk pencarian type-ahead dan pencocokan nama saat import.
+
+Nama dinormalisasi (huruf besar, tanpa aksen/tanda baca, spasi tunggal) lalu
+dipecah menjadi token dan trigram. Inverted index trigram -> karyawan membuat
+kandidat bisa dicari tanpa membandingkan query dengan semua nama:
+
+- search(query)   : karyawan yang setiap token query-nya menjadi awal salah satu
+                    token nama (mis. "bud sa" -> "BUDI SANTOSO") lebih dulu, lalu
+                    nama yang memuat sebagian besar trigram query (salah ketik)
+- match(name)     : karyawan yang namanya sama setelah dinormalisasi, atau yang paling
+                    mirip (SequenceMatcher >= SUGGEST_THRESHOLD). Hanya yang sama
+                    persis yang boleh dipakai otomatis: DEWI KARTIKA dan DEWI SARTIKA
+                    sangat mirip tetapi orang yang berbeda, jadi nama yang sekadar
+                    mirip hanya menjadi usulan yang harus dikonfirmasi pengguna
+
+Modul ini tidak mengimpor Qt; widget EmployeeSearch di widgets.py memakainya.
+"""
+
+import difflib
+import re
+import threading
+import unicodedata
+
+SEARCH_THRESHOLD = 0.5   # Bagian trigram query yang harus ada di nama (pencarian)
+SUGGEST_THRESHOLD = 0.7  # Kemiripan minimal agar nama import diusulkan sebagai karyawan yang sama
+
+_NON_ALNUM = re.compile(r'[^0-9A-Z]+')
+_lock = threading.Lock()
+_memo = {}  # db_path -> (daftar (id, name), NameIndex)
+
+
+def normalize(name):
+    """'  Siti  Nur-Halizah ' -> 'SITI NUR HALIZAH' (tanpa aksen dan tanda baca)"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).upper()
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def compact(name):
+    """Kunci pencocokan persis: nama normalisasi tanpa spasi ('MUHAMMAD RIZKI' == 'MUHAMMADRIZKI')"""
+    return normalize(name).replace(' ', '')
+
+
+def trigrams(normalized):
+    """Trigram per token dengan padding (seperti pg_trgm): 'BUDI' -> '  B', ' BU', 'BUD', 'UDI', 'DI '"""
+    grams = set()
+    for token in normalized.split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    """Kemiripan dua nama yang sudah dinormalisasi (0..1)"""
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+class NameIndex:
+    """Nama karyawan yang sudah dinormalisasi beserta inverted index trigram"""
+
+    def __init__(self, employees):
+        """employees: iterable (id, name)"""
+        self.names = {}        # id -> nama asli
+        self.normalized = {}   # id -> nama normalisasi
+        self.by_normalized = {}  # compact(nama) -> [id]
+        self.grams = {}        # trigram -> set id
+        for employee_id, name in employees:
+            key = normalize(name)
+            self.names[employee_id] = name
+            self.normalized[employee_id] = key
+            self.by_normalized.setdefault(compact(name), []).append(employee_id)
+            for gram in trigrams(key):
+                self.grams.setdefault(gram, set()).add(employee_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _candidates(self, grams):
+        """Jumlah trigram yang sama per karyawan (hanya karyawan yang punya minimal satu)"""
+        counts = {}
+        for gram in grams:
+            for employee_id in self.grams.get(gram, ()):
+                counts[employee_id] = counts.get(employee_id, 0) + 1
+        return counts
+
+    def search(self, query, limit=None):
+        """[(id, nama)] urut relevansi: awal token cocok, lalu kemiripan trigram; query kosong = semua nama"""
+        key = normalize(query)
+        if not key:
+            ranked = sorted(self.names.items(), key=lambda item: self.normalized[item[0]])
+            return ranked[:limit] if limit else ranked
+
+        tokens = key.split()
+        scored = []
+        grams = trigrams(key)
+        for employee_id, shared in self._candidates(grams).items():
+            name_tokens = self.normalized[employee_id].split()
+            if all(any(name_token.startswith(token) for name_token in name_tokens) for token in tokens):
+                scored.append((0, 0.0, self.normalized[employee_id], employee_id))
+            elif shared / len(grams) >= SEARCH_THRESHOLD:
+                scored.append((1, -shared / len(grams), self.normalized[employee_id], employee_id))
+        scored.sort()
+        ranked = [(employee_id, self.names[employee_id]) for *_, employee_id in scored]
+        return ranked[:limit] if limit else ranked
+
+    def match(self, name):
+        """(id, nama, skor, persis) karyawan yang paling mungkin sama dengan name, atau None.
+
+        persis=True hanya jika namanya sama setelah dinormalisasi (dan tidak ada karyawan lain
+        dengan nama normalisasi yang sama); selain itu kandidat dengan skor >= SUGGEST_THRESHOLD
+        dikembalikan dengan persis=False sebagai usulan.
+        """
+        key = normalize(name)
+        if not key:
+            return None
+        exact = self.by_normalized.get(compact(name), [])
+        if len(exact) == 1:
+            return exact[0], self.names[exact[0]], 1.0, True
+
+        scores = sorted(((similarity(key, self.normalized[employee_id]), employee_id)
+                         for employee_id in self._candidates(trigrams(key))), reverse=True)
+        if not scores or scores[0][0] < SUGGEST_THRESHOLD:
+            return None
+        best, employee_id = scores[0]
+        return employee_id, self.names[employee_id], round(best, 3), False
+
+
+def for_manager(db_manager):
+    """NameIndex dari get_all_employees (ter-cache); dibangun ulang hanya jika daftar karyawan berubah"""
+    employees = tuple((employee['id'], employee['name']) for employee in db_manager.get_all_employees())
+    with _lock:
+        memo = _memo.get(db_manager.db_path)
+        if memo is not None and memo[0] == employees:
+            return memo[1]
+    index = NameIndex(employees)
+    with _lock:
+        _memo[db_manager.db_path] = (employees, index)
+    return index
+
+
+def resolve_import_names(records, index, taken=()):
+    """Samakan record['Nama'] hasil import dengan nama karyawan yang sudah ada (diubah di tempat).
+
+    Hanya nama yang sama setelah dinormalisasi yang diganti otomatis. Dalam satu batch satu
+    karyawan tidak dipakai dua nama berbeda, dan nama tidak diusulkan menjadi nama karyawan
+    yang juga ada di file (DEWI KARTIKA tidak pernah menjadi DEWI SARTIKA jika DEWI SARTIKA
+    juga absen di file yang sama). taken: id karyawan yang sudah dipakai record lain di batch.
+
+    Mengembalikan (matched, suggested): daftar (nama di file, nama karyawan, skor) yang
+    diganti otomatis, dan yang hanya mirip (tidak diganti; terapkan lewat apply_suggestions
+    setelah dikonfirmasi pengguna, jika tidak karyawan baru akan dibuat).
+    """
+    claimed = dict.fromkeys(taken)  # id karyawan -> nama di file yang memakainya
+    in_file = {compact(record['Nama']) for record in records}
+    results = {raw: index.match(raw) for raw in dict.fromkeys(record['Nama'] for record in records)}
+
+    matched, candidates = [], []
+    # Nama yang persis sama dengan nama karyawan didahulukan, baru variasi penulisannya
+    for raw, result in sorted(results.items(), key=lambda item: item[1] is not None and item[1][1] != item[0]):
+        if result is None:
+            continue
+        employee_id, name, score, exact = result
+        if not exact:
+            candidates.append((score, raw, employee_id, name))
+        elif claimed.setdefault(employee_id, raw) != raw:
+            results[raw] = None  # Karyawan ini sudah dipakai nama lain di file: jadikan karyawan baru
+        elif name != raw:
+            matched.append((raw, name, score))
+
+    suggested = []
+    for score, raw, employee_id, name in sorted(candidates, key=lambda item: -item[0]):
+        # Nama karyawan yang juga ada di file adalah orang lain, kecuali nama itu sendiri (nama kembar)
+        if employee_id not in claimed and (compact(name) == compact(raw) or compact(name) not in in_file):
+            claimed[employee_id] = raw
+            suggested.append((raw, name, score))
+
+    for record in records:
+        result = results[record['Nama']]
+        if result is not None and result[3]:
+            record['Nama'] = result[1]
+    return matched, suggested
+
+
+def apply_suggestions(records, accepted):
+    """Ganti record['Nama'] untuk usulan yang dikonfirmasi pengguna; accepted: iterable (nama di file, nama karyawan, ...)"""
+    renames = {raw: name for raw, name, *_ in accepted}
+    for record in records:
+        record['Nama'] = renames.get(record['Nama'], record['Nama'])
@@ -0,0 +1,228 @@
+"""
+Profiling opt-in untuk operasi database, laporan, export dan import.
+
+Aktifkan dengan `python app.py --profile`, `python -m absensi --profile ...`
+atau environment variable ABSENSI_PROFILE=1. Saat aktif, setiap pemanggilan
+yang dibungkus `profiled` / `profile_step` dicatat: jumlah panggilan, total
+waktu, p95, waktu maksimum dan jumlah baris yang dihasilkan. Saat aplikasi
+ditutup, hasilnya ditulis ke file JSON (default: profile_YYYYmmdd_HHMMSS.json,
+atau path di ABSENSI_PROFILE_FILE) untuk dilampirkan di laporan bug.
+
+Tanpa flag, wrapper hanya melakukan satu pengecekan boolean per panggilan.
+"""
+
+import atexit
+import functools
+import json
+import math
+import os
+import platform
+import sys
+import threading
+import time
+import types
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from records import Record
+
+FLAG = '--profile'
+ENV_VAR = 'ABSENSI_PROFILE'
+ENV_FILE = 'ABSENSI_PROFILE_FILE'
+MAX_SAMPLES = 1000  # Jumlah durasi terakhir yang disimpan per operasi (untuk p95)
+
+_enabled = False
+_dump_registered = False
+_lock = threading.Lock()
+_stats = {}
+
+
+class _Stat:
+    __slots__ = ('calls', 'total', 'max', 'rows', 'errors', 'samples')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(dump_on_exit=True):
+    """Aktifkan profiling (dan dump JSON saat exit)"""
+    global _enabled, _dump_registered
+    _enabled = True
+    if dump_on_exit and not _dump_registered:
+        atexit.register(_dump_at_exit)
+        _dump_registered = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def enable_from_argv(argv=None):
+    """Aktifkan profiling jika ada flag --profile atau env ABSENSI_PROFILE=1"""
+    argv = sys.argv if argv is None else argv
+    requested = os.environ.get(ENV_VAR, '').strip() not in ('', '0')
+    if FLAG in argv:
+        argv.remove(FLAG)
+        requested = True
+    if requested:
+        enable()
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def count_rows(result):
+    """Perkiraan jumlah baris dari hasil fungsi (list, tuple berisi list, dict)"""
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return 0
+    if isinstance(result, (list, set)):
+        return len(result)
+    if isinstance(result, tuple):
+        return count_rows(result[0]) if result else 0
+    if isinstance(result, (dict, Record)):
+        return 1
+    return 0
+
+
+def record(name, elapsed, rows=0, error=False):
+    """Catat satu pemanggilan"""
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = _Stat()
+        stat.calls += 1
+        stat.total += elapsed
+        stat.rows += rows
+        stat.samples.append(elapsed)
+        if elapsed > stat.max:
+            stat.max = elapsed
+        if error:
+            stat.errors += 1
+
+
+def profiled(name):
+    """Decorator: catat waktu dan jumlah baris hasil fungsi dengan nama `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                record(name, time.perf_counter() - t0, error=True)
+                raise
+            record(name, time.perf_counter() - t0, count_rows(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def profile_methods(prefix):
+    """Class decorator: bungkus semua method publik dengan `profiled`"""
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if isinstance(value, types.FunctionType) and not attr.startswith("_"):
+                setattr(cls, attr, profiled(f"{prefix}.{attr}")(value))
+        return cls
+    return decorator
+
+
+class _Step:
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = 0
+
+
+@contextmanager
+def profile_step(name):
+    """Context manager untuk satu langkah; isi `step.rows` jika relevan
+
+        with profile_step("ui.generate_report") as step:
+            ...
+            step.rows = len(data)
+    """
+    step = _Step()
+    if not _enabled:
+        yield step
+        return
+    t0 = time.perf_counter()
+    try:
+        yield step
+    except Exception:
+        record(name, time.perf_counter() - t0, step.rows, error=True)
+        raise
+    record(name, time.perf_counter() - t0, step.rows)
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def get_stats():
+    """Ringkasan statistik, diurutkan dari total waktu terbesar"""
+    with _lock:
+        items = [(name, stat.calls, stat.total, stat.max, stat.rows, stat.errors, list(stat.samples))
+                 for name, stat in _stats.items()]
+
+    result = []
+    for name, calls, total, max_time, rows, errors, samples in items:
+        result.append({
+            'name': name,
+            'calls': calls,
+            'total_ms': round(total * 1000, 3),
+            'avg_ms': round(total / calls * 1000, 3) if calls else 0.0,
+            'p95_ms': round(_percentile(samples, 95) * 1000, 3),
+            'max_ms': round(max_time * 1000, 3),
+            'rows': rows,
+            'errors': errors
+        })
+    result.sort(key=lambda item: -item['total_ms'])
+    return result
+
+
+def dump(path=None):
+    """Tulis statistik ke file JSON dan kembalikan path-nya"""
+    if not path:
+        path = os.environ.get(ENV_FILE) or f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    data = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'argv': sys.argv,
+        'stats': get_stats()
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def _dump_at_exit():
+    if not _stats:
+        return
+    try:
+        path = dump()
+        print(f"📊 Profil disimpan ke: {path}", file=sys.stderr)
+    except Exception as e:
+        print(f"⚠️  Gagal menyimpan profil: {e}", file=sys.stderr)
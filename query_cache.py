@@ -0,0 +1,194 @@
+"""
+Cache hasil baca database dan laporan (LRU, dalam proses).
+
+Fungsi/method yang dibungkus `cached` menyimpan hasilnya dengan key nama +
+argumen. Argumen pertama harus DatabaseManager (self pada method, atau
+db_manager pada fungsi laporan); setiap pemanggilan membandingkan
+data_version database itu (satu SELECT kecil lewat koneksi yang dipakai
+ulang) dengan versi saat hasil disimpan. Setiap tulis menaikkan data_version
+lewat trigger, sehingga hasil lama otomatis dibuang, termasuk tulis dari
+proses lain ke file database yang sama.
+
+Hasil dikembalikan sebagai salinan list/dict (isi Record dipakai bersama),
+jadi pemanggil boleh mengurutkan atau mengubah dict hasil tanpa merusak cache.
+
+Aktif secara default; ABSENSI_CACHE=0 mematikan, ABSENSI_CACHE_SIZE
+mengatur jumlah entri maksimum (default 256).
+"""
+
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+from records import Record
+
+ENV_VAR = 'ABSENSI_CACHE'
+ENV_SIZE = 'ABSENSI_CACHE_SIZE'
+
+_enabled = os.environ.get(ENV_VAR, '1').strip() not in ('', '0')
+_maxsize = int(os.environ.get(ENV_SIZE, '') or 256)
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> (data_version, value)
+_stats = {}  # nama -> [hits, misses]
+_evictions = 0
+_invalidations = 0
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    clear()
+
+
+def set_maxsize(maxsize):
+    global _maxsize, _evictions
+    with _lock:
+        _maxsize = max(1, int(maxsize))
+        while len(_entries) > _maxsize:
+            _entries.popitem(last=False)
+            _evictions += 1
+
+
+def clear():
+    """Buang semua entri (statistik tetap)"""
+    with _lock:
+        _entries.clear()
+
+
+def reset():
+    """Buang semua entri dan statistik"""
+    global _evictions, _invalidations
+    with _lock:
+        _entries.clear()
+        _stats.clear()
+        _evictions = 0
+        _invalidations = 0
+
+
+def _freeze(value):
+    """Bentuk hashable dari argumen; Record/list/dict dibandingkan berdasarkan isi"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Record):
+        return (type(value).__name__, tuple(_freeze(v) for v in value.values()))
+    if isinstance(value, dict):
+        return ('dict', tuple((key, _freeze(v)) for key, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    db_path = getattr(value, 'db_path', None)
+    if db_path is not None:
+        return ('db', db_path)
+    try:
+        hash(value)
+    except TypeError:
+        raise _Uncacheable from None
+    return value
+
+
+def _detach(value):
+    """Salin container (list/tuple/dict) secara rekursif; Record dan nilai skalar dipakai bersama"""
+    if isinstance(value, list):
+        return [_detach(v) for v in value]
+    if isinstance(value, dict):
+        return {key: _detach(v) for key, v in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_detach(v) for v in value)
+    return value
+
+
+def cached(name):
+    """Decorator: cache hasil berdasarkan argumen, valid selama data_version database tidak berubah"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(db_manager, *args, **kwargs):
+            if not _enabled:
+                return func(db_manager, *args, **kwargs)
+            try:
+                key = (db_manager.db_path, name, _freeze(args), _freeze(tuple(sorted(kwargs.items()))))
+            except _Uncacheable:
+                return func(db_manager, *args, **kwargs)
+
+            version = db_manager.peek_data_version()
+            with _lock:
+                counter = _stats.setdefault(name, [0, 0])
+                entry = _entries.get(key)
+                if entry is not None and entry[0] == version:
+                    _entries.move_to_end(key)
+                    counter[0] += 1
+                    return _detach(entry[1])
+                counter[1] += 1
+                if entry is not None:
+                    _invalidate(db_manager.db_path, version)
+
+            result = func(db_manager, *args, **kwargs)
+            with _lock:
+                _store(key, version, _detach(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def _invalidate(db_path, version):
+    """Buang entri database db_path yang versinya bukan `version` (dipanggil dengan _lock)"""
+    global _invalidations
+    stale = [key for key, (entry_version, _) in _entries.items()
+             if key[0] == db_path and entry_version != version]
+    for key in stale:
+        del _entries[key]
+    _invalidations += len(stale)
+
+
+def _store(key, version, value):
+    global _evictions
+    _entries[key] = (version, value)
+    _entries.move_to_end(key)
+    while len(_entries) > _maxsize:
+        _entries.popitem(last=False)
+        _evictions += 1
+
+
+def get_stats():
+    """Ringkasan cache: total dan per fungsi (hits, misses, hit rate)"""
+    with _lock:
+        per_name = [(name, hits, misses) for name, (hits, misses) in _stats.items()]
+        size = len(_entries)
+        evictions = _evictions
+        invalidations = _invalidations
+
+    functions = [{
+        'name': name,
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / (hits + misses) * 100, 1) if hits + misses else 0.0
+    } for name, hits, misses in per_name]
+    functions.sort(key=lambda item: -(item['hits'] + item['misses']))
+
+    hits = sum(item['hits'] for item in functions)
+    misses = sum(item['misses'] for item in functions)
+    return {
+        'enabled': _enabled,
+        'size': size,
+        'maxsize': _maxsize,
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / (hits + misses) * 100, 1) if hits + misses else 0.0,
+        'evictions': evictions,
+        'invalidations': invalidations,
+        'functions': functions
+    }
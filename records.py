@@ -0,0 +1,112 @@
+"""
+Record ringan untuk hasil query DatabaseManager.
+
+Setiap record adalah class dengan __slots__ (tanpa __dict__ per baris) yang
+dibuat langsung dari tuple hasil cursor. Untuk pemanggil lama, record bisa
+dipakai seperti dict: record['date'], record.get('shift_id', 1),
+'id' in record, keys()/items() dan dict(record). Field baru tidak bisa
+ditambahkan; pakai to_dict() jika butuh dict yang bisa diubah bebas
+(misalnya untuk json.dumps).
+"""
+
+
+class Record:
+    """Basis record __slots__ dengan antarmuka dict read-mostly"""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(f"{type(self).__name__} tidak punya field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        return (type(self), tuple(self.values()))
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.__slots__]
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """List record dari baris cursor yang urutan kolomnya sama dengan field"""
+        return [cls(*row) for row in rows]
+
+
+def record_class(name, fields):
+    """Buat subclass Record dengan __slots__ = fields dan __init__ posisional (seperti namedtuple)"""
+    fields = tuple(fields)
+    namespace = {}
+    # __init__ dibuat lewat exec agar konstruksi per baris cukup satu panggilan tanpa loop setattr
+    body = "".join(f"    self.{field} = {field}\n" for field in fields) or "    pass\n"
+    exec(f"def __init__(self, {', '.join(fields)}):\n{body}", namespace)
+    return type(name, (Record,), {
+        '__slots__': fields,
+        '__init__': namespace['__init__'],
+        '__module__': __name__,
+        '__doc__': f"{name}({', '.join(fields)})"
+    })
+
+
+AttendanceRecord = record_class('AttendanceRecord', (
+    'id', 'date', 'jam_masuk', 'jam_keluar', 'jam_masuk_lembur', 'jam_keluar_lembur',
+    'shift_id', 'keterangan',
+    'jam_masuk_menit', 'jam_keluar_menit', 'jam_masuk_lembur_menit', 'jam_keluar_lembur_menit',
+    'employee_id',
+))
+
+ViolationRecord = record_class('ViolationRecord', (
+    'id', 'attendance_id', 'employee_id', 'employee_name', 'date',
+    'start_time', 'end_time', 'description', 'created_at', 'duration_minutes',
+))
+
+LeaveRecord = record_class('LeaveRecord', (
+    'id', 'employee_id', 'date', 'description', 'created_at', 'employee_name',
+))
+
+ShiftRecord = record_class('ShiftRecord', (
+    'id', 'name',
+    'weekday_work_start', 'weekday_work_end', 'weekday_overtime_start', 'weekday_overtime_end',
+    'weekday_overtime_limit',
+    'saturday_work_start', 'saturday_work_end', 'saturday_overtime_start', 'saturday_overtime_end',
+    'saturday_overtime_limit',
+    'late_tolerance', 'overtime_mode',
+))
+
+SHIFT_COLUMNS = ", ".join(ShiftRecord.__slots__)
@@ -0,0 +1,539 @@
+"""
+Perhitungan laporan absensi tanpa ketergantungan ke Qt.
+
+Modul ini dipakai bersama oleh GUI (app.py) dan CLI (absensi.py) supaya
+logika jam kerja, lembur, loyalitas, overtime dan keterlambatan hanya
+ada di satu tempat.
+"""
+
+import functools
+import re
+from datetime import datetime, timedelta
+
+from profiling import profiled
+from query_cache import cached
+
+DAY_NAMES = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+DAY_NAMES_SHORT = ["SEN", "SEL", "RAB", "KAM", "JUM", "SAB", "MIN"]
+
+# Format jam yang diterima sama dengan strptime "%H:%M" / "%H:%M:%S"
+_CLOCK_MINUTES = re.compile(r"(2[0-3]|[01]\d|\d):([0-5]\d|\d)")
+_CLOCK_SECONDS = re.compile(r"(2[0-3]|[01]\d|\d):([0-5]\d|\d):([0-5]\d|\d)")
+
+
+def format_time_duration(hours, unit_type="jam"):
+    """Format time duration to 'X jam Y menit' or 'X menit' format"""
+    if hours == 0:
+        return "0 menit"
+
+    total_minutes = int(hours * 60)
+    jam = total_minutes // 60
+    menit = total_minutes % 60
+
+    if unit_type == "menit_only":
+        return f"{total_minutes} menit"
+
+    if jam > 0 and menit > 0:
+        return f"{jam} jam {menit} menit"
+    elif jam > 0:
+        return f"{jam} jam"
+    else:
+        return f"{menit} menit"
+
+
+def format_duration(minutes):
+    """Format duration in minutes to readable text"""
+    if minutes == 0:
+        return "0 menit"
+
+    hours = minutes // 60
+    mins = minutes % 60
+
+    if hours > 0 and mins > 0:
+        return f"{hours} jam {mins} menit"
+    elif hours > 0:
+        return f"{hours} jam"
+    else:
+        return f"{mins} menit"
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_clock_minutes(text):
+    """'HH:MM' -> menit sejak tengah malam, None jika kosong/tidak valid"""
+    match = _CLOCK_MINUTES.fullmatch(text) if isinstance(text, str) else None
+    if not match:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_clock_seconds(text):
+    """'HH:MM:SS' -> detik sejak tengah malam, None jika kosong/tidak valid"""
+    match = _CLOCK_SECONDS.fullmatch(text) if isinstance(text, str) else None
+    if not match:
+        return None
+    return int(match.group(1)) * 3600 + int(match.group(2)) * 60 + int(match.group(3))
+
+
+def format_clock_minutes(minutes):
+    """Menit sejak tengah malam -> 'HH:MM'"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def clock_minutes(data, field):
+    """Jam pada record absensi dalam menit; pakai kolom integer `<field>_menit` dari database jika ada"""
+    minutes = data.get(f"{field}_menit")
+    if minutes is not None:
+        return minutes
+    return parse_clock_minutes(data.get(field))
+
+
+def calculate_violation_duration(start_time, end_time):
+    """Calculate duration in minutes between start_time and end_time"""
+    start = parse_clock_seconds(start_time)
+    end = parse_clock_seconds(end_time)
+    if start is None or end is None:
+        print(f"Error calculating duration: format jam tidak valid ({start_time!r}, {end_time!r})")
+        return 0
+
+    # Handle case where end time is next day (rare but possible)
+    if end < start:
+        end += 24 * 3600
+
+    return (end - start) // 60
+
+
+def _shift_minutes(shift_settings, key):
+    """Jam pada pengaturan shift dalam menit, None jika shift/kolom tidak ada"""
+    try:
+        return parse_clock_minutes(shift_settings[key])
+    except (KeyError, TypeError):
+        return None
+
+
+def _work_schedule(shift_settings, day_of_week):
+    """(jam masuk, jam pulang) jadwal dalam menit untuk Senin-Jumat atau Sabtu"""
+    prefix = 'saturday' if day_of_week == 5 else 'weekday'
+    return (_shift_minutes(shift_settings, f'{prefix}_work_start'),
+            _shift_minutes(shift_settings, f'{prefix}_work_end'))
+
+
+def calculate_work_hours(data, shift_settings, day_of_week):
+    """Calculate work hours based on shift schedule, not actual clock in/out times"""
+    if not data['jam_masuk'] or not data['jam_keluar']:
+        return 0.0
+
+    jam_masuk_aktual = clock_minutes(data, 'jam_masuk')
+    jam_keluar_aktual = clock_minutes(data, 'jam_keluar')
+    if jam_masuk_aktual is None or jam_keluar_aktual is None:
+        return 0.0
+
+    # For Sunday (6), just return actual hours worked (no shift schedule)
+    if day_of_week == 6:
+        if jam_keluar_aktual > jam_masuk_aktual:
+            return (jam_keluar_aktual - jam_masuk_aktual) / 60
+        return 0.0
+
+    # Get shift schedule based on day
+    jadwal_masuk, jadwal_keluar = _work_schedule(shift_settings, day_of_week)
+    if jadwal_masuk is None or jadwal_keluar is None:
+        return 0.0
+
+    # Calculate work hours based on schedule:
+    # - Start time: later of (schedule start, actual clock in)
+    # - End time: earlier of (schedule end, actual clock out)
+    jam_mulai_kerja = max(jadwal_masuk, jam_masuk_aktual)
+    jam_selesai_kerja = min(jadwal_keluar, jam_keluar_aktual)
+
+    if jam_selesai_kerja > jam_mulai_kerja:
+        hours = (jam_selesai_kerja - jam_mulai_kerja) / 60
+
+        # Don't exceed the scheduled work hours
+        scheduled_hours = (jadwal_keluar - jadwal_masuk) / 60
+        return min(hours, scheduled_hours)
+
+    return 0.0
+
+
+def calculate_total_work_hours(jam_kerja, loyalitas, jam_lembur):
+    """Calculate total work hours = jam kerja normal + loyalitas + lembur"""
+    try:
+        total = jam_kerja  # Start with normal work hours
+
+        # Add loyalitas (convert from minutes to hours)
+        if loyalitas > 0:
+            total += loyalitas / 60
+
+        # Add lembur hours
+        if jam_lembur > 0:
+            total += jam_lembur
+
+        return total
+    except:
+        return jam_kerja  # Fallback to normal work hours
+
+
+def calculate_overtime_hours(data, shift_settings, day_of_week):
+    """Calculate overtime hours based on shift and day"""
+    # Sunday has no overtime, only work duration
+    if day_of_week == 6:
+        return 0.0
+
+    if not data['jam_masuk_lembur'] or not data['jam_keluar_lembur']:
+        return 0.0
+
+    masuk = clock_minutes(data, 'jam_masuk_lembur')
+    keluar = clock_minutes(data, 'jam_keluar_lembur')
+    if masuk is not None and keluar is not None and keluar > masuk:
+        return (keluar - masuk) / 60
+
+    return 0.0
+
+
+def calculate_overtime(data, shift_settings, day_of_week):
+    """Calculate overtime: dari jam kerja normal pulang hingga batas overtime, dibulatkan ke bawah per jam"""
+    # Sunday has no overtime
+    if day_of_week == 6:
+        return 0.0
+
+    if not data['jam_keluar']:
+        return 0.0
+
+    keluar = clock_minutes(data, 'jam_keluar')
+
+    # Get scheduled work end time and overtime limit based on day
+    if day_of_week == 5:  # Saturday
+        jadwal_selesai = _shift_minutes(shift_settings, 'saturday_work_end')
+        batas_overtime = _shift_minutes(shift_settings, 'saturday_overtime_limit')
+    else:  # Monday-Friday
+        jadwal_selesai = _shift_minutes(shift_settings, 'weekday_work_end')
+        batas_overtime = _shift_minutes(shift_settings, 'weekday_overtime_limit')
+
+    if keluar is None or jadwal_selesai is None or batas_overtime is None:
+        return 0.0
+
+    # Calculate overtime: dari jam kerja normal pulang sampai min(jam keluar aktual, batas overtime)
+    if keluar > jadwal_selesai:
+        waktu_akhir_overtime = min(keluar, batas_overtime)
+        overtime_hours = (waktu_akhir_overtime - jadwal_selesai) / 60
+
+        # Bulatkan ke bawah (floor) per jam
+        return float(int(overtime_hours))
+
+    # Jika jam keluar <= jam kerja normal, tidak ada overtime
+    return 0.0
+
+
+def calculate_loyalitas(data, shift_settings, day_of_week):
+    """Calculate loyalitas (30 menit - 1 jam lebih dari jam kerja normal)
+    Jika >1 jam maka loyalitas = 0 dan overtime = 1 jam"""
+    if not data['jam_keluar'] or day_of_week == 6:  # No loyalitas on Sunday
+        return 0.0
+
+    keluar = clock_minutes(data, 'jam_keluar')
+    _, jadwal_keluar = _work_schedule(shift_settings, day_of_week)
+
+    if keluar is not None and jadwal_keluar is not None and keluar > jadwal_keluar:
+        extra_minutes = float(keluar - jadwal_keluar)
+
+        # Loyalitas: 30-60 menit setelah jam pulang normal
+        if 30 <= extra_minutes < 60:
+            return extra_minutes
+
+    return 0.0
+
+
+def calculate_lateness(data, shift_settings, day_of_week):
+    """Calculate lateness based on shift settings and day"""
+    if not data['jam_masuk']:
+        return 0.0
+
+    # Sunday - no lateness calculation
+    if day_of_week == 6:
+        return 0.0
+
+    masuk = clock_minutes(data, 'jam_masuk')
+    jadwal, _ = _work_schedule(shift_settings, day_of_week)
+    if masuk is None or jadwal is None:
+        return 0.0
+
+    # Apply tolerance
+    try:
+        jadwal_with_tolerance = jadwal + shift_settings['late_tolerance']
+    except (KeyError, TypeError):
+        return 0.0
+
+    if masuk > jadwal_with_tolerance:
+        return float(masuk - jadwal)
+
+    return 0.0
+
+
+def calculate_day_metrics(data, shift_settings, day_of_week):
+    """Hitung semua metrik satu hari absensi sekaligus"""
+    jam_kerja = calculate_work_hours(data, shift_settings, day_of_week)
+    jam_lembur = calculate_overtime_hours(data, shift_settings, day_of_week)
+    loyalitas = calculate_loyalitas(data, shift_settings, day_of_week)
+    overtime = calculate_overtime(data, shift_settings, day_of_week)
+    terlambat = calculate_lateness(data, shift_settings, day_of_week)
+
+    return {
+        'jam_kerja': jam_kerja,
+        'jam_lembur': jam_lembur,
+        'loyalitas': loyalitas,        # menit
+        'overtime': overtime,          # jam
+        'terlambat': terlambat,        # menit
+        'jam_kerja_total': calculate_total_work_hours(jam_kerja, loyalitas, jam_lembur)
+    }
+
+
+def describe_leaves(leaves):
+    """Teks status untuk daftar izin pada satu hari"""
+    if len(leaves) > 1:
+        return f"Izin - Terdapat {len(leaves)} Izin"
+    return f"Izin - {leaves[0]['description']}"
+
+
+def generate_complete_date_range(start_date, end_date, attendance_data):
+    """Generate complete date range with empty entries for missing dates"""
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+
+    # Create dictionary of existing attendance data
+    attendance_dict = {data['date']: data for data in attendance_data}
+
+    complete_data = []
+    current_date = start_dt
+
+    while current_date <= end_dt:
+        date_str = current_date.strftime("%Y-%m-%d")
+        day_of_week = current_date.weekday()  # 0=Monday, 6=Sunday
+
+        if date_str in attendance_dict:
+            complete_data.append(attendance_dict[date_str])
+        else:
+            # Create empty entry for missing date
+            complete_data.append({
+                'id': None,
+                'date': date_str,
+                'jam_masuk': None,
+                'jam_keluar': None,
+                'jam_masuk_lembur': None,
+                'jam_keluar_lembur': None,
+                'shift_id': 1,  # Default shift
+                'day_name': current_date.strftime("%A"),  # Day name for reference
+                'is_sunday': day_of_week == 6  # Mark Sunday
+            })
+
+        current_date += timedelta(days=1)
+
+    return complete_data
+
+
+def date_range(start_date, end_date):
+    """List objek date dari start_date sampai end_date (inklusif)"""
+    dates = []
+    current_date = start_date
+    while current_date <= end_date:
+        dates.append(current_date)
+        current_date += timedelta(days=1)
+    return dates
+
+
+class ShiftLookup:
+    """Cache shift per id selama satu kali generate laporan"""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._shifts = {}
+
+    def get(self, shift_id):
+        shift_id = shift_id or 1
+        if shift_id not in self._shifts:
+            shift_settings = None
+            try:
+                shift_settings = self.db_manager.get_shift_by_id(shift_id)
+            except Exception:
+                pass
+            if not shift_settings and shift_id != 1:
+                # Fallback to default shift
+                shift_settings = self.get(1)
+            self._shifts[shift_id] = shift_settings
+        return self._shifts[shift_id]
+
+
+def _date_key(value):
+    return value if isinstance(value, str) else value.strftime('%Y-%m-%d')
+
+
+class LeaveCalendar:
+    """Izin per (employee_id, tanggal) untuk satu periode, dari satu get_leaves_by_date_range.
+
+    leaves() mengembalikan daftar yang sama dengan get_leaves_by_employee_date(employee_id, date):
+    dict id, description, created_at, urut created_at. Tanggal boleh str 'YYYY-MM-DD' atau date.
+    """
+    def __init__(self, db_manager=None, start_date=None, end_date=None):
+        self.days = {}
+        if db_manager is not None and start_date is not None:
+            self.load(db_manager, start_date, end_date or start_date)
+
+    def load(self, db_manager, start_date, end_date, employee_ids=None):
+        """Baca ulang izin start_date..end_date (hanya employee_ids jika diberikan), menimpa isi sebelumnya"""
+        start, end = _date_key(start_date), _date_key(end_date)
+        self.days = {key: leaves for key, leaves in self.days.items()
+                     if not (start <= key[1] <= end and (employee_ids is None or key[0] in employee_ids))}
+        loaded = {}
+        for leave in db_manager.get_leaves_by_date_range(start, end):
+            if employee_ids is None or leave['employee_id'] in employee_ids:
+                loaded.setdefault((leave['employee_id'], leave['date']), []).append(leave)
+        for key, leaves in loaded.items():
+            leaves.sort(key=lambda leave: (leave['created_at'] or '', leave['id']))
+            self.days[key] = [{'id': leave['id'], 'description': leave['description'],
+                               'created_at': leave['created_at']} for leave in leaves]
+        return self
+
+    def drop_dates(self, date_strs):
+        """Lupakan tanggal yang keluar dari periode"""
+        self.days = {key: leaves for key, leaves in self.days.items() if key[1] not in date_strs}
+
+    def leaves(self, employee_id, date):
+        return self.days.get((employee_id, _date_key(date)), [])
+
+    def count(self, employee_id, date):
+        return len(self.days.get((employee_id, _date_key(date)), ()))
+
+
+@profiled("report.build_employee_report")
+@cached("report.build_employee_report")
+def build_employee_report(db_manager, employee_id, attendance_data):
+    """Bangun baris laporan karyawan satuan beserta totalnya
+
+    Returns:
+        (rows, totals) - rows berisi data mentah, metrik, status, keterangan
+        dan daftar pelanggaran per hari; totals berisi akumulasi metrik
+        (Minggu tidak dihitung untuk lembur, loyalitas, overtime, keterlambatan)
+    """
+    shifts = ShiftLookup(db_manager)
+    dates = [data['date'] for data in attendance_data]
+    calendar = LeaveCalendar(db_manager, min(dates), max(dates)) if dates else LeaveCalendar()
+    rows = []
+    totals = {'jam_kerja': 0, 'jam_lembur': 0, 'loyalitas': 0, 'overtime': 0, 'terlambat': 0}
+
+    for data in attendance_data:
+        shift_settings = shifts.get(data.get('shift_id', 1))
+        day_of_week = datetime.strptime(data['date'], '%Y-%m-%d').weekday()
+        metrics = calculate_day_metrics(data, shift_settings, day_of_week)
+
+        leaves = calendar.leaves(employee_id, data['date'])
+        if leaves:
+            status = describe_leaves(leaves)
+            keterangan = status
+        else:
+            status = "Hadir" if data['jam_masuk'] else "Tidak Hadir"
+            keterangan = data.get('keterangan', '') or "-"
+
+        violations = []
+        if data.get('id'):
+            violations = db_manager.get_violations_by_attendance(data['id']) or []
+
+        rows.append({
+            'data': data,
+            'date': data['date'],
+            'day_of_week': day_of_week,
+            'shift_name': shift_settings['name'] if shift_settings else "Default Shift",
+            'metrics': metrics,
+            'has_leaves': bool(leaves),
+            'status': status,
+            'keterangan': keterangan,
+            'violations': violations
+        })
+
+        totals['jam_kerja'] += metrics['jam_kerja_total']
+        if day_of_week != 6:  # Not Sunday
+            totals['jam_lembur'] += metrics['jam_lembur']
+            totals['loyalitas'] += metrics['loyalitas']
+            totals['overtime'] += metrics['overtime']
+            totals['terlambat'] += metrics['terlambat']
+
+    return rows, totals
+
+
+@profiled("report.build_attendance_matrix")
+@cached("report.build_attendance_matrix")
+def build_attendance_matrix(db_manager, start_date, end_date):
+    """Ambil data matrix kehadiran semua karyawan
+
+    Returns:
+        (employees, dates, attendance_data) dengan attendance_data berbentuk
+        {employee_id: {'YYYY-MM-DD': record}}
+    """
+    dates = date_range(start_date, end_date)
+
+    employees = db_manager.get_all_employees()
+    employees.sort(key=lambda x: x['name'])
+
+    loaded = load_attendance_range(db_manager, start_date, end_date)
+    attendance_data = {employee['id']: loaded.get(employee['id'], {}) for employee in employees}
+
+    return employees, dates, attendance_data
+
+
+def load_attendance_range(db_manager, start_date, end_date, employee_ids=None):
+    """Absensi periode dalam satu query: {employee_id: {'YYYY-MM-DD': record}}"""
+    attendance = {}
+    for record in db_manager.get_attendance_by_date_range(
+        start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), employee_ids
+    ):
+        attendance.setdefault(record['employee_id'], {})[record['date']] = record
+    return attendance
+
+
+def attendance_presence(attendance):
+    """(has_masuk, has_keluar) untuk satu record absensi"""
+    if not attendance:
+        return False, False
+    has_masuk = bool(attendance.get('jam_masuk') and attendance['jam_masuk'].strip())
+    has_keluar = bool(attendance.get('jam_keluar') and attendance['jam_keluar'].strip())
+    return has_masuk, has_keluar
+
+
+@profiled("report.build_violation_report")
+@cached("report.build_violation_report")
+def build_violation_report(db_manager, start_date, end_date):
+    """Ambil data laporan pelanggaran semua karyawan
+
+    Returns:
+        (employees, violation_data) dengan violation_data berbentuk
+        {employee_id: {'name', 'violations', 'total_violations', 'total_time_minutes'}}
+    """
+    employees = db_manager.get_all_employees()
+    employees.sort(key=lambda x: x['name'])
+
+    violation_data = {
+        employee['id']: {
+            'name': employee['name'],
+            'violations': [],
+            'total_violations': 0,
+            'total_time_minutes': 0
+        } for employee in employees
+    }
+
+    # Satu query untuk semua pelanggaran dalam periode (durasi sudah dihitung di SQL)
+    for violation in db_manager.get_violations_by_date_range(
+        start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    ):
+        emp_data = violation_data.get(violation['employee_id'])
+        if emp_data is None:
+            continue
+        duration_minutes = violation['duration_minutes']
+        emp_data['violations'].append({
+            'date': violation['date'],
+            'description': violation['description'],
+            'start_time': violation['start_time'],
+            'end_time': violation['end_time'],
+            'duration_minutes': duration_minutes,
+            'duration_text': format_duration(duration_minutes)
+        })
+        emp_data['total_violations'] += 1
+        emp_data['total_time_minutes'] += duration_minutes
+
+    return employees, violation_data
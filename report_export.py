@@ -0,0 +1,699 @@
+"""
+Export laporan ke Excel (xlsx) dan CSV tanpa ketergantungan ke Qt.
+
+Dipakai oleh dialog laporan di app.py dan oleh CLI (absensi.py).
+Parameter `progress` opsional berupa callable(persen) untuk update
+progress bar di GUI.
+"""
+
+import csv
+from datetime import datetime
+
+from profiling import profiled
+from report_calc import (
+    DAY_NAMES, DAY_NAMES_SHORT, calculate_day_metrics, format_time_duration,
+    format_duration, generate_complete_date_range,
+    attendance_presence, LeaveCalendar, ShiftLookup
+)
+
+EMPLOYEE_REPORT_HEADERS = [
+    "Tanggal", "Shift", "Jam Masuk", "Jam Keluar", "Jam Masuk Lembur", "Jam Keluar Lembur",
+    "Jam Kerja", "Jam Lembur", "Loyalitas", "Overtime", "Keterlambatan", "Status", "Keterangan"
+]
+
+VIOLATION_REPORT_HEADERS = ["NAMA", "TANGGAL", "HARI", "RENTANG WAKTU", "DURASI", "NOTE"]
+
+
+def _report_progress(progress, value):
+    if progress:
+        progress(value)
+
+
+# ==================== LAPORAN KARYAWAN SATUAN ====================
+
+def build_employee_report_table(db_manager, employee_id, start_date, end_date):
+    """Baris laporan karyawan satuan untuk export (termasuk hari kosong)"""
+    attendance_data = db_manager.get_attendance_by_employee_period(employee_id, start_date, end_date)
+    complete_data = generate_complete_date_range(start_date, end_date, attendance_data)
+    shifts = ShiftLookup(db_manager)
+
+    rows = []
+    for data in complete_data:
+        shift_settings = shifts.get(data.get('shift_id', 1))
+        day_of_week = datetime.strptime(data['date'], '%Y-%m-%d').weekday()
+
+        values = [
+            data['date'],
+            shift_settings.get('name', 'Default') if shift_settings else 'Default',
+            data['jam_masuk'] or "-",
+            data['jam_keluar'] or "-",
+            data['jam_masuk_lembur'] or "-",
+            data['jam_keluar_lembur'] or "-",
+        ]
+
+        terlambat = 0.0
+        has_attendance = bool(data['jam_masuk'] or data['jam_keluar'])
+        if has_attendance:
+            metrics = calculate_day_metrics(data, shift_settings, day_of_week)
+            terlambat = metrics['terlambat']
+            values += [
+                format_time_duration(metrics['jam_kerja']),
+                format_time_duration(metrics['jam_lembur']) if metrics['jam_lembur'] > 0 else "-",
+                format_time_duration(metrics['loyalitas'] / 60, "menit_only") if metrics['loyalitas'] > 0 else "-",
+                format_time_duration(metrics['overtime']) if metrics['overtime'] > 0 else "-",
+                format_time_duration(terlambat / 60, "menit_only") if terlambat > 0 else "-",
+                "Hadir"
+            ]
+        else:
+            values += ["-", "-", "-", "-", "-", "Minggu" if day_of_week == 6 else "Tidak Hadir"]
+
+        values.append(data.get('keterangan', '') or "-")
+
+        rows.append({
+            'values': values,
+            'day_of_week': day_of_week,
+            'has_attendance': has_attendance,
+            'terlambat': terlambat
+        })
+
+    return rows
+
+
+def get_employee_violations(db_manager, employee_id, start_date, end_date):
+    """Daftar pelanggaran satu karyawan dalam periode, lengkap dengan durasi"""
+    return [{
+        'date': violation['date'],
+        'start_time': violation['start_time'],
+        'end_time': violation['end_time'],
+        'description': violation['description'],
+        'duration_minutes': violation['duration_minutes']
+    } for violation in db_manager.get_violations_by_date_range(start_date, end_date, employee_id)]
+
+
+@profiled("export.export_employee_report_xlsx")
+def export_employee_report_xlsx(db_manager, file_path, employee_id, employee_name, start_date, end_date):
+    """Export laporan karyawan satuan ke Excel dengan tanggal lengkap termasuk hari kosong"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+
+    rows = build_employee_report_table(db_manager, employee_id, start_date, end_date)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Laporan Absensi"
+
+    # Define styles
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_alignment = Alignment(horizontal="center", vertical="center")
+    border = Border(
+        left=Side(style="thin"),
+        right=Side(style="thin"),
+        top=Side(style="thin"),
+        bottom=Side(style="thin")
+    )
+
+    # Add title
+    ws.merge_cells("A1:M1")  # 13 kolom (tanpa pelanggaran)
+    title_cell = ws["A1"]
+    title_cell.value = f"LAPORAN ABSENSI - {employee_name.upper()}"
+    title_cell.font = Font(bold=True, size=14)
+    title_cell.alignment = Alignment(horizontal="center")
+
+    # Add period info
+    ws.merge_cells("A2:M2")
+    period_cell = ws["A2"]
+    period_cell.value = f"Periode: {start_date} s/d {end_date} (Termasuk hari kosong)"
+    period_cell.font = Font(bold=True)
+    period_cell.alignment = Alignment(horizontal="center")
+
+    for col, header in enumerate(EMPLOYEE_REPORT_HEADERS, 1):
+        cell = ws.cell(row=4, column=col)
+        cell.value = header
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        cell.border = border
+
+    orange_fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")
+    red_fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+
+    for row, report_row in enumerate(rows):
+        excel_row = row + 5
+        for col, value in enumerate(report_row['values'], 1):
+            ws.cell(row=excel_row, column=col).value = value
+
+        if report_row['has_attendance']:
+            # Highlight orange hanya pada cell keterlambatan (kolom 11)
+            if report_row['terlambat'] > 0:
+                ws.cell(row=excel_row, column=11).fill = orange_fill
+        elif report_row['day_of_week'] == 6:
+            # Highlight Sunday rows with red color
+            for col in range(1, 14):
+                ws.cell(row=excel_row, column=col).fill = red_fill
+
+        # Apply borders to all cells
+        for col in range(1, 14):
+            ws.cell(row=excel_row, column=col).border = border
+
+            # Center align for certain columns
+            if col in [1, 2, 3, 4, 5, 6, 12]:  # Date, time columns, status
+                ws.cell(row=excel_row, column=col).alignment = Alignment(horizontal="center")
+            else:
+                ws.cell(row=excel_row, column=col).alignment = Alignment(horizontal="left", vertical="center")
+
+    # Add summary
+    summary_row = len(rows) + 6
+    ws.merge_cells(f"A{summary_row}:M{summary_row}")
+    summary_cell = ws[f"A{summary_row}"]
+    summary_cell.value = f"Laporan lengkap periode {start_date} s/d {end_date} - Total {len(rows)} hari (termasuk hari kosong)"
+    summary_cell.font = Font(bold=True)
+    summary_cell.alignment = Alignment(horizontal="center")
+
+    # Auto-adjust column widths for attendance table (only up to summary_row)
+    for col_num in range(1, 14):  # Columns A to M (1 to 13)
+        column_letter = get_column_letter(col_num)
+        max_length = 0
+
+        for row_num in range(1, summary_row + 1):
+            cell = ws.cell(row=row_num, column=col_num)
+            # Skip merged cells
+            if hasattr(cell, 'coordinate') and cell.coordinate in ws.merged_cells:
+                continue
+            try:
+                if cell.value and len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except:
+                pass
+
+        # Set column width (minimum 10, maximum 25)
+        ws.column_dimensions[column_letter].width = min(max(max_length + 2, 10), 25)
+
+    # Add violations table
+    violations_end_row = _add_violations_table(ws, summary_row + 3, db_manager, employee_id, start_date, end_date)
+
+    # Add shift rules section
+    _add_shift_rules(ws, violations_end_row + 2, db_manager, employee_id)
+
+    wb.save(file_path)
+    return file_path
+
+
+@profiled("export.export_employee_report_csv")
+def export_employee_report_csv(db_manager, file_path, employee_id, employee_name, start_date, end_date):
+    """Export laporan karyawan satuan ke CSV"""
+    rows = build_employee_report_table(db_manager, employee_id, start_date, end_date)
+
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(EMPLOYEE_REPORT_HEADERS)
+        for report_row in rows:
+            writer.writerow(report_row['values'])
+    return file_path
+
+
+def _add_violations_table(ws, start_row, db_manager, employee_id, start_date, end_date):
+    """Add violations table to Excel below attendance report"""
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+
+    try:
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="DC3545", end_color="DC3545", fill_type="solid")  # Red for violations
+        header_alignment = Alignment(horizontal="center", vertical="center")
+        border = Border(
+            left=Side(style="thin"),
+            right=Side(style="thin"),
+            top=Side(style="thin"),
+            bottom=Side(style="thin")
+        )
+
+        violations = get_employee_violations(db_manager, employee_id, start_date, end_date)
+
+        # Add spacing
+        current_row = start_row + 2
+
+        # Title
+        ws.merge_cells(f"A{current_row}:E{current_row}")
+        title_cell = ws[f"A{current_row}"]
+        title_cell.value = "LAPORAN PELANGGARAN"
+        title_cell.alignment = Alignment(horizontal="center")
+        title_cell.fill = PatternFill(start_color="DC3545", end_color="DC3545", fill_type="solid")
+        title_cell.font = Font(bold=True, size=14, color="FFFFFF")
+
+        current_row += 2
+
+        headers = ["Tanggal", "Hari", "Rentang Waktu", "Durasi", "Keterangan"]
+        for col, header in enumerate(headers, 1):
+            cell = ws.cell(row=current_row, column=col)
+            cell.value = header
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            cell.border = border
+
+        current_row += 1
+
+        if violations:
+            for violation in violations:
+                day_name = DAY_NAMES[datetime.strptime(violation['date'], '%Y-%m-%d').weekday()]
+                values = [
+                    (violation['date'], "center"),
+                    (day_name, "center"),
+                    (f"{violation['start_time']} - {violation['end_time']}", "center"),
+                    (format_duration(violation['duration_minutes']), "center"),
+                    (violation['description'] or "-", "left"),
+                ]
+                for col, (value, align) in enumerate(values, 1):
+                    cell = ws.cell(row=current_row, column=col)
+                    cell.value = value
+                    cell.alignment = Alignment(horizontal=align)
+                    cell.border = border
+
+                current_row += 1
+        else:
+            ws.merge_cells(f"A{current_row}:E{current_row}")
+            no_data_cell = ws[f"A{current_row}"]
+            no_data_cell.value = "Tidak ada pelanggaran dalam periode ini"
+            no_data_cell.alignment = Alignment(horizontal="center")
+            no_data_cell.font = Font(italic=True)
+            current_row += 1
+
+        # Column widths for violations table
+        col_widths = {1: 15, 2: 12, 3: 25, 4: 15, 5: 40}
+        for col_num, width in col_widths.items():
+            ws.column_dimensions[get_column_letter(col_num)].width = width
+
+        return current_row
+
+    except Exception as e:
+        print(f"Error adding violations table: {e}")
+        return start_row + 10  # Fallback row
+
+
+def _add_shift_rules(ws, start_row, db_manager, employee_id):
+    """Add shift rules section to Excel"""
+    from openpyxl.styles import Font, Alignment
+
+    try:
+        employee_info = None
+        for emp in db_manager.get_employees_with_shifts():
+            if emp['id'] == employee_id:
+                employee_info = emp
+                break
+
+        if not employee_info or not employee_info['shift_id']:
+            return
+
+        shift_settings = db_manager.get_shift_by_id(employee_info['shift_id'])
+        if not shift_settings:
+            return
+
+        def merged_row(row, value, font=None, centered=False):
+            ws.merge_cells(f"A{row}:M{row}")  # 13 kolom (tanpa pelanggaran)
+            cell = ws[f"A{row}"]
+            cell.value = value
+            if font:
+                cell.font = font
+            if centered:
+                cell.alignment = Alignment(horizontal="center")
+
+        merged_row(start_row, "PERATURAN SHIFT", Font(bold=True, size=12), centered=True)
+        current_row = start_row + 2
+
+        merged_row(current_row, f"SHIFT: {shift_settings['name']}", Font(bold=True), centered=True)
+        current_row += 2
+
+        sections = [
+            ("SENIN - JUMAT:", [
+                f"• Jam Masuk Kerja: {shift_settings['weekday_work_start']}",
+                f"• Jam Keluar Kerja: {shift_settings['weekday_work_end']}",
+                f"• Jam Masuk Lembur: {shift_settings['weekday_overtime_start']}",
+                f"• Jam Keluar Lembur: {shift_settings['weekday_overtime_end']}",
+                f"• Batas Overtime: {shift_settings['weekday_overtime_limit']}"
+            ]),
+            ("SABTU:", [
+                f"• Jam Masuk Kerja: {shift_settings['saturday_work_start']}",
+                f"• Jam Keluar Kerja: {shift_settings['saturday_work_end']}",
+                f"• Jam Masuk Lembur: {shift_settings['saturday_overtime_start']}",
+                f"• Jam Keluar Lembur: {shift_settings['saturday_overtime_end']}",
+                f"• Batas Overtime: {shift_settings['saturday_overtime_limit']}"
+            ]),
+            ("MINGGU:", [
+                "• Hitung durasi kerja saja (tidak ada lembur/overtime)"
+            ]),
+            ("PENGATURAN UMUM:", [
+                f"• Toleransi Keterlambatan: {shift_settings['late_tolerance']} menit",
+                f"• Mode Overtime: {shift_settings['overtime_mode'].replace('_', ' ').title()}"
+            ]),
+        ]
+
+        for title, rules in sections:
+            merged_row(current_row, title, Font(bold=True))
+            current_row += 1
+            for rule in rules:
+                merged_row(current_row, rule)
+                current_row += 1
+            current_row += 1
+
+    except Exception as e:
+        print(f"Error adding shift rules: {e}")
+
+
+# ==================== LAPORAN KEHADIRAN SEMUA KARYAWAN ====================
+
+def matrix_cell_status(attendance, leaves):
+    """Status satu sel matrix kehadiran: 'izin', 'lengkap', 'tidak_lengkap' atau None"""
+    if leaves:
+        return 'izin'
+    has_masuk, has_keluar = attendance_presence(attendance)
+    if has_masuk and has_keluar:
+        return 'lengkap'
+    if has_masuk or has_keluar:
+        return 'tidak_lengkap'
+    return None
+
+
+def build_attendance_matrix_table(db_manager, employees, dates, attendance_data):
+    """Isi matrix kehadiran: per karyawan daftar (status, jumlah izin) per tanggal,
+    total hadir per karyawan dan total hadir per tanggal"""
+    calendar = LeaveCalendar(db_manager, dates[0], dates[-1]) if dates else LeaveCalendar()
+    rows = []
+    for employee in employees:
+        cells = []
+        total_present = 0
+        for date in dates:
+            date_str = date.strftime('%Y-%m-%d')
+            attendance = attendance_data[employee['id']].get(date_str)
+            leaves = calendar.leaves(employee['id'], date_str)
+            status = matrix_cell_status(attendance, leaves)
+            if status:
+                total_present += 1  # Izin dihitung hadir
+            cells.append((status, len(leaves)))
+        rows.append({'employee': employee, 'cells': cells, 'total_present': total_present})
+
+    # Total per tanggal hanya menghitung data absensi (tanpa izin)
+    date_totals = []
+    for date in dates:
+        date_str = date.strftime('%Y-%m-%d')
+        total_present_on_date = 0
+        for employee in employees:
+            has_masuk, has_keluar = attendance_presence(attendance_data[employee['id']].get(date_str))
+            if has_masuk or has_keluar:
+                total_present_on_date += 1
+        date_totals.append(total_present_on_date)
+
+    return rows, date_totals
+
+
+def matrix_headers(dates):
+    """Header kolom matrix kehadiran"""
+    headers = ["Nama Karyawan"]
+    for date in dates:
+        day_name = DAY_NAMES[date.weekday()][:3]
+        headers.append(f"{day_name}, {date.strftime('%d/%m')}")
+    headers.append("Total Hadir")
+    return headers
+
+
+@profiled("export.export_attendance_matrix_xlsx")
+def export_attendance_matrix_xlsx(db_manager, file_path, employees, dates, attendance_data, progress=None):
+    """Export laporan kehadiran semua karyawan ke Excel"""
+    _report_progress(progress, 10)
+
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Laporan Kehadiran"
+
+    # Title
+    last_col = get_column_letter(len(dates) + 2)  # +2 for name column and total column
+    ws.merge_cells(f'A1:{last_col}1')
+    ws['A1'] = "LAPORAN KEHADIRAN SEMUA KARYAWAN"
+    ws['A1'].font = Font(size=16, bold=True)
+    ws['A1'].alignment = Alignment(horizontal='center')
+
+    # Period info
+    period_text = f"Periode: {dates[0].strftime('%d/%m/%Y')} - {dates[-1].strftime('%d/%m/%Y')}"
+    ws.merge_cells(f'A2:{last_col}2')
+    ws['A2'] = period_text
+    ws['A2'].font = Font(size=12, bold=True)
+    ws['A2'].alignment = Alignment(horizontal='center')
+
+    _report_progress(progress, 30)
+
+    headers = matrix_headers(dates)
+    sunday_fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+    total_fill = PatternFill(start_color="F0F8FF", end_color="F0F8FF", fill_type="solid")
+
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=4, column=col)
+        cell.value = header
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center')
+        cell.fill = PatternFill(start_color="E9ECEF", end_color="E9ECEF", fill_type="solid")
+
+        # Highlight Sunday columns
+        if 1 < col <= len(dates) + 1 and dates[col - 2].weekday() == 6:
+            cell.fill = sunday_fill
+
+    _report_progress(progress, 50)
+
+    rows, date_totals = build_attendance_matrix_table(db_manager, employees, dates, attendance_data)
+
+    for row, matrix_row in enumerate(rows, 5):
+        ws.cell(row=row, column=1).value = matrix_row['employee']['name']
+
+        for col, (date, (status, leave_count)) in enumerate(zip(dates, matrix_row['cells']), 2):
+            cell = ws.cell(row=row, column=col)
+
+            if status == 'izin':
+                cell.value = f"Izin ({leave_count})" if leave_count > 1 else "Izin"
+                cell.fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")  # Light green
+            elif status == 'lengkap':
+                cell.value = "✅"
+            elif status == 'tidak_lengkap':
+                cell.value = "✅"
+                cell.fill = PatternFill(start_color="FF8C00", end_color="FF8C00", fill_type="solid")
+
+            # Highlight Sundays
+            if date.weekday() == 6:
+                if not cell.fill.start_color or cell.fill.start_color.rgb == "00000000":
+                    cell.fill = sunday_fill
+
+            cell.alignment = Alignment(horizontal='center')
+
+        total_cell = ws.cell(row=row, column=len(dates) + 2)
+        total_cell.value = matrix_row['total_present']
+        total_cell.alignment = Alignment(horizontal='center')
+        total_cell.fill = total_fill
+
+    _report_progress(progress, 70)
+
+    # Summary row
+    summary_row = len(employees) + 5
+    ws.cell(row=summary_row, column=1).value = "TOTAL HADIR"
+    ws.cell(row=summary_row, column=1).font = Font(bold=True)
+    ws.cell(row=summary_row, column=1).fill = total_fill
+
+    for col, (date, total_present_on_date) in enumerate(zip(dates, date_totals), 2):
+        cell = ws.cell(row=summary_row, column=col)
+        cell.value = total_present_on_date
+        cell.alignment = Alignment(horizontal='center')
+        cell.font = Font(bold=True)
+        cell.fill = sunday_fill if date.weekday() == 6 else total_fill
+
+    _report_progress(progress, 90)
+
+    # Legend
+    legend_row = summary_row + 3
+    ws.cell(row=legend_row, column=1).value = "KETERANGAN:"
+    ws.cell(row=legend_row, column=1).font = Font(bold=True)
+
+    ws.cell(row=legend_row + 1, column=1).value = "✅ = Hadir lengkap (jam masuk & keluar)"
+    ws.cell(row=legend_row + 2, column=1).value = "✅ (orange) = Hadir tidak lengkap (salah satu jam kosong)"
+    ws.cell(row=legend_row + 3, column=1).value = "Izin (hijau) = Karyawan izin"
+    ws.cell(row=legend_row + 4, column=1).value = "(kosong) = Tidak hadir"
+    ws.cell(row=legend_row + 5, column=1).value = "(merah) = Hari Minggu"
+
+    # Column widths
+    for col in range(1, len(headers) + 1):
+        col_letter = get_column_letter(col)
+        if col == 1:  # Name column
+            ws.column_dimensions[col_letter].width = 25
+        elif col == len(headers):  # Total column
+            ws.column_dimensions[col_letter].width = 12
+        else:  # Date columns
+            ws.column_dimensions[col_letter].width = 10
+
+    wb.save(file_path)
+
+    _report_progress(progress, 100)
+    return file_path
+
+
+@profiled("export.export_attendance_matrix_csv")
+def export_attendance_matrix_csv(db_manager, file_path, employees, dates, attendance_data, progress=None):
+    """Export laporan kehadiran semua karyawan ke CSV"""
+    rows, date_totals = build_attendance_matrix_table(db_manager, employees, dates, attendance_data)
+    cell_text = {'lengkap': "Hadir", 'tidak_lengkap': "Tidak Lengkap", None: ""}
+
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(matrix_headers(dates))
+        for matrix_row in rows:
+            values = [matrix_row['employee']['name']]
+            for status, leave_count in matrix_row['cells']:
+                if status == 'izin':
+                    values.append(f"Izin ({leave_count})" if leave_count > 1 else "Izin")
+                else:
+                    values.append(cell_text[status])
+            values.append(matrix_row['total_present'])
+            writer.writerow(values)
+        writer.writerow(["TOTAL HADIR"] + date_totals + [""])
+
+    _report_progress(progress, 100)
+    return file_path
+
+
+# ==================== LAPORAN PELANGGARAN SEMUA KARYAWAN ====================
+
+def build_violation_report_table(employees, violation_data):
+    """Baris laporan pelanggaran dikelompokkan per karyawan, urut tanggal
+
+    Returns:
+        list of (emp_data, violations_sorted) untuk karyawan yang memiliki pelanggaran
+    """
+    groups = []
+    for employee in employees:
+        emp_data = violation_data[employee['id']]
+        if not emp_data['violations']:
+            continue  # Skip employees without violations
+        groups.append((emp_data, sorted(emp_data['violations'], key=lambda x: x['date'])))
+    return groups
+
+
+def violation_day_name(date_str):
+    """Nama hari singkat (SEN..MIN) untuk tanggal pelanggaran"""
+    try:
+        return DAY_NAMES_SHORT[datetime.strptime(date_str, '%Y-%m-%d').weekday()]
+    except:
+        return ""
+
+
+@profiled("export.export_violation_report_xlsx")
+def export_violation_report_xlsx(file_path, employees, violation_data, start_date, end_date, progress=None):
+    """Export laporan pelanggaran semua karyawan ke Excel"""
+    _report_progress(progress, 10)
+
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Laporan Pelanggaran"
+
+    # Title
+    ws.merge_cells('A1:D1')
+    ws['A1'] = "LAPORAN PELANGGARAN & KETERLAMBATAN SEMUA KARYAWAN"
+    ws['A1'].font = Font(size=16, bold=True)
+    ws['A1'].alignment = Alignment(horizontal='center')
+
+    # Period info
+    period_text = f"Periode: {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}"
+    ws.merge_cells('A2:D2')
+    ws['A2'] = period_text
+    ws['A2'].font = Font(size=12, bold=True)
+    ws['A2'].alignment = Alignment(horizontal='center')
+
+    _report_progress(progress, 30)
+
+    for col, header in enumerate(VIOLATION_REPORT_HEADERS, 1):
+        cell = ws.cell(row=4, column=col)
+        cell.value = header
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center')
+        cell.fill = PatternFill(start_color="E9ECEF", end_color="E9ECEF", fill_type="solid")
+
+    _report_progress(progress, 50)
+
+    current_row = 5
+    for emp_data, violations_sorted in build_violation_report_table(employees, violation_data):
+        for i, violation in enumerate(violations_sorted):
+            # Employee name (only on first row for each employee)
+            if i == 0:
+                name_cell = ws.cell(row=current_row, column=1)
+                name_cell.value = emp_data['name'].upper()
+                name_cell.font = Font(bold=True)
+                name_cell.fill = PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid")  # Light blue
+                name_cell.alignment = Alignment(horizontal='center', vertical='center')
+
+                # Merge cells if multiple violations
+                if len(violations_sorted) > 1:
+                    ws.merge_cells(start_row=current_row, start_column=1,
+                                   end_row=current_row + len(violations_sorted) - 1, end_column=1)
+
+            for col, value in enumerate([
+                violation['date'],
+                violation_day_name(violation['date']),
+                f"{violation['start_time']} - {violation['end_time']}",
+                violation['duration_text']
+            ], 2):
+                cell = ws.cell(row=current_row, column=col)
+                cell.value = value
+                cell.alignment = Alignment(horizontal='center')
+
+            ws.cell(row=current_row, column=6).value = violation['description'].upper()
+
+            current_row += 1
+
+    _report_progress(progress, 90)
+
+    # Summary section
+    summary_row = current_row + 2
+    ws.cell(row=summary_row, column=1).value = "RINGKASAN:"
+    ws.cell(row=summary_row, column=1).font = Font(bold=True)
+
+    total_violations = sum(len(emp_data['violations']) for emp_data in violation_data.values())
+    total_time_minutes = sum(emp_data['total_time_minutes'] for emp_data in violation_data.values())
+    employees_with_violations = sum(1 for emp_data in violation_data.values() if emp_data['violations'])
+
+    ws.cell(row=summary_row + 1, column=1).value = f"• Total karyawan dengan pelanggaran: {employees_with_violations}"
+    ws.cell(row=summary_row + 2, column=1).value = f"• Total pelanggaran: {total_violations}"
+    ws.cell(row=summary_row + 3, column=1).value = f"• Total waktu pelanggaran: {format_duration(total_time_minutes)}"
+
+    ws.column_dimensions['A'].width = 15  # NAMA
+    ws.column_dimensions['B'].width = 12  # TANGGAL
+    ws.column_dimensions['C'].width = 8   # HARI
+    ws.column_dimensions['D'].width = 25  # WAKTU
+    ws.column_dimensions['E'].width = 35  # NOTE
+
+    wb.save(file_path)
+
+    _report_progress(progress, 100)
+    return file_path
+
+
+@profiled("export.export_violation_report_csv")
+def export_violation_report_csv(file_path, employees, violation_data, start_date, end_date, progress=None):
+    """Export laporan pelanggaran semua karyawan ke CSV"""
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(VIOLATION_REPORT_HEADERS)
+        for emp_data, violations_sorted in build_violation_report_table(employees, violation_data):
+            for violation in violations_sorted:
+                writer.writerow([
+                    emp_data['name'].upper(),
+                    violation['date'],
+                    violation_day_name(violation['date']),
+                    f"{violation['start_time']} - {violation['end_time']}",
+                    violation['duration_text'],
+                    violation['description'].upper()
+                ])
+
+    _report_progress(progress, 100)
+    return file_path
@@ -0,0 +1,482 @@
+"""
+Log query SQL opt-in dengan deteksi query lambat dan pola N+1.
+
+Aktifkan dengan `python app.py --sql-trace`, `python -m absensi --sql-trace ...`
+atau environment variable ABSENSI_SQL_TRACE=1. Koneksi dari
+`DatabaseManager.get_connection` lalu memakai `TracedConnection`:
+teks statement diambil dari `set_trace_callback` (termasuk BEGIN/COMMIT dan
+PRAGMA), waktunya diukur di execute/fetch.
+
+- Query dikelompokkan berdasarkan teks yang dinormalisasi (literal → ?).
+- Query di atas ABSENSI_SQL_SLOW_MS (default 50 ms) dicatat sebagai query lambat.
+- Statement yang sama dijalankan lebih dari ABSENSI_SQL_N_PLUS_ONE kali
+  (default 10) dalam satu aksi UI dilaporkan sebagai pola N+1 beserta lokasi
+  pemanggil di kode Python.
+
+Satu "aksi" adalah satu blok `with action(nama)`, atau (di GUI, lewat
+`set_action_scheduler`) semua query sampai event loop Qt kembali idle.
+Hasilnya bisa dilihat di dialog Diagnostik dan ditulis ke JSON saat exit
+(default: sql_trace_YYYYmmdd_HHMMSS.json, atau path di ABSENSI_SQL_TRACE_FILE).
+"""
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+FLAG = '--sql-trace'
+ENV_VAR = 'ABSENSI_SQL_TRACE'
+ENV_FILE = 'ABSENSI_SQL_TRACE_FILE'
+ENV_SLOW_MS = 'ABSENSI_SQL_SLOW_MS'
+ENV_N_PLUS_ONE = 'ABSENSI_SQL_N_PLUS_ONE'
+
+DEFAULT_SLOW_MS = 50.0
+DEFAULT_N_PLUS_ONE = 10
+MAX_SLOW_LOG = 200
+MAX_FINDINGS = 100
+
+# Frame dari file ini dilewati saat mencari lokasi pemanggil
+_INTERNAL_FILES = {'sql_trace.py', 'profiling.py', 'database.py'}
+
+_enabled = False
+_dump_registered = False
+_slow_threshold = DEFAULT_SLOW_MS / 1000.0
+_n_plus_one_threshold = DEFAULT_N_PLUS_ONE
+_scheduler = None
+
+_lock = threading.Lock()
+_local = threading.local()
+_queries = {}
+_slow = deque(maxlen=MAX_SLOW_LOG)
+_findings = deque(maxlen=MAX_FINDINGS)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+# Setup koneksi dan kontrol transaksi ikut berulang bersama query aslinya,
+# jadi tidak dihitung terpisah sebagai pola N+1
+_NOT_N_PLUS_ONE = re.compile(r"^(PRAGMA|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """Teks SQL tanpa literal dan spasi berlebih, untuk pengelompokan"""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _VALUE_LIST.sub('(?, ...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip().rstrip(';')
+
+
+# ==================== KONFIGURASI ====================
+
+def is_enabled():
+    return _enabled
+
+
+def enable(slow_ms=None, n_plus_one=None, dump_on_exit=True):
+    """Aktifkan trace SQL (dan dump JSON saat exit)"""
+    global _enabled, _dump_registered
+    if slow_ms is None:
+        slow_ms = _env_number(ENV_SLOW_MS, DEFAULT_SLOW_MS)
+    if n_plus_one is None:
+        n_plus_one = int(_env_number(ENV_N_PLUS_ONE, DEFAULT_N_PLUS_ONE))
+    set_thresholds(slow_ms, n_plus_one)
+    _enabled = True
+    if dump_on_exit and not _dump_registered:
+        atexit.register(_dump_at_exit)
+        _dump_registered = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def enable_from_argv(argv=None):
+    """Aktifkan trace jika ada flag --sql-trace atau env ABSENSI_SQL_TRACE=1"""
+    argv = sys.argv if argv is None else argv
+    requested = os.environ.get(ENV_VAR, '').strip() not in ('', '0')
+    if FLAG in argv:
+        argv.remove(FLAG)
+        requested = True
+    if requested:
+        enable()
+    return _enabled
+
+
+def set_thresholds(slow_ms=None, n_plus_one=None):
+    """Ubah batas query lambat (ms) dan batas N+1 (jumlah per aksi)"""
+    global _slow_threshold, _n_plus_one_threshold
+    if slow_ms is not None:
+        _slow_threshold = max(0.0, float(slow_ms)) / 1000.0
+    if n_plus_one is not None:
+        _n_plus_one_threshold = max(1, int(n_plus_one))
+
+
+def get_thresholds():
+    return _slow_threshold * 1000.0, _n_plus_one_threshold
+
+
+def set_action_scheduler(scheduler):
+    """Callable(callback) yang menjalankan callback saat event loop idle
+
+    Dipakai GUI (QTimer.singleShot(0, ...)) agar query di luar blok
+    `action()` tetap dikelompokkan per aksi UI.
+    """
+    global _scheduler
+    _scheduler = scheduler
+
+
+def reset():
+    with _lock:
+        _queries.clear()
+        _slow.clear()
+        _findings.clear()
+
+
+def _env_number(name, default):
+    try:
+        return float(os.environ.get(name, ''))
+    except ValueError:
+        return default
+
+
+# ==================== AKSI (DETEKSI N+1) ====================
+
+class _Action:
+    __slots__ = ('name', 'counts', 'callers', 'times')
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = Counter()
+        self.callers = {}
+        self.times = Counter()
+
+
+def _current_action():
+    return getattr(_local, 'action', None)
+
+
+@contextmanager
+def action(name):
+    """Kelompokkan query di dalam blok sebagai satu aksi (untuk deteksi N+1)
+
+    Blok bersarang ikut dihitung ke aksi terluar.
+    """
+    if _current_action() is not None:
+        yield
+        return
+    _local.action = _Action(name)
+    try:
+        yield
+    finally:
+        _finish_action()
+
+
+def _implicit_action_name(default):
+    """Frame kode aplikasi terluar (biasanya slot Qt yang memicu aksi)"""
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    name = default
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if (os.path.dirname(os.path.abspath(code.co_filename)) == project_dir
+                and code.co_name not in ('main', '<module>')):
+            name = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+        frame = frame.f_back
+    return name
+
+
+def _start_implicit_action(caller):
+    _local.action = _Action(_implicit_action_name(caller))
+    try:
+        _scheduler(_finish_action)
+    except Exception:
+        _local.action = None
+
+
+def _finish_action():
+    current = _current_action()
+    _local.action = None
+    if current is None:
+        return
+
+    for key, count in current.counts.items():
+        if count <= _n_plus_one_threshold or _NOT_N_PLUS_ONE.match(key):
+            continue
+        callers = [
+            {'caller': caller, 'method': method, 'count': n}
+            for (caller, method), n in current.callers[key].most_common(5)
+        ]
+        with _lock:
+            _findings.append({
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'action': current.name,
+                'sql': key,
+                'count': count,
+                'total_ms': round(current.times[key] * 1000, 3),
+                'callers': callers
+            })
+
+
+# ==================== PENCATATAN ====================
+
+class _Query:
+    __slots__ = ('calls', 'total', 'max', 'rows', 'slow', 'callers')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.callers = Counter()
+
+
+class _Statement:
+    """Satu eksekusi statement; waktu fetch ditambahkan setelahnya"""
+    __slots__ = ('key', 'sql', 'elapsed', 'caller', 'method', 'flagged')
+
+    def __init__(self, key, sql, elapsed, caller, method):
+        self.key = key
+        self.sql = sql
+        self.elapsed = elapsed
+        self.caller = caller
+        self.method = method
+        self.flagged = False
+
+
+def _call_site():
+    """(lokasi pemanggil di luar database.py, nama method DatabaseManager)"""
+    caller = None
+    method = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        if filename == 'database.py':
+            if method is None and code.co_name != 'get_connection':
+                method = code.co_name
+        elif filename not in _INTERNAL_FILES and 'sqlite3' not in code.co_filename:
+            caller = f"{filename}:{frame.f_lineno} {code.co_name}"
+            break
+        frame = frame.f_back
+    return caller or '?', method or '-'
+
+
+def _flag_slow(statement):
+    statement.flagged = True
+    _queries[statement.key].slow += 1
+    _slow.append({
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'elapsed_ms': round(statement.elapsed * 1000, 3),
+        'sql': statement.sql.strip(),
+        'caller': statement.caller,
+        'method': statement.method
+    })
+
+
+def _record(statements, elapsed):
+    """Catat statement hasil satu execute; kembalikan _Statement terakhir"""
+    caller, method = _call_site()
+    share = elapsed / len(statements)
+    current = _current_action()
+    if current is None and _scheduler is not None and threading.current_thread() is threading.main_thread():
+        _start_implicit_action(caller)
+        current = _current_action()
+
+    statement = None
+    with _lock:
+        for sql in statements:
+            key = normalize_sql(sql)
+            query = _queries.get(key)
+            if query is None:
+                query = _queries[key] = _Query()
+            query.calls += 1
+            query.total += share
+            query.max = max(query.max, share)
+            query.callers[caller] += 1
+
+            statement = _Statement(key, sql, share, caller, method)
+            if share >= _slow_threshold:
+                _flag_slow(statement)
+
+            if current is not None:
+                current.counts[key] += 1
+                current.times[key] += share
+                current.callers.setdefault(key, Counter())[(caller, method)] += 1
+    return statement
+
+
+def _record_fetch(statement, elapsed, rows):
+    """Tambahkan waktu fetch ke statement yang terakhir dijalankan"""
+    with _lock:
+        query = _queries.get(statement.key)
+        if query is None:
+            return
+        statement.elapsed += elapsed
+        query.total += elapsed
+        query.rows += rows
+        query.max = max(query.max, statement.elapsed)
+        if not statement.flagged and statement.elapsed >= _slow_threshold:
+            _flag_slow(statement)
+
+    current = _current_action()
+    if current is not None:
+        current.times[statement.key] += elapsed
+
+
+# ==================== KONEKSI ====================
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor yang mengukur waktu execute/fetch untuk TracedConnection"""
+
+    _statement = None
+
+    def _run(self, method, sql, *args):
+        t0 = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            self._statement = self.connection._take_statements(sql, time.perf_counter() - t0)
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._run(super().executescript, sql_script)
+
+    def _fetched(self, t0, rows):
+        if self._statement is not None:
+            _record_fetch(self._statement, time.perf_counter() - t0, rows)
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(t0, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        rows = super().fetchmany(*args, **kwargs)
+        self._fetched(t0, len(rows))
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(t0, len(rows))
+        return rows
+
+
+class TracedConnection(sqlite3.Connection):
+    """Koneksi dengan set_trace_callback; dipakai saat trace aktif"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = []
+        self.set_trace_callback(self._pending.append)
+
+    def _take_statements(self, fallback_sql, elapsed):
+        statements = self._pending[:] or [fallback_sql]
+        del self._pending[:]
+        return _record(statements, elapsed)
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute bawaan tidak lewat self.cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def _timed(self, method, label):
+        t0 = time.perf_counter()
+        try:
+            return method()
+        finally:
+            if self._pending:
+                self._take_statements(label, time.perf_counter() - t0)
+
+    def commit(self):
+        return self._timed(super().commit, 'COMMIT')
+
+    def rollback(self):
+        return self._timed(super().rollback, 'ROLLBACK')
+
+
+def connection_factory():
+    """Factory untuk sqlite3.connect: TracedConnection saat trace aktif"""
+    return TracedConnection if _enabled else sqlite3.Connection
+
+
+# ==================== LAPORAN ====================
+
+def get_report():
+    """Ringkasan query, query lambat dan temuan N+1"""
+    with _lock:
+        queries = [{
+            'sql': key,
+            'calls': query.calls,
+            'total_ms': round(query.total * 1000, 3),
+            'avg_ms': round(query.total / query.calls * 1000, 3) if query.calls else 0.0,
+            'max_ms': round(query.max * 1000, 3),
+            'rows': query.rows,
+            'slow': query.slow,
+            'callers': [
+                {'caller': caller, 'count': count} for caller, count in query.callers.most_common(3)
+            ]
+        } for key, query in _queries.items()]
+        slow = list(_slow)
+        findings = list(_findings)
+
+    queries.sort(key=lambda item: -item['total_ms'])
+    slow_ms, n_plus_one = get_thresholds()
+    return {
+        'enabled': _enabled,
+        'slow_threshold_ms': slow_ms,
+        'n_plus_one_threshold': n_plus_one,
+        'queries': queries,
+        'slow_queries': slow,
+        'n_plus_one': findings
+    }
+
+
+def dump(path=None):
+    """Tulis laporan trace ke file JSON dan kembalikan path-nya"""
+    if not path:
+        path = os.environ.get(ENV_FILE) or f"sql_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    data = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'argv': sys.argv,
+        **get_report()
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def _dump_at_exit():
+    _finish_action()
+    if not _queries:
+        return
+    try:
+        path = dump()
+        print(f"📊 Trace SQL disimpan ke: {path}", file=sys.stderr)
+    except Exception as e:
+        print(f"⚠️  Gagal menyimpan trace SQL: {e}", file=sys.stderr)
@@ -0,0 +1,95 @@
+"""
+Pengukuran waktu startup aplikasi (opt-in).
+
+Aktifkan dengan `python app.py --startup-timing` atau environment variable
+ABSENSI_STARTUP_TIMING=1. Setelah jendela utama tampil pertama kali, rincian
+waktu per tahap (import, QApplication, MainWindow, first window) dan daftar
+import modul terlama (format mirip `python -X importtime`) dicetak ke stderr.
+
+Tanpa flag, modul ini hanya menyimpan waktu mulai dan tidak memasang hook apa pun.
+"""
+
+import builtins
+import os
+import sys
+import time
+
+FLAG = '--startup-timing'
+ENV_VAR = 'ABSENSI_STARTUP_TIMING'
+
+_start = time.perf_counter()
+_enabled = False
+_marks = []        # (label, detik sejak start)
+_imports = []      # (nama modul, self us, cumulative us, depth)
+_stack = []        # akumulasi waktu import anak per level
+_original_import = builtins.__import__
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable_from_argv(argv=None):
+    """Aktifkan timing jika ada flag --startup-timing atau env ABSENSI_STARTUP_TIMING=1"""
+    argv = sys.argv if argv is None else argv
+    requested = os.environ.get(ENV_VAR, '').strip() not in ('', '0')
+    if FLAG in argv:
+        argv.remove(FLAG)  # Jangan diteruskan ke QApplication
+        requested = True
+    if requested:
+        enable()
+    return _enabled
+
+
+def enable():
+    """Pasang hook import untuk mencatat waktu import setiap modul baru"""
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    builtins.__import__ = _timed_import
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _stack.append(0.0)
+    t0 = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        cumulative = time.perf_counter() - t0
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += cumulative
+        _imports.append((name, (cumulative - children) * 1e6, cumulative * 1e6, len(_stack)))
+
+
+def mark(label):
+    """Catat titik waktu untuk satu tahap startup"""
+    if _enabled:
+        _marks.append((label, time.perf_counter() - _start))
+
+
+def report(stream=None, top=20):
+    """Cetak rincian tahap startup dan import terlama, lalu lepas hook import"""
+    global _enabled
+    if not _enabled:
+        return
+    stream = stream or sys.stderr
+    builtins.__import__ = _original_import
+    _enabled = False
+
+    print("\n⏱️  STARTUP TIMING", file=stream)
+    previous = 0.0
+    for label, elapsed in _marks:
+        print(f"   {label:<28} +{(elapsed - previous) * 1000:8.1f} ms   (total {elapsed * 1000:8.1f} ms)", file=stream)
+        previous = elapsed
+
+    top_level = [entry for entry in _imports if entry[3] == 0]
+    print(f"\n   Import terlama (dari {len(_imports)} modul, {len(top_level)} import langsung):", file=stream)
+    print(f"   {'self [us]':>10} | {'cumulative':>10} | imported package", file=stream)
+    for name, self_us, cumulative_us, depth in sorted(_imports, key=lambda entry: -entry[2])[:top]:
+        print(f"   {self_us:10.0f} | {cumulative_us:10.0f} | {'  ' * depth}{name}", file=stream)
+    stream.flush()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Generator data absensi sintetis untuk benchmark dan uji beban.
+
+- Log mesin absensi dalam format Grid++Report (Work No / Name / Dept. lalu
+  baris jam "\\r\\n08.12\\r\\n16.17\\r\\n"), sebagai CSV ber-ekstensi .xls
+  seperti hasil export mesin, atau .xlsx.
+- Database berisi N karyawan × D hari, lengkap dengan pelanggaran dan izin.
+
+Hasil selalu sama untuk seed yang sama.
+
+Contoh:
+    python synthetic_data.py logs ./logs --employees 50 --days 30 --start 2025-11-01
+    python synthetic_data.py db bench.db --employees 200 --days 90
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+from database import DatabaseManager
+
+FIRST_NAMES = [
+    "RAKA", "NISA", "LARAS", "ELIS", "NIDA", "SEKAR", "PUTRI", "PUTRA", "ANGGIT", "ANDI",
+    "BUDI", "SITI", "DEWI", "AGUS", "RINA", "YUDI", "WATI", "HADI", "LINA", "JOKO",
+    "TONO", "SARI", "EKO", "FITRI", "BAYU", "INDAH", "DIMAS", "AYU", "RIZKY", "MAYA"
+]
+DEPARTMENTS = ["Company", "ADMIN", "PRODUKSI", "GUDANG"]
+LEAVE_TYPES = ["Sakit", "Izin keperluan keluarga", "Cuti tahunan", "Izin setengah hari"]
+VIOLATION_TYPES = ["Keluar kantor tanpa izin", "Istirahat melebihi waktu", "Main HP saat jam kerja", "Tidur saat jam kerja"]
+
+# Jam mulai/selesai kerja per shift (sama dengan shift default di database)
+SHIFT_HOURS = {
+    1: {'weekday': (8, 16), 'saturday': (8, 12)},
+    2: {'weekday': (9, 17), 'saturday': (9, 13)},
+}
+
+LOG_COLUMNS = 23
+EMPLOYEES_PER_PAGE = 8
+DAY_NAMES_EN = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def generate_employees(count, seed=0):
+    """Daftar karyawan: work_no, name (unik), dept, shift_id"""
+    rng = random.Random(seed)
+    employees = []
+    for i in range(count):
+        name = FIRST_NAMES[i % len(FIRST_NAMES)]
+        if i >= len(FIRST_NAMES):
+            name = f"{name} {i // len(FIRST_NAMES) + 1}"
+        employees.append({
+            'work_no': i + 1,
+            'name': name,
+            'dept': rng.choice(DEPARTMENTS),
+            'shift_id': 2 if rng.random() < 0.2 else 1
+        })
+    return employees
+
+
+def _clock(minutes):
+    minutes = max(0, min(minutes, 23 * 60 + 59))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def generate_scans(employee, day, rng):
+    """Daftar jam scan (HH:MM) satu karyawan pada satu hari"""
+    weekday = day.weekday()
+    if weekday == 6:
+        if rng.random() < 0.9:
+            return []
+    elif rng.random() < 0.05:
+        return []
+
+    period = 'saturday' if weekday == 5 else 'weekday'
+    start_hour, end_hour = SHIFT_HOURS[employee['shift_id']][period]
+
+    if rng.random() < 0.1:
+        masuk = start_hour * 60 + rng.randint(1, 40)  # Terlambat
+    else:
+        masuk = start_hour * 60 - rng.randint(0, 25)
+    keluar = end_hour * 60 + rng.randint(0, 70)
+    scans = [masuk, keluar]
+
+    if rng.random() < 0.03:
+        scans = scans[:1]  # Lupa scan pulang
+    elif rng.random() < 0.25:
+        masuk_lembur = keluar + rng.randint(60, 150)
+        scans += [masuk_lembur, masuk_lembur + rng.randint(90, 240)]
+
+    if rng.random() < 0.02:
+        scans.append(scans[-1] + rng.randint(1, 5))  # Scan ganda (anomali)
+
+    return [_clock(minutes) for minutes in scans]
+
+
+def scans_to_record(name, scans):
+    """Record dalam bentuk hasil ExcelProcessor.process_excel_log"""
+    return {
+        "Nama": name,
+        "Jam Masuk": scans[0] if len(scans) > 0 else None,
+        "Jam Keluar": scans[1] if len(scans) > 1 else None,
+        "Jam Masuk Lembur": scans[2] if len(scans) > 2 else None,
+        "Jam Keluar Lembur": scans[3] if len(scans) > 3 else None,
+        "Jam Anomali": scans[4:],
+        "Total Scan": len(scans)
+    }
+
+
+def generate_day(employees, day, seed=0):
+    """{nama: [jam scan]} untuk satu hari; deterministik per (seed, tanggal)"""
+    rng = random.Random(f"{seed}-{day.isoformat()}")
+    return {employee['name']: generate_scans(employee, day, rng) for employee in employees}
+
+
+def _log_header_rows(day, print_day):
+    date_text = day.strftime('%d/%m/%Y')
+    rows = [[""] * LOG_COLUMNS for _ in range(3)]
+    rows[0][0] = "Attendance log"
+    rows[1][0] = f"Attendance Date: {date_text} to {date_text}"
+    rows[1][22] = f"Print Time:{print_day.strftime('%d/%m/%Y')}"
+    rows[2][0] = f"{day.day}\r\n\r\n{DAY_NAMES_EN[day.weekday()]}"
+    return rows
+
+
+def build_log_rows(employees, day, day_scans):
+    """Baris-baris laporan Grid++Report untuk satu hari (hanya karyawan yang scan)"""
+    print_day = day + timedelta(days=1)
+    present = [employee for employee in employees if day_scans.get(employee['name'])]
+    rows = []
+    for index, employee in enumerate(present):
+        if index % EMPLOYEES_PER_PAGE == 0:
+            rows += _log_header_rows(day, print_day)
+
+        info = [""] * LOG_COLUMNS
+        info[0], info[2] = "Work No", employee['work_no']
+        info[6], info[8] = "Name", employee['name']
+        info[14], info[16] = "Dept.", employee['dept']
+        rows.append(info)
+
+        times = [""] * LOG_COLUMNS
+        times[0] = "\r\n" + "\r\n".join(s.replace(':', '.') for s in day_scans[employee['name']]) + "\r\n"
+        rows.append(times)
+    return rows
+
+
+def write_attendance_log(file_path, employees, day, day_scans):
+    """Tulis satu file log; format mengikuti ekstensi (.xlsx, selain itu CSV)"""
+    rows = build_log_rows(employees, day, day_scans)
+
+    if file_path.lower().endswith('.xlsx'):
+        from openpyxl import Workbook
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Grid++Report"
+        for row in rows:
+            ws.append([value if value != "" else None for value in row])
+        wb.save(file_path)
+        return file_path
+
+    with open(file_path, 'w', newline='', encoding='latin1') as f:
+        csv.writer(f).writerows(rows)
+    return file_path
+
+
+def generate_logs(output_dir, employees, start_date, days, seed=0, extension='.xls'):
+    """Tulis satu log per hari ke output_dir; kembalikan list (path, tanggal, jumlah karyawan hadir)"""
+    os.makedirs(output_dir, exist_ok=True)
+    files = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        day_scans = generate_day(employees, day, seed)
+        file_path = os.path.join(output_dir, f"Attendance log {day.isoformat()}{extension}")
+        write_attendance_log(file_path, employees, day, day_scans)
+        files.append((file_path, day, sum(1 for scans in day_scans.values() if scans)))
+    return files
+
+
+def generate_database(db_path, employees, start_date, days, seed=0,
+                      violation_rate=0.08, leave_rate=0.6):
+    """Isi database dengan absensi, pelanggaran dan izin sintetis
+
+    Absensi disimpan lewat `save_attendance_data` (jalur yang sama dengan
+    import). Pelanggaran dipasang pada `violation_rate` dari hari hadir;
+    `leave_rate` dari hari tidak hadir (selain Minggu) diberi izin.
+
+    Returns:
+        dict jumlah data yang dibuat
+    """
+    rng = random.Random(seed)
+    db_manager = DatabaseManager(db_path)
+
+    for employee in employees:
+        employee_id = db_manager.add_or_get_employee(employee['name'])
+        if employee['shift_id'] != 1:
+            db_manager.assign_employee_shift(employee_id, employee['shift_id'])
+
+    attendance_count = 0
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        day_scans = generate_day(employees, day, seed)
+        records = [scans_to_record(name, scans) for name, scans in day_scans.items() if scans]
+        db_manager.save_attendance_data(day.isoformat(), records, mode='replace')
+        attendance_count += len(records)
+
+    violations = []
+    leaves = []
+    conn = db_manager.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, date FROM attendance WHERE date BETWEEN ? AND ? ORDER BY id', (
+            start_date.isoformat(), (start_date + timedelta(days=days - 1)).isoformat()
+        ))
+        for attendance_id, _ in cursor.fetchall():
+            if rng.random() < violation_rate:
+                start = rng.randint(9 * 3600, 15 * 3600)
+                end = start + rng.randint(5 * 60, 90 * 60)
+                violations.append((
+                    attendance_id,
+                    f"{start // 3600:02d}:{start % 3600 // 60:02d}:{start % 60:02d}",
+                    f"{end // 3600:02d}:{end % 3600 // 60:02d}:{end % 60:02d}",
+                    rng.choice(VIOLATION_TYPES)
+                ))
+
+        cursor.execute('SELECT id, name FROM employees')
+        employee_ids = dict((name, employee_id) for employee_id, name in cursor.fetchall())
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            if day.weekday() == 6:
+                continue
+            for name, scans in generate_day(employees, day, seed).items():
+                if not scans and rng.random() < leave_rate:
+                    leaves.append((employee_ids[name], day.isoformat(), rng.choice(LEAVE_TYPES)))
+
+        cursor.executemany(
+            'INSERT INTO violations (attendance_id, start_time, end_time, description) VALUES (?, ?, ?, ?)',
+            violations
+        )
+        cursor.executemany('INSERT INTO leaves (employee_id, date, description) VALUES (?, ?, ?)', leaves)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        conn.close()
+
+    return {
+        'employees': len(employees),
+        'days': days,
+        'attendance': attendance_count,
+        'violations': len(violations),
+        'leaves': len(leaves)
+    }
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Format tanggal harus YYYY-MM-DD: '{value}'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator data absensi sintetis")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('logs', "Buat file log Grid++Report per hari"),
+                            ('db', "Buat database berisi absensi, pelanggaran dan izin")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('output', help="Folder output (logs) atau path database (db)")
+        sub.add_argument('--employees', type=int, default=50, help="Jumlah karyawan (default: 50)")
+        sub.add_argument('--days', type=int, default=30, help="Jumlah hari (default: 30)")
+        sub.add_argument('--start', type=parse_date, default=parse_date('2025-11-01'),
+                         help="Tanggal mulai YYYY-MM-DD (default: 2025-11-01)")
+        sub.add_argument('--seed', type=int, default=0, help="Seed random (default: 0)")
+    subparsers.choices['logs'].add_argument('--format', choices=['xls', 'xlsx'], default='xls',
+                                            help="xls = CSV Grid++Report seperti export mesin (default)")
+
+    args = parser.parse_args(argv)
+    employees = generate_employees(args.employees, args.seed)
+
+    if args.command == 'logs':
+        files = generate_logs(args.output, employees, args.start, args.days, args.seed, f".{args.format}")
+        print(f"✅ {len(files)} file log dibuat di {args.output}")
+    else:
+        if os.path.exists(args.output):
+            print(f"❌ Database sudah ada: {args.output}", file=sys.stderr)
+            return 1
+        counts = generate_database(args.output, employees, args.start, args.days, args.seed)
+        print(f"✅ Database {args.output}: " + ", ".join(f"{key}={value}" for key, value in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
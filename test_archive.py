@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test arsip tahunan (archive.py): laporan yang melewati batas tahun tetap sama
+persis setelah tahun lama diarsipkan, tulis ke tahun arsip ditolak, dan data
+kembali utuh setelah arsip dikembalikan.
+
+    python test_archive.py              # sekaligus tampilkan ukuran dan waktu
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+from datetime import date
+
+import archive
+import query_cache
+import synthetic_data
+from database import DatabaseManager
+
+
+@contextlib.contextmanager
+def synthetic_db(employees=10, days=62):
+    """Database sintetis sementara yang melewati pergantian tahun 2025 -> 2026"""
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'absensi.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            synthetic_data.generate_database(db_path, synthetic_data.generate_employees(employees),
+                                             date(2025, 12, 1), days)
+            db_manager = DatabaseManager(db_path)
+        yield db_manager
+
+
+def report_snapshot(db_manager):
+    """Hasil semua method baca yang dirutekan ke arsip, untuk periode yang melewati pergantian tahun"""
+    query_cache.clear()
+    employee_id = db_manager.get_all_employees()[0]['id']
+    day = db_manager.get_attendance_by_date('2025-12-15', include_anomalies=True)
+    return repr((
+        db_manager.get_attendance_by_date_range('2025-12-20', '2026-01-10'),
+        db_manager.get_violations_by_date_range('2025-12-01', '2026-01-31'),
+        db_manager.get_leaves_by_date_range('2025-12-01', '2026-01-31'),
+        db_manager.get_attendance_by_employee_period(employee_id, '2025-12-01', '2026-01-31'),
+        db_manager.get_leaves_by_employee_date(employee_id, None),
+        db_manager.get_attendance_scans('2025-12-30', '2026-01-02'),
+        db_manager.get_violations_by_attendance(day[0]['id']),
+        db_manager.get_violations_by_employee(employee_id),
+        day,
+    ))
+
+
+def test_archive_roundtrip():
+    with synthetic_db() as db_manager:
+        employee_id = db_manager.get_all_employees()[0]['id']
+        attendance_id = db_manager.get_attendance_by_date('2025-12-15')[0]['id']
+        db_manager.add_violation(attendance_id, '10:00:00', '10:30:00', "Keluar")
+        db_manager.add_leave(employee_id, '2025-12-24', "Izin")
+        expected = report_snapshot(db_manager)
+        leaves_2025 = len(db_manager.get_leaves_by_date_range('2025-01-01', '2025-12-31'))
+
+        result = archive.archive_year(db_manager, 2025)
+        assert os.path.exists(result['path']) and result['counts']['violations'] >= 1
+        assert [item['year'] for item in db_manager.get_archives()] == [2025]
+        assert report_snapshot(db_manager) == expected
+
+        for write in (lambda: db_manager.add_leave(employee_id, '2025-12-25', "Izin"),
+                      lambda: db_manager.update_attendance_keterangan(attendance_id, "Diubah"),
+                      lambda: db_manager.add_violation(attendance_id, '11:00:00', '11:10:00', "Keluar")):
+            try:
+                write()
+            except archive.ArchivedYearError:
+                pass
+            else:
+                raise AssertionError("Tulis ke tahun yang diarsipkan harus ditolak")
+        db_manager.add_leave(employee_id, '2026-01-05', "Izin")  # Tahun berjalan tetap bisa ditulis
+
+        archive.restore_year(db_manager, 2025)
+        assert not os.path.exists(result['path']) and db_manager.get_archives() == []
+        assert len(db_manager.get_leaves_by_date_range('2025-01-01', '2025-12-31')) == leaves_2025
+        db_manager.update_attendance_keterangan(attendance_id, "Diubah")
+
+
+def main():
+    print("🧪 Test arsip tahunan")
+    test_archive_roundtrip()
+    print("✅ Laporan lintas tahun sama persis, tahun arsip read-only, arsip bisa dikembalikan")
+
+    with synthetic_db(employees=100, days=120) as db_manager:
+        def report_ms():
+            query_cache.clear()
+            started = time.perf_counter()
+            db_manager.get_attendance_by_date_range('2026-03-01', '2026-03-30')
+            db_manager.get_violations_by_date_range('2026-03-01', '2026-03-30')
+            return (time.perf_counter() - started) * 1000
+
+        before = report_ms()
+        result = archive.archive_year(db_manager, 2025)
+        print(f"   Database {result['db_size_before'] / 1024:.0f} KB -> {result['db_size_after'] / 1024:.0f} KB, "
+              f"arsip {os.path.getsize(result['path']) / 1024:.0f} KB: {result['timings']}")
+        print(f"   Laporan bulan berjalan: {before:.1f} ms -> {report_ms():.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
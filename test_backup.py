@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test backup online (backup.py): backup penuh + inkremental bisa di-restore
+persis, backup bertahap tetap selesai walau ada penulis aktif, snapshot rusak
+tidak pernah menimpa database, dan rotasi menyisakan `keep` backup penuh.
+
+    python test_backup.py               # sekaligus tampilkan waktu per tahap
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date
+
+import backup
+import synthetic_data
+from database import DatabaseManager
+
+
+@contextlib.contextmanager
+def synthetic_db(employees=10, days=14):
+    """Database sintetis sementara beserta folder backup-nya"""
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'absensi.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            synthetic_data.generate_database(db_path, synthetic_data.generate_employees(employees),
+                                             date(2025, 11, 1), days)
+            db_manager = DatabaseManager(db_path)
+        yield db_manager, os.path.join(workdir, 'backup')
+
+
+def leave_count(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM leaves").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_incremental_restore_roundtrip():
+    with synthetic_db() as (db_manager, backup_dir):
+        employee_id = db_manager.get_all_employees()[0]['id']
+        full = backup.create_backup(db_manager.db_path, backup_dir)['snapshot']
+        assert backup.create_backup(db_manager.db_path, backup_dir, incremental=True)['skipped']
+
+        db_manager.add_leave(employee_id, '2030-01-01', "Izin")
+        incremental = backup.create_backup(db_manager.db_path, backup_dir, incremental=True)['snapshot']
+        assert incremental['kind'] == 'incremental' and incremental['parent'] == full['id']
+        assert incremental['changed_pages'] < incremental['page_count']
+        expected = leave_count(db_manager.db_path)
+
+        db_manager.add_leave(employee_id, '2030-01-02', "Izin")
+        assert backup.verify_backup(backup_dir, incremental['id'])['ok']
+        result = backup.restore_backup(db_manager.db_path, incremental['id'], backup_dir)
+        assert result['quick_check'] == 'ok' and result['safety_backup']
+        assert leave_count(db_manager.db_path) == expected
+        assert len(db_manager.get_leaves_by_date_range('2030-01-01', '2030-01-31')) == 1
+
+
+def test_paged_backup_with_active_writer():
+    with synthetic_db() as (db_manager, backup_dir):
+        employee_id = db_manager.get_all_employees()[0]['id']
+        stop = threading.Event()
+
+        def writer():
+            n = 0
+            while not stop.is_set():
+                db_manager.add_leave(employee_id, f"2030-03-{n % 28 + 1:02d}", "Izin")
+                n += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            # 1 halaman per langkah: tanpa snapshot baca, setiap tulis memulai ulang backup
+            result = backup.create_backup(db_manager.db_path, backup_dir, pages=1, sleep=0.001)
+        finally:
+            stop.set()
+            thread.join()
+        assert backup.verify_backup(backup_dir, result['snapshot']['id'])['ok']
+
+
+def test_corrupted_snapshot_is_not_restored():
+    with synthetic_db() as (db_manager, backup_dir):
+        snapshot = backup.create_backup(db_manager.db_path, backup_dir)['snapshot']
+        path = os.path.join(backup_dir, snapshot['file'])
+        with gzip.open(path, 'rb') as f:
+            data = bytearray(f.read())
+        data[len(data) // 2] ^= 0xff
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+
+        before = leave_count(db_manager.db_path)
+        assert not backup.verify_backup(backup_dir, snapshot['id'])['checksum_ok']
+        try:
+            backup.restore_backup(db_manager.db_path, snapshot['id'], backup_dir)
+        except backup.BackupError:
+            pass
+        else:
+            raise AssertionError("Restore snapshot rusak harus ditolak")
+        assert leave_count(db_manager.db_path) == before
+        assert len(backup.list_backups(backup_dir)) == 1  # Tidak ada backup pengaman karena dibatalkan
+
+
+def test_rotation_keeps_latest_full_backups():
+    with synthetic_db() as (db_manager, backup_dir):
+        employee_id = db_manager.get_all_employees()[0]['id']
+        for n in range(4):
+            backup.create_backup(db_manager.db_path, backup_dir, keep=2)
+            db_manager.add_leave(employee_id, f"2030-04-{n + 1:02d}", "Izin")
+            backup.create_backup(db_manager.db_path, backup_dir, incremental=True, keep=2)
+
+        snapshots = backup.list_backups(backup_dir)
+        assert [snapshot['kind'] for snapshot in snapshots] == ['full', 'incremental'] * 2
+        assert sorted(os.listdir(backup_dir)) == sorted(
+            [backup.MANIFEST] + [s['file'] for s in snapshots] + [s['id'] + '.pages' for s in snapshots])
+
+
+def main():
+    print("🧪 Test backup online")
+    test_incremental_restore_roundtrip()
+    print("✅ Backup penuh + inkremental di-restore persis")
+    test_paged_backup_with_active_writer()
+    print("✅ Backup bertahap selesai walau ada penulis aktif")
+    test_corrupted_snapshot_is_not_restored()
+    print("✅ Snapshot rusak ditolak tanpa menyentuh database")
+    test_rotation_keeps_latest_full_backups()
+    print("✅ Rotasi menyisakan backup penuh terbaru")
+
+    with synthetic_db(employees=100, days=90) as (db_manager, backup_dir):
+        started = time.perf_counter()
+        result = backup.create_backup(db_manager.db_path, backup_dir)
+        snapshot = result['snapshot']
+        print(f"   Backup penuh {snapshot['db_size'] / 1024:.0f} KB -> {snapshot['size'] / 1024:.0f} KB "
+              f"dalam {(time.perf_counter() - started) * 1000:.0f} ms: {result['timings']}")
+        print(f"   Verifikasi: {backup.verify_backup(backup_dir, snapshot['id'])['timings']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,12 @@
 Script untuk test dan simulasi database lock
 """
 
+import os
 import sqlite3
+import tempfile
 import time
 import threading
+import db_retry
 from database_utils import check_database_status, force_unlock_database, diagnose_database_lock
 
 def simulate_database_lock(db_path="absensi.db", duration=10):
@@ -104,6 +107,109 @@ def test_database_lock_handling():
     lock_thread.join()
     print("\n5. Lock simulation completed")
 
+def run_concurrent_writers(db_path, writers=8, operations=30, hold_seconds=0.3, holds=6):
+    """Banyak thread menulis bersamaan sementara satu koneksi lain berkali-kali memegang lock tulis
+    lebih lama dari busy_timeout. Return: list error dari thread penulis."""
+    from database import DatabaseManager
+    db = DatabaseManager(db_path)
+    names = [f"STRESS {index}" for index in range(writers)]
+    employee_ids = [db.add_or_get_employee(name) for name in names]
+    errors = []
+    
+    def writer(index):
+        try:
+            for n in range(operations):
+                date = f"2031-01-{n % 28 + 1:02d}"
+                db.save_attendance_data(date, [{
+                    'Nama': names[index], 'Jam Masuk': '08:00', 'Jam Keluar': '17:00',
+                    'Jam Masuk Lembur': None, 'Jam Keluar Lembur': None, 'Jam Anomali': []
+                }], mode='merge')
+                db.add_leave(employee_ids[index], f"2031-02-{n % 28 + 1:02d}", f"Stress {n}")
+        except Exception as e:
+            errors.append(e)
+    
+    def holder():
+        for _ in range(holds):
+            conn = sqlite3.connect(db_path, timeout=30.0)
+            conn.execute("BEGIN IMMEDIATE")
+            time.sleep(hold_seconds)
+            conn.rollback()
+            conn.close()
+            time.sleep(0.05)
+    
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    threads.append(threading.Thread(target=holder))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    leaves = db.get_leaves_by_date_range('2031-02-01', '2031-02-28')
+    return errors, len(leaves)
+
+def test_concurrent_writers_stress():
+    """Penulis paralel harus berhasil semua tanpa dialog/force unlock (BEGIN IMMEDIATE + retry)"""
+    print("\n=== Stress Test Penulis Paralel ===")
+    writers, operations = 8, 30
+    old_timeout, old_retries = db_retry.busy_timeout_ms(), db_retry.max_retries()
+    db_retry.configure(busy_timeout_ms=100, max_retries=8)  # Lock dipegang 300 ms > busy_timeout
+    db_retry.reset()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            errors, leave_count = run_concurrent_writers(os.path.join(workdir, 'stress.db'), writers, operations)
+    finally:
+        db_retry.configure(busy_timeout_ms=old_timeout, max_retries=old_retries)
+    
+    stats = {stat['name']: stat for stat in db_retry.get_stats()}
+    retries = sum(stat['retries'] for stat in stats.values())
+    wait_ms = sum(stat['wait_ms'] for stat in stats.values())
+    print(f"   {writers} thread × {operations} operasi: {len(errors)} error, {retries} retry, "
+          f"total tunggu lock {wait_ms:.0f} ms")
+    
+    assert not errors, errors[:3]
+    assert leave_count == writers * operations
+    assert stats['save_attendance_data']['calls'] == writers * operations
+    assert retries > 0  # Lock holder memaksa retry; tanpa retry penulis akan gagal
+    assert all(stat['failures'] == 0 for stat in stats.values())
+
+def test_read_only_mode():
+    """Mode read-only tetap bisa membaca saat lock tulis dipegang, dan tidak pernah menulis/mengunci"""
+    print("\n=== Mode Read-only (PC Laporan) ===")
+    from database import DatabaseManager, ReadOnlyDatabaseError
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'readonly.db')
+        db = DatabaseManager(db_path)
+        employee_id = db.add_or_get_employee("READ ONLY")
+        db.add_leave(employee_id, '2031-03-01', "Izin")
+        
+        holder = sqlite3.connect(db_path)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.perf_counter()
+            reader = DatabaseManager(db_path, read_only=True)
+            assert len(reader.get_leaves_by_date_range('2031-03-01', '2031-03-31')) == 1
+            try:
+                reader.add_leave(employee_id, '2031-03-02', "Izin")
+            except ReadOnlyDatabaseError:
+                pass
+            else:
+                raise AssertionError("Tulis di mode read-only harus ditolak")
+            conn = reader.get_connection()
+            try:
+                conn.execute("CREATE TABLE IF NOT EXISTS coba (id INTEGER)")
+            except sqlite3.OperationalError:
+                pass
+            else:
+                raise AssertionError("DDL di mode read-only harus ditolak")
+            finally:
+                conn.close()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        finally:
+            holder.rollback()
+            holder.close()
+    print(f"   Buka + baca + tulis ditolak selama lock tulis dipegang: {elapsed_ms:.1f} ms")
+    assert elapsed_ms < db_retry.busy_timeout_ms()  # Tidak pernah menunggu lock
+
 def main():
     print("🧪 Database Lock Testing Suite")
     print("=" * 50)
@@ -117,6 +223,12 @@ def main():
     # Test lock handling
     test_database_lock_handling()
     
+    # Stress test penulis paralel
+    test_concurrent_writers_stress()
+    
+    # Mode read-only
+    test_read_only_mode()
+    
     # Final diagnosis
     print("\n=== Final Database Status ===")
     diagnose_database_lock()
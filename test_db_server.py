@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test mode multi-user (db_server): klien remote harus melihat data yang sama
+dengan DatabaseManager lokal, dan tulis paralel dari banyak klien tidak
+boleh hilang atau gagal karena database terkunci.
+
+    python test_db_server.py            # sekaligus ukur throughput 1/4/8 klien
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import threading
+from datetime import date
+
+import synthetic_data
+from db_server import REMOTE_METHODS, DatabaseServer, RemoteDatabaseManager, simulate_clients
+from database import DatabaseManager
+from report_calc import build_attendance_matrix
+
+
+@contextlib.contextmanager
+def running_server(employees=10, days=14, token=None):
+    """Server sementara di port acak dengan database sintetis"""
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'server.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            synthetic_data.generate_database(db_path, synthetic_data.generate_employees(employees),
+                                             date(2025, 11, 1), days)
+            server = DatabaseServer(db_path, '127.0.0.1', 0, token=token)
+        server.start_background()
+        try:
+            yield server
+        finally:
+            server.stop()
+
+
+def test_remote_matches_local():
+    with running_server() as server:
+        local = server.db_manager
+        remote = RemoteDatabaseManager(server.url)
+
+        assert remote.get_all_employees() == local.get_all_employees()
+        assert remote.get_attendance_by_date_range('2025-11-01', '2025-11-14') == \
+            local.get_attendance_by_date_range('2025-11-01', '2025-11-14')
+        assert remote.get_shift_by_id(1) == local.get_shift_by_id(1)
+        assert remote.get_changed_cells(0, '2025-11-01', '2025-11-14') == \
+            local.get_changed_cells(0, '2025-11-01', '2025-11-14')
+
+        start, end = date(2025, 11, 1), date(2025, 11, 14)
+        assert build_attendance_matrix(remote, start, end) == build_attendance_matrix(local, start, end)
+
+
+def test_concurrent_writers():
+    clients, per_client = 6, 25
+    with running_server() as server:
+        errors = []
+
+        def client(index):
+            remote = RemoteDatabaseManager(server.url)
+            try:
+                employee_id = remote.add_or_get_employee(f"KLIEN {index}")
+                for n in range(per_client):
+                    remote.add_leave(employee_id, f"2030-01-{n + 1:02d}", f"Izin {n}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        leaves = DatabaseManager(server.db_manager.db_path).get_leaves_by_date_range('2030-01-01', '2030-01-31')
+        assert len(leaves) == clients * per_client
+        stats = server.batcher.get_stats()
+        assert stats['writes'] == clients * (per_client + 1)
+        assert stats['failed'] == 0
+
+
+def test_failed_write_does_not_affect_batch():
+    with running_server() as server:
+        employee_id = server.db_manager.get_all_employees()[0]['id']
+        futures = [server.batcher.submit('add_leave', (employee_id, f"2030-02-{n + 1:02d}", "Izin"), {})
+                   for n in range(5)]
+        futures.insert(2, server.batcher.submit('create_shift', ({'name': 'Tanpa Jam'},), {}))
+
+        outcomes = [future.exception() for future in futures]
+        assert isinstance(outcomes[2], KeyError)
+        assert [error for index, error in enumerate(outcomes) if index != 2] == [None] * 5
+        assert len(server.db_manager.get_leaves_by_date_range('2030-02-01', '2030-02-28')) == 5
+
+
+def test_only_allowlisted_methods():
+    assert all(callable(getattr(DatabaseManager, method, None)) for method in REMOTE_METHODS)
+    with running_server() as server:
+        remote = RemoteDatabaseManager(server.url)
+        for method in ('init_database', 'get_connection', 'save_maintenance_run'):
+            try:
+                remote.call(method)
+                raise AssertionError(f"{method} seharusnya ditolak server")
+            except PermissionError:
+                pass
+        assert not hasattr(remote, 'init_database')
+
+        attendance_id = server.db_manager.get_attendance_by_date('2025-11-03')[0]['id']
+        try:
+            remote.update_attendance_field(attendance_id, "jam_masuk = '00:00', keterangan", 'x')
+            raise AssertionError("Kolom di luar ATTENDANCE_EDITABLE_FIELDS seharusnya ditolak")
+        except ValueError:
+            pass
+
+    try:
+        DatabaseServer(':memory:', '0.0.0.0', 0)
+        raise AssertionError("Server yang bisa diakses PC lain wajib memakai token")
+    except ValueError:
+        pass
+    with running_server(token='rahasia') as server:
+        assert RemoteDatabaseManager(server.url, token='rahasia').get_all_employees()
+        try:
+            RemoteDatabaseManager(server.url, token='salah').get_all_employees()
+            raise AssertionError("Token salah seharusnya ditolak")
+        except PermissionError:
+            pass
+
+
+def main():
+    print("🧪 Test server database multi-user")
+    test_remote_matches_local()
+    print("✅ Hasil remote sama dengan lokal")
+    test_concurrent_writers()
+    print("✅ Tulis paralel dari banyak klien tersimpan semua")
+    test_failed_write_does_not_affect_batch()
+    print("✅ Permintaan gagal tidak membatalkan permintaan lain dalam batch")
+    test_only_allowlisted_methods()
+    print("✅ Hanya method REMOTE_METHODS yang bisa dipanggil, token server diperiksa")
+
+    with running_server() as server:
+        for clients in (1, 4, 8):
+            result = simulate_clients(server.url, clients, 200)
+            writer = result['writer']
+            print(f"   {clients} klien: {result['ops_per_s']:.0f} ops/detik, "
+                  f"rata-rata {writer['avg_batch']} tulis per transaksi, error {len(result['errors'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test indeks nama karyawan (name_index.py): pencarian type-ahead dengan potongan
+nama dalam urutan bebas, dan pencocokan nama import yang hanya menyamakan
+variasi penulisan; nama yang sekadar mirip (salah ketik atau orang lain) menunggu konfirmasi.
+Import mengenali karyawan lewat Work No mesin (database.EmployeeResolver),
+jadi ganti nama di mesin tidak memecah riwayat absensi.
+
+    python test_name_index.py           # sekaligus tampilkan waktu bangun indeks dan cari
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import name_index
+import synthetic_data
+from database import DatabaseManager, EmployeeResolver
+
+NAMES = ["BUDI SANTOSO", "BUDIMAN", "SITI NURHALIZA", "AHMAD FAUZI", "RAHMAT", "DEWI LESTARI", "MUHAMMAD RIZKI"]
+
+
+def test_search():
+    index = name_index.NameIndex(enumerate(NAMES))
+    assert [name for _, name in index.search("sant bu")] == ["BUDI SANTOSO"]
+    assert [name for _, name in index.search("budi")] == ["BUDI SANTOSO", "BUDIMAN"]
+    assert [name for _, name in index.search("nurhaliz")] == ["SITI NURHALIZA"]
+    assert [name for _, name in index.search("lestri")] == ["DEWI LESTARI"]  # Salah ketik
+    assert len(index.search("")) == len(NAMES)
+
+
+def test_import_matching():
+    index = name_index.NameIndex(enumerate(NAMES))
+    records = [{'Nama': name} for name in ("Siti Nurhalizah", "ahmad  fauzy", "MUHAMMADRIZKI", "dewi lestari",
+                                           "RAHMAN", "BUDI S", "ORANG BARU", "BUDIMAN")]
+    matched, suggested = name_index.resolve_import_names(records, index)
+    # Hanya nama yang sama setelah dinormalisasi yang diganti; yang mirip menunggu konfirmasi
+    assert [record['Nama'] for record in records] == [
+        "Siti Nurhalizah", "ahmad  fauzy", "MUHAMMAD RIZKI", "DEWI LESTARI", "RAHMAN", "BUDI S", "ORANG BARU", "BUDIMAN"]
+    assert [raw for raw, _, _ in matched] == ["MUHAMMADRIZKI", "dewi lestari"]
+    assert [(raw, name) for raw, name, _ in suggested] == [
+        ("Siti Nurhalizah", "SITI NURHALIZA"), ("ahmad  fauzy", "AHMAD FAUZI"), ("RAHMAN", "RAHMAT")]
+    name_index.apply_suggestions(records, suggested[:1])
+    assert records[0]['Nama'] == "SITI NURHALIZA"
+
+
+def test_import_similar_people():
+    """Nama mirip dalam satu file adalah orang yang berbeda: tidak digabung dan tidak saling menimpa"""
+    index = name_index.NameIndex(enumerate(NAMES + ["DEWI SARTIKA", "AGUS SETIAWAN"]))
+    records = [{'Nama': name} for name in ("DEWI KARTIKA", "DEWI SARTIKA", "AGUS SETIAWATI", "AGUS SETIAWANI")]
+    matched, suggested = name_index.resolve_import_names(records, index)
+    assert matched == [] and [record['Nama'] for record in records] == [
+        "DEWI KARTIKA", "DEWI SARTIKA", "AGUS SETIAWATI", "AGUS SETIAWANI"]
+    # DEWI SARTIKA ada di file, AGUS SETIAWAN hanya diusulkan untuk satu nama
+    assert [(raw, name) for raw, name, _ in suggested] == [("AGUS SETIAWANI", "AGUS SETIAWAN")]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db_manager = DatabaseManager(os.path.join(workdir, 'absensi.db'))
+        db_manager.add_or_get_employee("DEWI SARTIKA")
+        records = [{'Nama': name, 'Jam Masuk': jam_masuk, 'Jam Keluar': '17:00',
+                    'Jam Masuk Lembur': None, 'Jam Keluar Lembur': None}
+                   for name, jam_masuk in (("Dewi Sartika", "08:00"), ("DEWI KARTIKA", "09:30"), ("DEWI SARTIKA", "08:15"))]
+        resolver = EmployeeResolver(db_manager.get_employee_identities())
+        matched, suggested = resolver.match_names(records, name_index.for_manager(db_manager))
+        assert matched == [] and suggested == []
+        db_manager.save_attendance_data('2026-10-01', records)
+        saved = {record['Nama']: record['Jam Masuk'] for record in db_manager.get_attendance_by_date('2026-10-01')}
+        assert saved == {"DEWI SARTIKA": "08:15", "Dewi Sartika": "08:00", "DEWI KARTIKA": "09:30"}
+
+
+def test_import_ambiguous_name():
+    """Dua karyawan dengan nama normalisasi sama: tidak ada yang dipilih otomatis, hanya diusulkan"""
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db_manager = DatabaseManager(os.path.join(workdir, 'absensi.db'))
+        existing = {db_manager.add_or_get_employee(name) for name in ("MUHAMMAD RIZKI", "Muhammad Rizki")}
+        records = [{'Nama': "MUHAMMAD  RIZKI", 'Jam Masuk': '08:00', 'Jam Keluar': '17:00',
+                    'Jam Masuk Lembur': None, 'Jam Keluar Lembur': None}]
+        resolver = EmployeeResolver(db_manager.get_employee_identities())
+        assert resolver.assign(records) == [None]
+        matched, suggested = resolver.match_names(records, name_index.for_manager(db_manager))
+        assert matched == [] and len(suggested) == 1 and records[0]['Nama'] == "MUHAMMAD  RIZKI"
+        # Usulan tidak dikonfirmasi: dicatat sebagai karyawan baru, bukan salah satu karyawan lama
+        db_manager.save_attendance_data('2026-10-01', records)
+        saved = db_manager.get_attendance_by_date('2026-10-01')
+        assert [record['Nama'] for record in saved] == ["MUHAMMAD  RIZKI"]
+        assert saved[0]['employee_id'] not in existing
+
+
+def test_import_identity():
+    def records(day_names):
+        return [{'Nama': name, 'Work No': work_no, 'Jam Masuk': '08:00', 'Jam Keluar': '17:00',
+                 'Jam Masuk Lembur': None, 'Jam Keluar Lembur': None} for work_no, name in day_names]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db_manager = DatabaseManager(os.path.join(workdir, 'absensi.db'))
+        db_manager.add_or_get_employee("RAKA")  # Karyawan lama, belum punya Work No
+        db_manager.save_attendance_data('2026-10-01', records([('1', "BUDI"), ('2', "SITI"), ('3', "RAKA")]))
+        db_manager.save_attendance_data('2026-10-02', records([('1', "BUDI SANTOSO"), ('2', "siti"), ('4', "BARU")]))
+        employees = {item['name']: item for item in db_manager.get_employee_identities()}
+        assert sorted(employees) == ["BARU", "BUDI", "RAKA", "SITI"]
+        assert [employees[name]['work_no'] for name in ("BUDI", "SITI", "RAKA", "BARU")] == ['1', '2', '3', '4']
+        assert len(db_manager.get_attendance_by_employee_period(employees["BUDI"]['id'], '2026-10-01', '2026-10-02')) == 2
+
+
+def main():
+    print("🧪 Test indeks nama karyawan")
+    test_search()
+    test_import_matching()
+    test_import_similar_people()
+    test_import_ambiguous_name()
+    test_import_identity()
+    print("✅ Pencarian type-ahead, pencocokan nama import dan Work No sesuai")
+
+    employees = [(i, employee['name']) for i, employee in enumerate(synthetic_data.generate_employees(2000))]
+    started = time.perf_counter()
+    index = name_index.NameIndex(employees)
+    build_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    for query in ("bud", "siti 1", "ahmd", "rahmat 12", "dewi"):
+        index.search(query, 50)
+    search_ms = (time.perf_counter() - started) * 1000 / 5
+    print(f"   {len(index)} karyawan: bangun indeks {build_ms:.1f} ms, cari {search_ms:.2f} ms per ketikan")
+
+
+if __name__ == "__main__":
+    main()
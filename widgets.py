@@ -0,0 +1,142 @@
+"""Widget bersama untuk aplikasi absensi (kalender dan input tanggal bahasa Indonesia, indikator loading,
+pencarian karyawan di combo box)"""
+
+from PySide6.QtWidgets import QDateEdit, QCalendarWidget, QLabel, QCompleter, QComboBox
+from PySide6.QtCore import Qt, QLocale, QTimer, QStringListModel
+from PySide6.QtGui import QTextCharFormat, QColor
+
+import name_index
+
+class IndonesianCalendar(QCalendarWidget):
+    """Kalender custom dengan bahasa Indonesia dan tanggal merah untuk hari Minggu"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        
+        # Set locale ke Indonesia
+        locale = QLocale(QLocale.Indonesian, QLocale.Indonesia)
+        self.setLocale(locale)
+        
+        # Nama hari dalam bahasa Indonesia
+        self.setHorizontalHeaderFormat(QCalendarWidget.LongDayNames)
+        
+        # Format untuk hari Minggu (tanggal merah)
+        sunday_format = QTextCharFormat()
+        sunday_format.setForeground(QColor(255, 0, 0))  # Merah
+        sunday_format.setBackground(QColor(255, 230, 230))  # Background pink muda
+        self.setWeekdayTextFormat(Qt.Sunday, sunday_format)
+
+class IndonesianDateEdit(QDateEdit):
+    """DateEdit dengan kalender bahasa Indonesia dan tanggal merah"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setCalendarPopup(True)
+        
+        # Buat custom calendar popup
+        calendar = IndonesianCalendar(self)
+        self.setCalendarWidget(calendar)
+        
+        # Set format tampilan tanggal
+        self.setDisplayFormat("dd MMMM yyyy")
+        
+        # Set locale ke Indonesia untuk format tanggal
+        locale = QLocale(QLocale.Indonesian, QLocale.Indonesia)
+        self.setLocale(locale)
+
+class BusySpinner(QLabel):
+    """Label animasi "sedang memuat" untuk operasi database di background"""
+    FRAMES = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("QLabel { color: #1976d2; font-weight: bold; padding: 4px; }")
+        self._text = ""
+        self._frame = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(80)
+        self._timer.timeout.connect(self._advance)
+        self.hide()
+
+    def start(self, text="Memuat data..."):
+        self._text = text
+        self._frame = 0
+        self._advance()
+        self.show()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        self.hide()
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def _advance(self):
+        self.setText(f"{self.FRAMES[self._frame % len(self.FRAMES)]} {self._text}")
+        self._frame += 1
+
+class EmployeeSearchCompleter(QCompleter):
+    """Type-ahead untuk combo karyawan: ketik sebagian nama (urutan bebas, salah ketik ringan) lalu pilih.
+
+    Indeks dibangun dari teks item combo (name_index.NameIndex) dan dibangun ulang
+    hanya jika isi combo berubah. Setelah selesai mengetik, combo selalu menunjuk
+    item yang valid sehingga currentText()/currentData() tetap bisa dipakai seperti biasa.
+    """
+    MAX_RESULTS = 50
+
+    def __init__(self, combo):
+        super().__init__(combo)
+        self.combo = combo
+        self._index = None
+        self._results = QStringListModel(self)
+        self.setModel(self._results)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setMaxVisibleItems(15)
+
+        combo.setEditable(True)
+        combo.setInsertPolicy(QComboBox.NoInsert)
+        combo.setCompleter(None)  # Completer bawaan hanya mencocokkan awal teks
+        self.setWidget(combo.lineEdit())
+        combo.lineEdit().setPlaceholderText("Ketik untuk mencari nama...")
+
+        for signal in (combo.model().rowsInserted, combo.model().rowsRemoved,
+                       combo.model().modelReset, combo.model().dataChanged):
+            signal.connect(self._invalidate)
+        combo.lineEdit().textEdited.connect(self._update_results)
+        combo.lineEdit().editingFinished.connect(self._commit_text)
+        self.activated[str].connect(self._select_text)
+
+    def _invalidate(self, *args):
+        self._index = None
+
+    def index(self):
+        if self._index is None:
+            self._index = name_index.NameIndex(
+                (row, self.combo.itemText(row)) for row in range(self.combo.count()))
+        return self._index
+
+    def _update_results(self, text):
+        self._results.setStringList([name for _, name in self.index().search(text, self.MAX_RESULTS)])
+        self.complete()
+
+    def _select_text(self, text):
+        row = self.combo.findText(text, Qt.MatchExactly)
+        if row >= 0:
+            self.combo.setCurrentIndex(row)
+        self.combo.setEditText(self.combo.itemText(self.combo.currentIndex()))
+
+    def _commit_text(self):
+        """Teks yang bukan nama item: pakai hasil tunggal / nama yang sama persis, atau kembalikan pilihan lama"""
+        text = self.combo.lineEdit().text()
+        if self.combo.findText(text, Qt.MatchExactly) >= 0:
+            self._select_text(text)
+            return
+        hits = self.index().search(text, 2)
+        exact = [row for row, name in hits if name_index.normalize(name) == name_index.normalize(text)]
+        if exact or len(hits) == 1:
+            self.combo.setCurrentIndex((exact or [hits[0][0]])[0])
+        self.combo.setEditText(self.combo.itemText(self.combo.currentIndex()))
+
+
+def attach_employee_search(combo):
+    """Pasang EmployeeSearchCompleter di combo karyawan (isi combo boleh diisi sebelum atau sesudahnya)"""
+    return EmployeeSearchCompleter(combo)